@@ -19,6 +19,8 @@ CSV_FILE = os.getenv('CSV_OUTPUT_FILE', './odl_flow_stats.csv')
 # POLL_INTERVAL = int(os.getenv('POLL_INTERVAL', '5'))
 API_URL = os.getenv('API_URL', 'http://127.0.0.1:8000')
 STATS_ENDPOINT = os.getenv('STATS_API_ENDPOINT', '/api/v1/network/log-flow-stats/')
+# 2 sends one columnar batch per poll (arrays per field, epoch-ms timestamp); 1 sends a list of records
+STATS_SCHEMA_VERSION = int(os.getenv('STATS_SCHEMA_VERSION', '2'))
 # BACKEND_API_AUTH_TOKEN = os.getenv('BACKEND_API_AUTH_TOKEN')
 
 POLL_INTERVAL = 10 
@@ -161,6 +163,28 @@ def prepare_stats_for_api(flow_stats_dict, timestamp_iso):
         "classification": str(flow_stats_dict.get('cookie', 'unknown_cookie')) # Using COOKIE as classification identifier
     }
 
+def prepare_columnar_stats_for_api(flow_stats_list, timestamp_ms):
+    """
+    Prepares a columnar (schema version 2) batch: one array per field, an epoch-ms
+    timestamp shared by the batch, durations as float seconds and integer cookies,
+    so the backend can convert the batch without parsing each record.
+    """
+    return {
+        "version": 2,
+        "timestamp_ms": timestamp_ms,
+        "columns": {
+            "cookie": [fs.get('cookie', 0) for fs in flow_stats_list],
+            "meter": [fs.get('meter_id', 0) for fs in flow_stats_list],
+            "duration": [float(fs.get('duration_sec', 0.0)) for fs in flow_stats_list],
+            "packets": [fs.get('packet_count', 0) for fs in flow_stats_list],
+            "bytes": [fs.get('byte_count', 0) for fs in flow_stats_list],
+            "priority": [fs.get('priority', 0) for fs in flow_stats_list],
+            "mac_address": [fs.get('mac_address', "") for fs in flow_stats_list],
+            "protocol": [fs.get('protocol', "") for fs in flow_stats_list],
+            "port": [fs.get('port', 0) for fs in flow_stats_list],
+        }
+    }
+
 def log_to_csv(file_path, records_for_api):
     file_exists = os.path.isfile(file_path)
     # Use fieldnames expected by your API/CSV format
@@ -180,7 +204,8 @@ def log_to_csv(file_path, records_for_api):
         logger.error(f"Unexpected error writing to CSV {file_path}: {e}", exc_info=True)
 
 
-def send_stats_to_api(records_for_api):
+def send_stats_to_api(records_for_api, payload=None):
+    """Posts the batch; `payload` overrides the request body (e.g. a columnar batch)"""
     if not records_for_api:
         logger.info("No flow stats to send to API.")
         return True, None  # Nothing to send is a form of success
@@ -192,7 +217,7 @@ def send_stats_to_api(records_for_api):
 
     logger.info(f"Attempting to send {len(records_for_api)} flow stat records to API: {api_full_url}")
     try:
-        response = requests.post(api_full_url, headers=headers, json=records_for_api, timeout=15)
+        response = requests.post(api_full_url, headers=headers, json=payload if payload is not None else records_for_api, timeout=15)
 
         if 200 <= response.status_code < 300:
             logger.info(f"Batch API call successful: {response.status_code} - {response.text[:200]}")
@@ -222,7 +247,8 @@ def main():
             flow_lines = ovs_output.strip().splitlines()
             parsed_records_for_api = []
             latest_flows = {}
-            current_timestamp_iso = datetime.datetime.utcnow().isoformat() + "Z"  # Add Z for UTC
+            current_time = datetime.datetime.now(datetime.timezone.utc)
+            current_timestamp_iso = current_time.replace(tzinfo=None).isoformat() + "Z"  # Add Z for UTC
 
             for line in flow_lines:
                 if 'cookie=' in line and 'actions=' in line:  # Basic filter for valid flow lines
@@ -247,7 +273,12 @@ def main():
             parsed_records_for_api = [
                 prepare_stats_for_api(flow_stats, current_timestamp_iso)
                 for flow_stats in latest_flows.values()
-            ]                
+            ]
+            api_payload = None
+            if STATS_SCHEMA_VERSION == 2 and latest_flows:
+                api_payload = prepare_columnar_stats_for_api(
+                    list(latest_flows.values()), int(current_time.timestamp() * 1000)
+                )
 
             if parsed_records_for_api:
                 log_to_csv(CSV_FILE, parsed_records_for_api)
@@ -256,7 +287,7 @@ def main():
                 api_sent_successfully = False
                 api_response = None
                 while not api_sent_successfully:
-                    api_sent_successfully, api_response = send_stats_to_api(parsed_records_for_api)
+                    api_sent_successfully, api_response = send_stats_to_api(parsed_records_for_api, api_payload)
                     if api_sent_successfully and VERBOSE:
                         logger.debug(
                             f"Submitted batch with {len(parsed_records_for_api)} flows. API response: "
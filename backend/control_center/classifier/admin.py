@@ -44,6 +44,10 @@ class ModelConfigurationAdmin(admin.ModelAdmin):
         ('Status', {
             'fields': ('is_active', 'is_loaded')
         }),
+        ('Quantization', {
+            'fields': ('quantization_report',),
+            'classes': ('collapse',)
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -0,0 +1,157 @@
+from django.core.management.base import BaseCommand
+from classifier.models import ModelConfiguration
+from classifier.quantization import (
+    TFLiteInt8Model, compare_models, load_calibration_set, quantize_keras_model
+)
+from classifier.state_manager import state_manager
+import json
+import os
+import keras
+import numpy as np
+
+
+class Command(BaseCommand):
+    help = 'Create int8 TFLite variants of registered Keras models using a calibration set'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--calibration-data',
+            required=True,
+            help='Path to a .npz file with "x" (raw packet arrays) and optional "y" (labels), or a .npy file of inputs'
+        )
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help='Model name to quantize (repeatable). Defaults to all Keras models'
+        )
+        parser.add_argument(
+            '--calibration-samples',
+            type=int,
+            default=500,
+            help='Maximum number of samples used to calibrate activation ranges (default: 500)'
+        )
+        parser.add_argument(
+            '--eval-fraction',
+            type=float,
+            default=0.2,
+            help='Fraction of the calibration set held out for the accuracy-delta report (default: 0.2)'
+        )
+        parser.add_argument(
+            '--output-dir',
+            help='Directory for the .tflite files (default: next to the source model)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-quantize and update existing int8 variants'
+        )
+
+    def handle(self, *args, **options):
+        queryset = ModelConfiguration.objects.filter(model_type__in=['keras_h5', 'tensorflow_saved_model'])
+        if options.get('models'):
+            queryset = queryset.filter(name__in=options['models'])
+
+        source_models = list(queryset)
+        if not source_models:
+            self.stdout.write(self.style.ERROR('No Keras models found to quantize'))
+            return
+
+        for source in source_models:
+            try:
+                self._quantize(source, options)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'Error quantizing {source.name}: {e}'))
+
+    def _quantize(self, source, options):
+        variant_name = f'{source.name} (int8)'
+        existing = ModelConfiguration.objects.filter(name=variant_name).first()
+        if existing and not options['force']:
+            self.stdout.write(self.style.NOTICE(f'{variant_name} already exists, skipping (use --force to rebuild)...'))
+            return
+
+        if not os.path.exists(source.model_path):
+            self.stdout.write(self.style.ERROR(f'Model file not found: {source.model_path}'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'Quantizing {source.name}...'))
+
+        x, y = load_calibration_set(
+            options['calibration_data'],
+            source.input_dimensions,
+            source.categories,
+        )
+        if len(x) < 2:
+            self.stdout.write(self.style.ERROR('Calibration set needs at least 2 samples'))
+            return
+
+        # Hold out the first eval_count samples of a seeded shuffle so the report is
+        # not measured on calibration data
+        rng = np.random.default_rng(0)
+        order = rng.permutation(len(x))
+        eval_count = max(1, int(len(x) * options['eval_fraction']))
+        eval_idx, calib_idx = order[:eval_count], order[eval_count:][:options['calibration_samples']]
+        x_calib = x[calib_idx]
+        x_eval, y_eval = x[eval_idx], (y[eval_idx] if y is not None else None)
+
+        float_model = keras.models.load_model(source.model_path)
+        tflite_bytes = quantize_keras_model(float_model, x_calib)
+
+        output_dir = options.get('output_dir') or os.path.dirname(source.model_path)
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = os.path.splitext(os.path.basename(source.model_path.rstrip('/')))[0]
+        output_path = os.path.join(output_dir, f'{base_name}-int8.tflite')
+        with open(output_path, 'wb') as f:
+            f.write(tflite_bytes)
+
+        report = compare_models(float_model, TFLiteInt8Model(output_path), x_eval, y_eval)
+        report.update({
+            'source_model': source.name,
+            'calibration_samples': int(len(x_calib)),
+            'float_model_bytes': os.path.getsize(source.model_path) if os.path.isfile(source.model_path) else None,
+            'int8_model_bytes': len(tflite_bytes),
+        })
+        with open(f'{output_path}.report.json', 'w') as f:
+            json.dump(report, f, indent=2)
+
+        summary = f"top-1 agreement {report['top1_agreement'] * 100:.2f}%"
+        if 'accuracy_delta' in report:
+            summary += (
+                f", accuracy {report['float_accuracy'] * 100:.2f}% -> {report['int8_accuracy'] * 100:.2f}% "
+                f"({report['accuracy_delta'] * 100:+.2f} pts)"
+            )
+        if report.get('speedup'):
+            summary += f", {report['speedup']:.1f}x faster per sample"
+
+        model_config_data = {
+            'display_name': f'{source.display_name} (int8)',
+            'model_type': 'tflite_int8',
+            'model_path': output_path,
+            'input_shape': source.input_shape,
+            'num_categories': source.num_categories,
+            'confidence_threshold': source.confidence_threshold,
+            'description': f'Int8 quantized variant of {source.name}: {summary}',
+            'version': f'{source.version}-int8',
+            'categories': source.categories,
+            'quantization_report': report,
+        }
+
+        if existing:
+            for field, value in model_config_data.items():
+                setattr(existing, field, value)
+            existing.save()
+            self.stdout.write(self.style.SUCCESS(f'Updated model: {variant_name}'))
+        else:
+            ModelConfiguration.objects.create(name=variant_name, is_active=False, **model_config_data)
+            self.stdout.write(self.style.SUCCESS(f'Created model: {variant_name}'))
+
+        # Refresh the cached configuration so workers pick up the new file
+        state_manager.set_model_config(variant_name, {
+            'name': variant_name,
+            'is_active': existing.is_active if existing else False,
+            **model_config_data,
+        })
+
+        self.stdout.write(f'  File: {output_path}')
+        self.stdout.write(f'  Report: {output_path}.report.json')
+        self.stdout.write(f'  {summary}')
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.14 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classifier', '0003_classificationstats_vpn_detections'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='modelconfiguration',
+            name='model_type',
+            field=models.CharField(choices=[('keras_h5', 'Keras H5'), ('tensorflow_saved_model', 'TensorFlow SavedModel'), ('pytorch', 'PyTorch'), ('onnx', 'ONNX'), ('tflite_int8', 'TensorFlow Lite int8')], max_length=50),
+        ),
+    ]
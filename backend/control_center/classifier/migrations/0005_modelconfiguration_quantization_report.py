@@ -0,0 +1,18 @@
+# Generated by Django 5.1.14 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classifier', '0004_alter_modelconfiguration_model_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelconfiguration',
+            name='quantization_report',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -8,6 +8,9 @@ multiple classification models with Redis-based state management for instant cha
 import os
 import json
 import logging
+import socket
+import uuid
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Any
 from django.conf import settings
 from django.utils import timezone
@@ -15,11 +18,15 @@ from django.db import close_old_connections
 from datetime import timedelta
 import keras
 import threading
+import queue
+import time
 import numpy as np
+import psutil
 import redis
 
 from .models import ModelConfiguration, ModelState, ClassificationStats
 from .state_manager import state_manager
+from .quantization import TFLiteInt8Model
 from utils.ip_lookup_service import get_asn_from_ip
 from .vpn_loader import VPNNetworkLoader, REDIS_VPN_KEY
 
@@ -30,6 +37,21 @@ REDIS_DNS_KEY = "dns_servers:ip_set"
 # VPN Redis key - same as in vpn_loader.py
 REDIS_VPN_KEY = "vpn_networks:cidr_set"
 
+# Shadow evaluation tuning: queued samples are scored in batches off the response path
+SHADOW_QUEUE_SIZE = getattr(settings, 'SHADOW_EVAL_QUEUE_SIZE', 1000)
+SHADOW_BATCH_SIZE = getattr(settings, 'SHADOW_EVAL_BATCH_SIZE', 64)
+SHADOW_NAME_REFRESH_SECONDS = 5.0
+# Delay before a process retries loading a shadow model that failed to load
+SHADOW_LOAD_RETRY_SECONDS = 60.0
+
+# Memory budget for models resident in a single worker process
+MODEL_CACHE_MAX_BYTES = getattr(settings, 'MODEL_CACHE_MAX_MB', 2048) * 1024 * 1024
+
+# Two-phase model swap: readiness timeout, watcher poll interval and worker liveness
+MODEL_SWAP_TIMEOUT = getattr(settings, 'MODEL_SWAP_TIMEOUT', 120)
+MODEL_SWAP_POLL_INTERVAL = getattr(settings, 'MODEL_SWAP_POLL_INTERVAL', 1.0)
+MODEL_SWAP_WORKER_STALE_SECONDS = MODEL_SWAP_POLL_INTERVAL * 5
+
 def _run_in_thread(func):
         """Run a callable in a dedicated thread and return its result, raising exceptions.
 
@@ -59,13 +81,36 @@ class ModelManager:
     """
     
     def __init__(self):
-        self.loaded_models: Dict[str, Any] = {}
+        # Loaded models in least-recently-used order (most recent last), bounded by
+        # MODEL_CACHE_MAX_BYTES; the active and shadow models are never evicted
+        self.loaded_models: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._models_lock = threading.RLock()
+        self.cache_max_bytes = MODEL_CACHE_MAX_BYTES
+
+        # Shadow evaluation: inputs are queued from predict_flow and scored by a
+        # background worker so the candidate model never adds response latency
+        self._shadow_queue: "queue.Queue" = queue.Queue(maxsize=SHADOW_QUEUE_SIZE)
+        self._shadow_thread: Optional[threading.Thread] = None
+        self._shadow_lock = threading.Lock()
+        self._shadow_dropped = 0
+        self._shadow_name_cache: Tuple[Optional[str], float] = (None, 0.0)
+        # Shadow model name -> time after which a failed load is retried
+        self._shadow_load_retry_at: Dict[str, float] = {}
+
         # Initialize Redis connection for DNS lookups (separate from state_manager)
         self._init_redis_connection()
         
         # Classification stats are now tracked in Redis (shared across processes)
         # No in-memory counters needed - using state_manager.increment_classification_stat()
         
+        # Two-phase model swaps: processes that serve classification enrol as swap
+        # participants (see enroll_swap_participant); they heartbeat and preload
+        # announced models in the background before the active model is flipped
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._swap_lock = threading.Lock()
+        self._prepared_swaps: set = set()
+        self._swap_watcher_pid: Optional[int] = None
+        
         self._initialize_from_database()
 
 
@@ -235,18 +280,21 @@ class ModelManager:
         except Exception as e:
             logger.error(f"Error creating model from JSON: {e}")
     
-    def load_model(self, model_name: str) -> bool:
+    def load_model(self, model_name: str, pinned: bool = False) -> bool:
         """
         Load a specific model into memory
         
         Args:
             model_name: Name of the model to load
+            pinned: Keep the model resident even if it exceeds the cache budget
+                (used for models about to become active or shadow)
             
         Returns:
             bool: True if model loaded successfully, False otherwise
         """
         # Check if already loaded
         if model_name in self.loaded_models:
+            self._touch_model(model_name)
             logger.debug(f"Model '{model_name}' already loaded")
             return True
         
@@ -280,26 +328,51 @@ class ModelManager:
                 logger.error(f"Model file not found: {model_path}")
                 return False
             
+            # Make room up front using the on-disk size (weights dominate the file)
+            if not self._ensure_cache_capacity(self._path_size(model_path), model_name, pinned):
+                logger.error(f"Not enough model cache budget to load '{model_name}'")
+                return False
+            
+            rss_before = self._process_rss()
+            
             # Load model based on type
             if config_dict['model_type'] == "keras_h5":
                 model = keras.models.load_model(model_path)
             elif config_dict['model_type'] == "tensorflow_saved_model":
                 model = keras.models.load_model(model_path)
+            elif config_dict['model_type'] == "tflite_int8":
+                model = TFLiteInt8Model(model_path)
             else:
                 logger.error(f"Unsupported model type: {config_dict['model_type']}")
                 return False
             
-            # Store in memory
-            self.loaded_models[model_name] = {
-                'model': model,
-                'config': config_dict,
-                'class_names': config_dict['categories']
-            }
+            memory = self._estimate_model_memory(model, config_dict)
+            memory['rss_delta_bytes'] = max(self._process_rss() - rss_before, 0)
+            
+            with self._models_lock:
+                # Re-check against the real estimate now that the model is built
+                if not self._ensure_cache_capacity(memory['resident_bytes'], model_name, pinned):
+                    logger.error(
+                        f"Model '{model_name}' needs {memory['resident_bytes'] / 1048576:.1f} MB, "
+                        f"which exceeds the model cache budget ({self.cache_max_bytes / 1048576:.0f} MB)"
+                    )
+                    return False
+                
+                # Store in memory
+                self.loaded_models[model_name] = {
+                    'model': model,
+                    'config': config_dict,
+                    'class_names': config_dict['categories'],
+                    'memory': memory
+                }
             
             # Update Redis state
             state_manager.add_loaded_model(model_name)
             
-            logger.debug(f"Successfully loaded model: {model_name}")
+            logger.debug(
+                f"Successfully loaded model: {model_name} "
+                f"(~{memory['resident_bytes'] / 1048576:.1f} MB resident)"
+            )
             return True
             
         except Exception as e:
@@ -316,47 +389,342 @@ class ModelManager:
         Returns:
             bool: True if model unloaded successfully, False otherwise
         """
-        if model_name in self.loaded_models:
+        with self._models_lock:
+            if model_name not in self.loaded_models:
+                return False
             del self.loaded_models[model_name]
-            state_manager.remove_loaded_model(model_name)
-            logger.debug(f"Unloaded model: {model_name}")
-            return True
-        return False
+        state_manager.remove_loaded_model(model_name)
+        logger.debug(f"Unloaded model: {model_name}")
+        return True
+    
+    def _touch_model(self, model_name: str):
+        """Mark a loaded model as most recently used"""
+        with self._models_lock:
+            if model_name in self.loaded_models:
+                self.loaded_models.move_to_end(model_name)
+    
+    def _pinned_models(self) -> set:
+        """Models that must stay resident regardless of the cache budget"""
+        pending = state_manager.get_pending_swap() or {}
+        return {
+            name for name in (
+                state_manager.get_active_model(),
+                state_manager.get_shadow_model(),
+                pending.get('model_name'),
+            ) if name
+        }
     
-    def set_active_model(self, model_name: str) -> bool:
+    def _cache_used_bytes(self) -> int:
+        """Total estimated resident size of all loaded models"""
+        return sum(entry.get('memory', {}).get('resident_bytes', 0) for entry in self.loaded_models.values())
+    
+    def _ensure_cache_capacity(self, required_bytes: int, model_name: str, pinned: bool = False) -> bool:
         """
-        Set the active model for classification (instant change)
+        Evict least-recently-used, non-pinned models until required_bytes fits in the budget
+        
+        The active and shadow models are never evicted. A pinned model that does
+        not fit is still allowed in (serving beats the budget) with a warning.
+        
+        Args:
+            required_bytes: Estimated size of the model about to be cached
+            model_name: Name of the model about to be cached
+            pinned: Admit the model even if it cannot fit
+            
+        Returns:
+            bool: True if the model may be cached
+        """
+        with self._models_lock:
+            keep = self._pinned_models()
+            pinned = pinned or model_name in keep
+            keep.add(model_name)
+            
+            for candidate in list(self.loaded_models.keys()):
+                if self._cache_used_bytes() + required_bytes <= self.cache_max_bytes:
+                    break
+                if candidate in keep:
+                    continue
+                logger.info(f"Evicting least-recently-used model '{candidate}' to stay within the model cache budget")
+                self.unload_model(candidate)
+            
+            if self._cache_used_bytes() + required_bytes <= self.cache_max_bytes:
+                return True
+            
+            if pinned:
+                logger.warning(
+                    f"Model cache budget exceeded to keep '{model_name}' resident "
+                    f"({(self._cache_used_bytes() + required_bytes) / 1048576:.1f} MB of "
+                    f"{self.cache_max_bytes / 1048576:.0f} MB)"
+                )
+                return True
+            return False
+    
+    def _estimate_model_memory(self, model: Any, config_dict: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Estimate the resident size of a loaded model
+        
+        Parameters are counted from the weight tensors. The arena estimate is the
+        sum of every layer's activations for a single input, which is what the
+        runtime allocates for intermediate tensors during a forward pass.
+        
+        Returns:
+            Dict with param_bytes, arena_bytes and resident_bytes
+        """
+        param_bytes = 0
+        arena_bytes = 0
+        try:
+            for weight in getattr(model, 'weights', []):
+                dtype = np.dtype(getattr(weight.dtype, 'name', weight.dtype))
+                param_bytes += int(np.prod(weight.shape)) * dtype.itemsize
+            
+            for layer in getattr(model, 'layers', []):
+                try:
+                    output_shape = layer.output.shape
+                except (AttributeError, ValueError):
+                    continue
+                shapes = output_shape if isinstance(output_shape, list) else [output_shape]
+                for shape in shapes:
+                    dims = [int(d) for d in list(shape)[1:] if d is not None]
+                    arena_bytes += int(np.prod(dims)) * 4 if dims else 0
+        except Exception:
+            logger.exception(f"Error estimating memory for model '{config_dict.get('name')}'")
+        
+        if not param_bytes:
+            # Models without introspectable weights: fall back to the file size
+            param_bytes = self._path_size(config_dict.get('model_path', ''))
+        
+        return {
+            'param_bytes': param_bytes,
+            'arena_bytes': arena_bytes,
+            'resident_bytes': param_bytes + arena_bytes,
+        }
+    
+    @staticmethod
+    def _path_size(path: str) -> int:
+        """Size on disk of a model file or SavedModel directory"""
+        if os.path.isdir(path):
+            return sum(
+                os.path.getsize(os.path.join(root, f))
+                for root, _, files in os.walk(path) for f in files
+            )
+        return os.path.getsize(path) if os.path.exists(path) else 0
+    
+    @staticmethod
+    def _process_rss() -> int:
+        """Resident set size of this worker process in bytes"""
+        try:
+            return psutil.Process().memory_info().rss
+        except psutil.Error:
+            return 0
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get model cache usage for this worker process
+        
+        Returns:
+            Dict with budget, estimated usage, process RSS and LRU order
+        """
+        with self._models_lock:
+            return {
+                'budget_bytes': self.cache_max_bytes,
+                'used_bytes': self._cache_used_bytes(),
+                'process_rss_bytes': self._process_rss(),
+                'lru_order': list(self.loaded_models.keys()),
+            }
+    
+    def start_model_swap(self, model_name: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Start a two-phase swap of the active model and return without waiting
+        
+        Phase 1 announces the swap in Redis; every live swap participant loads
+        and warms the model in its background swap thread and reports
+        readiness. Phase 2 flips the active model for all participants at once,
+        only when every live participant is ready. If any fails, or readiness is
+        not reached within the timeout, the swap is aborted and the current
+        model keeps serving. Both phases run on a background thread; the outcome
+        is published through state_manager.get_last_swap().
         
         Args:
             model_name: Name of the model to activate
+            timeout: Seconds to wait for worker readiness (default MODEL_SWAP_TIMEOUT)
             
+        Returns:
+            The swap id, or None if the model does not exist or the swap could not be announced
+        """
+        swap_id, model_config, timeout = self._announce_swap(model_name, timeout)
+        if not swap_id:
+            return None
+        
+        def _coordinate():
+            close_old_connections()
+            try:
+                self._run_swap(swap_id, model_config, timeout)
+            finally:
+                close_old_connections()
+        
+        threading.Thread(target=_coordinate, name="model-manager-swap-coordinator", daemon=True).start()
+        return swap_id
+    
+    def set_active_model(self, model_name: str, timeout: Optional[float] = None) -> bool:
+        """
+        Set the active model and wait for the two-phase swap to finish
+        
+        Blocking variant of start_model_swap for management commands and scripts.
+        
         Returns:
             bool: True if model activated successfully, False otherwise
         """
-        # Check if model exists in database
+        swap_id, model_config, timeout = self._announce_swap(model_name, timeout)
+        if not swap_id:
+            return False
+        return self._run_swap(swap_id, model_config, timeout)
+    
+    def _announce_swap(self, model_name: str, timeout: Optional[float]):
+        """Announce a swap in Redis; returns (swap_id or None, model config, timeout)"""
         try:
             model_config = ModelConfiguration.objects.get(name=model_name)
         except ModelConfiguration.DoesNotExist:
             logger.error(f"Model '{model_name}' not found in database")
-            return False
+            return None, None, None
         
-        # Load the model if not already loaded
-        if not self.load_model(model_name):
+        timeout = timeout if timeout is not None else MODEL_SWAP_TIMEOUT
+        return state_manager.start_model_swap(model_name, int(timeout)), model_config, timeout
+    
+    def _run_swap(self, swap_id: str, model_config: ModelConfiguration, timeout: float) -> bool:
+        """Wait for readiness, then commit or abort an announced swap"""
+        model_name = model_config.name
+        try:
+            # A participant prepares right away instead of waiting for its next watcher tick
+            if self._is_swap_participant():
+                self._check_pending_swap()
+            
+            committed, message = self._wait_for_swap_readiness(swap_id, timeout)
+            if committed:
+                try:
+                    # Update database (this will automatically deactivate other models)
+                    model_config.is_active = True
+                    model_config.save()
+                except Exception as e:
+                    committed, message = False, f"database update failed: {e}"
+            
+            # Flip the active model (or abort) atomically for every worker
+            state_manager.finish_model_swap(swap_id, model_name, committed, message)
+            if not committed:
+                logger.error(f"Model swap to '{model_name}' aborted: {message}")
+                return False
+            
+            # A promoted shadow model has nothing left to be compared against
+            if state_manager.get_shadow_model() == model_name:
+                self.clear_shadow_model()
+            
+            logger.info(f"Active model set to: {model_name}")
+            
+            # Validate that categories exist in database
+            self._validate_model_categories(model_name)
+            return True
+        except Exception as e:
+            logger.exception(f"Model swap to '{model_name}' failed")
+            state_manager.finish_model_swap(swap_id, model_name, False, str(e))
             return False
+    
+    def _wait_for_swap_readiness(self, swap_id: str, timeout: float) -> Tuple[bool, str]:
+        """
+        Wait until every live worker has reported readiness for a swap
         
-        # Update database (this will automatically deactivate other models)
-        model_config.is_active = True
-        model_config.save()
-        
-        # Update Redis state (instant change)
-        state_manager.set_active_model(model_name)
-        
-        logger.debug(f"Active model set to: {model_name}")
-        
-        # Validate that categories exist in database
-        self._validate_model_categories(model_name)
+        Returns:
+            Tuple of (all_ready, message)
+        """
+        deadline = time.time() + timeout
+        while True:
+            readiness = state_manager.get_swap_readiness(swap_id)
+            failed = {w: r for w, r in readiness.items() if r != "ready"}
+            if failed:
+                worker_id, result = next(iter(failed.items()))
+                return False, f"worker {worker_id} could not load the model ({result.partition(':')[2]})"
+            
+            live_workers = set(state_manager.get_live_workers(MODEL_SWAP_WORKER_STALE_SECONDS))
+            if self._is_swap_participant():
+                live_workers.add(self.worker_id)
+            pending = live_workers - set(readiness)
+            if not pending:
+                return True, f"{len(readiness)} worker(s) ready"
+            
+            if time.time() >= deadline:
+                return False, f"timed out waiting for {len(pending)} worker(s): {', '.join(sorted(pending))}"
+            time.sleep(MODEL_SWAP_POLL_INTERVAL / 2)
+    
+    def enroll_swap_participant(self):
+        """
+        Take part in model swaps from this process (once per process, after any fork)
         
-        return True
+        Only processes that serve classification enrol, from predict_flow, so
+        Celery workers and management commands never have to load and warm a
+        model before a swap can commit.
+        """
+        if self._is_swap_participant():
+            return
+        with self._swap_lock:
+            if self._is_swap_participant():
+                return
+            self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+            self._swap_watcher_pid = os.getpid()
+            thread = threading.Thread(target=self._swap_watcher, name="model-manager-swap", daemon=True)
+            thread.start()
+    
+    def _is_swap_participant(self) -> bool:
+        return self._swap_watcher_pid == os.getpid()
+    
+    def _swap_watcher(self):
+        """Heartbeat this worker and preload any announced model swap off the request path"""
+        while True:
+            try:
+                state_manager.heartbeat_worker(self.worker_id)
+                # Prepare on a separate thread so heartbeats continue during long loads
+                self._check_pending_swap(background=True)
+            except Exception:
+                logger.exception("Error in model swap watcher")
+            time.sleep(MODEL_SWAP_POLL_INTERVAL)
+    
+    def _check_pending_swap(self, background: bool = False):
+        """Prepare the model of a pending swap once per swap"""
+        pending = state_manager.get_pending_swap()
+        if not pending:
+            return
+        
+        swap_id = pending['swap_id']
+        with self._swap_lock:
+            if swap_id in self._prepared_swaps:
+                return
+            self._prepared_swaps.add(swap_id)
+        
+        if background:
+            threading.Thread(
+                target=self._prepare_swap,
+                args=(swap_id, pending['model_name']),
+                name="model-manager-swap-prepare",
+                daemon=True
+            ).start()
+        else:
+            self._prepare_swap(swap_id, pending['model_name'])
+    
+    def _prepare_swap(self, swap_id: str, model_name: str):
+        """Load and warm a model for a swap, then report readiness through Redis"""
+        try:
+            if not self.load_model(model_name, pinned=True):
+                raise RuntimeError("load failed")
+            self._warm_up_model(model_name)
+            state_manager.report_swap_readiness(swap_id, self.worker_id, True)
+            logger.debug(f"Worker {self.worker_id} ready for swap to '{model_name}'")
+        except Exception as e:
+            logger.exception(f"Worker {self.worker_id} could not prepare model '{model_name}'")
+            state_manager.report_swap_readiness(swap_id, self.worker_id, False, str(e))
+    
+    def _warm_up_model(self, model_name: str):
+        """Run one dummy forward pass so the first real request does not pay graph setup"""
+        model_data = self.loaded_models.get(model_name)
+        if not model_data:
+            raise RuntimeError(f"model '{model_name}' is not loaded")
+        input_shape = model_data['config'].get('input_shape') or [225, 5]
+        model_data['model'].predict(np.zeros((1, *input_shape), dtype=np.float32), verbose=0)
     
     def _validate_model_categories(self, model_name: str):
         """
@@ -413,11 +781,12 @@ class ModelManager:
         
         if not active_model_name or active_model_name not in self.loaded_models:
             # Try to load the model if it's not loaded
-            if active_model_name and self.load_model(active_model_name):
-                return self.loaded_models[active_model_name]
+            if active_model_name and self.load_model(active_model_name, pinned=True):
+                return self.loaded_models.get(active_model_name)
             return None
         
-        return self.loaded_models[active_model_name]
+        self._touch_model(active_model_name)
+        return self.loaded_models.get(active_model_name)
     
     @property
     def active_model(self) -> Optional[str]:
@@ -497,8 +866,7 @@ class ModelManager:
         Returns:
             Tuple of (prediction, time_elapsed)
         """
-        import time
-        
+        self.enroll_swap_participant()
         active_model_data = self.get_active_model()
         if not active_model_data:
             raise ValueError("No active model available for prediction")
@@ -531,6 +899,9 @@ class ModelManager:
         end_time = time.time()
         time_elapsed = end_time - start_time
         
+        # Hand the same input tensor to the shadow model (if any), off the response path
+        self._submit_shadow(x_test, class_names[y_prediction], config.get('name'))
+        
         # Get probabilities
         probabilities = predictions[0] if len(predictions.shape) > 1 else predictions
         
@@ -656,7 +1027,191 @@ class ModelManager:
         self._increment_stats(confidence_level, time_elapsed, dns_detected=dns_detected, vpn_detected=vpn_detected, asn_used=asn_used)
         
         return final_prediction, time_elapsed
-    
+
+    def set_shadow_model(self, model_name: str, reset_stats: bool = True) -> bool:
+        """
+        Run a candidate model in shadow mode alongside the active model
+
+        The shadow model receives the same input tensors as the active model but
+        its predictions are never returned; only agreement, confusion and latency
+        are recorded in Redis.
+
+        Args:
+            model_name: Name of the candidate model
+            reset_stats: Clear previously recorded shadow stats for this model
+
+        Returns:
+            bool: True if shadow mode was enabled, False otherwise
+        """
+        if model_name == self.active_model:
+            logger.error(f"Model '{model_name}' is the active model and cannot be its own shadow")
+            return False
+
+        if not self.load_model(model_name, pinned=True):
+            return False
+
+        if reset_stats:
+            state_manager.reset_shadow_stats(model_name)
+
+        if not state_manager.set_shadow_model(model_name):
+            return False
+
+        self._shadow_name_cache = (model_name, time.time() + SHADOW_NAME_REFRESH_SECONDS)
+        logger.info(f"Shadow evaluation enabled for model: {model_name}")
+        return True
+
+    def clear_shadow_model(self) -> bool:
+        """
+        Stop shadow evaluation (the candidate model stays loaded until unloaded)
+
+        Returns:
+            bool: True if shadow mode was cleared
+        """
+        self._shadow_name_cache = (None, time.time() + SHADOW_NAME_REFRESH_SECONDS)
+        return state_manager.clear_shadow_model()
+
+    def get_shadow_model_name(self) -> Optional[str]:
+        """Get the shadow model name, cached locally for a few seconds to keep Redis off the hot path"""
+        name, expires_at = self._shadow_name_cache
+        now = time.time()
+        if now < expires_at:
+            return name
+        name = state_manager.get_shadow_model()
+        self._shadow_name_cache = (name, now + SHADOW_NAME_REFRESH_SECONDS)
+        return name
+
+    def get_shadow_stats(self, model_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get shadow evaluation statistics
+
+        Args:
+            model_name: Shadow model to report on (defaults to the current shadow model)
+
+        Returns:
+            Dict with agreement rate, per-class confusion and latency stats
+        """
+        model_name = model_name or state_manager.get_shadow_model()
+        if not model_name:
+            return {}
+        return state_manager.get_shadow_stats(model_name)
+
+    def _submit_shadow(self, x_test: np.ndarray, active_label: str, active_model_name: Optional[str]):
+        """Queue an input tensor for the shadow model without blocking the caller"""
+        try:
+            shadow_name = self.get_shadow_model_name()
+            if not shadow_name or shadow_name == active_model_name:
+                return
+
+            self._ensure_shadow_worker()
+            try:
+                self._shadow_queue.put_nowait((shadow_name, active_model_name, x_test, active_label))
+            except queue.Full:
+                # Shadow evaluation is best-effort; never apply back-pressure to classification
+                with self._shadow_lock:
+                    self._shadow_dropped += 1
+        except Exception:
+            logger.exception("Error submitting shadow evaluation sample")
+
+    def _ensure_shadow_worker(self):
+        """Start the shadow evaluation worker thread if it is not running"""
+        if self._shadow_thread is not None and self._shadow_thread.is_alive():
+            return
+        with self._shadow_lock:
+            if self._shadow_thread is None or not self._shadow_thread.is_alive():
+                self._shadow_thread = threading.Thread(
+                    target=self._shadow_worker,
+                    name="model-manager-shadow",
+                    daemon=True
+                )
+                self._shadow_thread.start()
+
+    def _shadow_worker(self):
+        """
+        Drain queued inputs and score them with the shadow model in batches
+
+        Everything queued while the previous forward pass ran is stacked into a
+        single batch, so the shadow model sees the same tensors within the same
+        scheduling window as the active model.
+        """
+        while True:
+            items = [self._shadow_queue.get()]
+            while len(items) < SHADOW_BATCH_SIZE:
+                try:
+                    items.append(self._shadow_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Group by shadow model in case it changed while items were queued
+            batches: Dict[Tuple[str, Optional[str]], List[Tuple[np.ndarray, str]]] = {}
+            for shadow_name, active_model_name, x_test, active_label in items:
+                batches.setdefault((shadow_name, active_model_name), []).append((x_test, active_label))
+
+            for (shadow_name, active_model_name), samples in batches.items():
+                try:
+                    self._evaluate_shadow_batch(shadow_name, active_model_name, samples)
+                except Exception:
+                    logger.exception(f"Error evaluating shadow model '{shadow_name}'")
+
+    def _load_shadow_model(self, shadow_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load and pin the shadow model in this process
+
+        set_shadow_model only loads the model in the process that handled the
+        request; every other worker loads it here, on its first shadow batch.
+        A failed load is retried after SHADOW_LOAD_RETRY_SECONDS, and samples
+        are skipped (without a warning per batch) until then.
+        """
+        if time.time() < self._shadow_load_retry_at.get(shadow_name, 0.0):
+            return None
+        if self.load_model(shadow_name, pinned=True):
+            self._shadow_load_retry_at.pop(shadow_name, None)
+            logger.info(f"Loaded shadow model '{shadow_name}' in worker {self.worker_id}")
+            return self.loaded_models.get(shadow_name)
+        self._shadow_load_retry_at[shadow_name] = time.time() + SHADOW_LOAD_RETRY_SECONDS
+        logger.warning(
+            f"Shadow model '{shadow_name}' could not be loaded; skipping shadow samples "
+            f"for {SHADOW_LOAD_RETRY_SECONDS:.0f}s"
+        )
+        return None
+
+    def _evaluate_shadow_batch(self, shadow_name: str, active_model_name: Optional[str],
+                               samples: List[Tuple[np.ndarray, str]]):
+        """Run one shadow forward pass and record agreement, confusion and latency"""
+        shadow_data = self.loaded_models.get(shadow_name) or self._load_shadow_model(shadow_name)
+        if not shadow_data:
+            return
+        self._touch_model(shadow_name)
+
+        model = shadow_data['model']
+        class_names = self._with_fallback_categories(shadow_data['class_names'])
+
+        batch = np.concatenate([x for x, _ in samples], axis=0)
+        start_time = time.time()
+        predictions = model.predict(batch, verbose=0)
+        latency_ms = (time.time() - start_time) * 1000
+
+        agreements = 0
+        confusion: Dict[str, int] = {}
+        for (_, active_label), shadow_index in zip(samples, np.argmax(predictions, axis=-1)):
+            shadow_label = class_names[int(shadow_index)] if int(shadow_index) < len(class_names) else "Unknown"
+            if shadow_label == active_label:
+                agreements += 1
+            pair = f"{active_label}|{shadow_label}"
+            confusion[pair] = confusion.get(pair, 0) + 1
+
+        with self._shadow_lock:
+            dropped, self._shadow_dropped = self._shadow_dropped, 0
+
+        state_manager.record_shadow_batch(
+            shadow_name,
+            active_model_name or "",
+            total=len(samples),
+            agreements=agreements,
+            confusion=confusion,
+            latency_ms=latency_ms,
+            dropped=dropped
+        )
+
     def list_models(self) -> List[Dict[str, Any]]:
         """
         List all available models with their status
@@ -665,13 +1220,16 @@ class ModelManager:
             List of model information dictionaries
         """
         models_info = []
+        shadow_model_name = state_manager.get_shadow_model()
         
         # Get all models from database
         db_models = ModelConfiguration.objects.all()
         
         for model in db_models:
             # Check if model is loaded in memory
-            is_loaded = model.name in self.loaded_models
+            loaded_entry = self.loaded_models.get(model.name)
+            is_loaded = loaded_entry is not None
+            memory = loaded_entry.get('memory', {}) if loaded_entry else {}
             
             # Check if file exists
             file_exists = os.path.exists(model.model_path)
@@ -686,9 +1244,15 @@ class ModelManager:
                 'version': model.version,
                 'confidence_threshold': model.confidence_threshold,
                 'is_active': model.is_active,
+                'is_shadow': model.name == shadow_model_name,
                 'is_loaded': is_loaded,
                 'file_exists': file_exists,
-                'input_shape': model.input_shape
+                'input_shape': model.input_shape,
+                'quantization_report': model.quantization_report,
+                'resident_bytes': memory.get('resident_bytes'),
+                'param_bytes': memory.get('param_bytes'),
+                'arena_bytes': memory.get('arena_bytes'),
+                'rss_delta_bytes': memory.get('rss_delta_bytes'),
             }
             models_info.append(model_info)
         
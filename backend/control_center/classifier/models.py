@@ -30,6 +30,7 @@ class ModelConfiguration(models.Model):
         ('tensorflow_saved_model', 'TensorFlow SavedModel'),
         ('pytorch', 'PyTorch'),
         ('onnx', 'ONNX'),
+        ('tflite_int8', 'TensorFlow Lite int8'),
     ]
     
     # Basic model info
@@ -55,6 +56,9 @@ class ModelConfiguration(models.Model):
     # Categories (stored as JSON for flexibility)
     categories = models.JSONField(help_text="List of category names")
     
+    # Accuracy-delta report of a quantized variant against its source model
+    quantization_report = models.JSONField(null=True, blank=True)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,194 @@
+"""
+Int8 Model Quantization
+
+Offline post-training quantization of Keras classifiers to full-integer
+TensorFlow Lite models, plus the runtime wrapper ModelManager uses to serve
+them. The classifiers consume uint8-derived inputs (packet bytes / 255), so a
+calibrated int8 input scale loses almost nothing while the int8 kernels run
+several times faster per CPU core than the float32 graph.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_inputs(raw: np.ndarray, input_shape: List[int]) -> np.ndarray:
+    """
+    Apply the same preprocessing as ModelManager.predict_flow
+
+    Args:
+        raw: Packet byte arrays, either flat or already shaped
+        input_shape: Model input shape without the batch dimension
+
+    Returns:
+        float32 array of shape (N, *input_shape) scaled to [0, 1]
+    """
+    arr = np.asarray(raw).reshape(-1, *input_shape)
+    if arr.dtype.kind in "iu" or arr.max(initial=0) > 1:
+        arr = arr.astype(int) / 255
+    return arr.astype(np.float32)
+
+
+def load_calibration_set(path: str, input_shape: List[int], categories: List[str],
+                         max_samples: Optional[int] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Load a calibration set from a .npz (arrays "x" and optional "y") or .npy file
+
+    Labels may be class indices or category names; names are mapped to indices
+    using the model's categories and unknown names are dropped.
+
+    Returns:
+        Tuple of (inputs, labels or None)
+    """
+    if path.endswith(".npz"):
+        data = np.load(path, allow_pickle=False)
+        x = data["x"]
+        y = data["y"] if "y" in data.files else None
+    else:
+        x = np.load(path, allow_pickle=False)
+        y = None
+
+    x = prepare_inputs(x, input_shape)
+
+    if y is not None:
+        y = np.asarray(y)
+        if y.dtype.kind in "US":
+            index = {name: i for i, name in enumerate(categories)}
+            keep = np.array([label in index for label in y])
+            x, y = x[keep], np.array([index[label] for label in y[keep]], dtype=np.int64)
+        else:
+            y = y.astype(np.int64)
+
+    if max_samples and len(x) > max_samples:
+        x = x[:max_samples]
+        y = y[:max_samples] if y is not None else None
+
+    return x, y
+
+
+def quantize_keras_model(model: Any, calibration_x: np.ndarray) -> bytes:
+    """
+    Convert a Keras model to a full-integer (int8 weights, activations and I/O) TFLite model
+
+    Args:
+        model: Loaded Keras model
+        calibration_x: Preprocessed inputs used to calibrate activation ranges
+
+    Returns:
+        Serialized TFLite flatbuffer
+    """
+    def _representative_dataset():
+        for i in range(len(calibration_x)):
+            yield [calibration_x[i:i + 1]]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = _representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    return converter.convert()
+
+
+class TFLiteInt8Model:
+    """
+    Serve a quantized TFLite model through the same predict() call as a Keras model
+
+    Inputs are quantized with the model's input scale/zero point and outputs
+    dequantized back to probabilities, so ModelManager's confidence logic is
+    unchanged. The interpreter is not thread-safe, so calls are serialized.
+    """
+
+    def __init__(self, model_path: str, num_threads: Optional[int] = None):
+        self.model_path = model_path
+        self._interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self._batch_size = int(self._input['shape'][0])
+        self._lock = threading.Lock()
+
+    def _quantize(self, x: np.ndarray) -> np.ndarray:
+        dtype = self._input['dtype']
+        scale, zero_point = self._input['quantization']
+        if not scale:
+            return x.astype(dtype)
+        info = np.iinfo(dtype)
+        return np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(dtype)
+
+    def _dequantize(self, q: np.ndarray) -> np.ndarray:
+        scale, zero_point = self._output['quantization']
+        if not scale:
+            return q.astype(np.float32)
+        return (q.astype(np.float32) - zero_point) * scale
+
+    def predict(self, x: np.ndarray, verbose: int = 0) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        with self._lock:
+            if x.shape[0] != self._batch_size:
+                self._interpreter.resize_tensor_input(self._input['index'], [x.shape[0], *x.shape[1:]])
+                self._interpreter.allocate_tensors()
+                self._input = self._interpreter.get_input_details()[0]
+                self._output = self._interpreter.get_output_details()[0]
+                self._batch_size = x.shape[0]
+            self._interpreter.set_tensor(self._input['index'], self._quantize(x))
+            self._interpreter.invoke()
+            return self._dequantize(self._interpreter.get_tensor(self._output['index']))
+
+
+def _timed_predict(model: Any, x: np.ndarray, batch_size: int) -> Tuple[np.ndarray, float]:
+    """Predict in batches and return (probabilities, milliseconds per sample)"""
+    outputs = []
+    start = time.perf_counter()
+    for i in range(0, len(x), batch_size):
+        outputs.append(model.predict(x[i:i + batch_size], verbose=0))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return np.concatenate(outputs, axis=0), elapsed_ms / max(len(x), 1)
+
+
+def compare_models(float_model: Any, int8_model: TFLiteInt8Model, x: np.ndarray,
+                   y: Optional[np.ndarray] = None, batch_size: int = 1) -> Dict[str, Any]:
+    """
+    Build the accuracy-delta report for a quantized model
+
+    Args:
+        float_model: Original Keras model
+        int8_model: Quantized model
+        x: Preprocessed evaluation inputs (held out from calibration)
+        y: Optional class indices; without labels only agreement is reported
+        batch_size: Batch size for the latency measurement (1 matches predict_flow)
+
+    Returns:
+        Dict with agreement, accuracy (when labelled) and latency figures
+    """
+    float_probs, float_ms = _timed_predict(float_model, x, batch_size)
+    int8_probs, int8_ms = _timed_predict(int8_model, x, batch_size)
+    float_top1 = np.argmax(float_probs, axis=-1)
+    int8_top1 = np.argmax(int8_probs, axis=-1)
+
+    report: Dict[str, Any] = {
+        'samples': int(len(x)),
+        'top1_agreement': float(np.mean(float_top1 == int8_top1)) if len(x) else 0.0,
+        'mean_abs_probability_delta': float(np.mean(np.abs(float_probs - int8_probs))) if len(x) else 0.0,
+        'float_ms_per_sample': float_ms,
+        'int8_ms_per_sample': int8_ms,
+        'speedup': (float_ms / int8_ms) if int8_ms else None,
+    }
+
+    if y is not None and len(y):
+        float_accuracy = float(np.mean(float_top1 == y))
+        int8_accuracy = float(np.mean(int8_top1 == y))
+        report.update({
+            'float_accuracy': float_accuracy,
+            'int8_accuracy': int8_accuracy,
+            'accuracy_delta': int8_accuracy - float_accuracy,
+        })
+
+    return report
@@ -1,6 +1,8 @@
 import json
 import logging
-from typing import Any, Dict, Optional
+import time
+import uuid
+from typing import Any, Dict, List, Optional
 from django.conf import settings
 import redis
 
@@ -112,6 +114,116 @@ class ModelStateManager:
             logger.error(f"Error removing loaded model from Redis: {e}")
             return False
     
+    # Two-phase model swap coordination (workers preload, report readiness, then switch)
+    def heartbeat_worker(self, worker_id: str) -> bool:
+        """Record that a model-serving worker process is alive"""
+        try:
+            self.redis_client.hset(f"{self.cache_prefix}workers", worker_id, time.time())
+            return True
+        except redis.exceptions.RedisError:
+            logger.exception("Error recording model worker heartbeat")
+            return False
+
+    def get_live_workers(self, max_age: float) -> List[str]:
+        """Get workers whose last heartbeat is within max_age seconds (prunes long-dead ones)"""
+        try:
+            key = f"{self.cache_prefix}workers"
+            now = time.time()
+            live, dead = [], []
+            for worker_id, seen_at in self.redis_client.hgetall(key).items():
+                age = now - float(seen_at)
+                if age <= max_age:
+                    live.append(worker_id)
+                elif age > max_age * 10:
+                    dead.append(worker_id)
+            if dead:
+                self.redis_client.hdel(key, *dead)
+            return live
+        except (redis.exceptions.RedisError, ValueError):
+            logger.exception("Error getting live model workers")
+            return []
+
+    def start_model_swap(self, model_name: str, timeout: int) -> Optional[str]:
+        """
+        Announce a pending model swap to all workers
+
+        Returns:
+            The swap id, or None if the swap could not be announced
+        """
+        try:
+            swap_id = uuid.uuid4().hex
+            self.redis_client.set(
+                f"{self.cache_prefix}pending_swap",
+                json.dumps({'swap_id': swap_id, 'model_name': model_name, 'started_at': time.time()}),
+                ex=timeout * 2
+            )
+            return swap_id
+        except redis.exceptions.RedisError:
+            logger.exception("Error starting model swap")
+            return None
+
+    def get_pending_swap(self) -> Optional[Dict[str, Any]]:
+        """Get the swap currently being prepared, if any"""
+        try:
+            pending = self.redis_client.get(f"{self.cache_prefix}pending_swap")
+            return json.loads(pending) if pending else None
+        except (redis.exceptions.RedisError, ValueError):
+            logger.exception("Error getting pending model swap")
+            return None
+
+    def report_swap_readiness(self, swap_id: str, worker_id: str, ready: bool, message: str = "") -> bool:
+        """Record whether this worker has loaded and warmed the model for a swap"""
+        try:
+            key = f"{self.cache_prefix}swap:{swap_id}"
+            pipe = self.redis_client.pipeline()
+            pipe.hset(key, worker_id, "ready" if ready else f"failed:{message}")
+            pipe.expire(key, self.cache_ttl)
+            pipe.execute()
+            return True
+        except redis.exceptions.RedisError:
+            logger.exception("Error reporting model swap readiness")
+            return False
+
+    def get_swap_readiness(self, swap_id: str) -> Dict[str, str]:
+        """Get per-worker readiness for a swap ("ready" or "failed:<reason>")"""
+        try:
+            return self.redis_client.hgetall(f"{self.cache_prefix}swap:{swap_id}")
+        except redis.exceptions.RedisError:
+            logger.exception("Error getting model swap readiness")
+            return {}
+
+    def finish_model_swap(self, swap_id: str, model_name: str, committed: bool, message: str = "") -> bool:
+        """
+        Complete a swap: flip the active model (if committed) and clear the pending
+        swap in a single MULTI/EXEC so workers never observe a half-finished swap.
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            if committed:
+                pipe.setex(f"{self.cache_prefix}active_model", self.cache_ttl, model_name)
+            pipe.delete(f"{self.cache_prefix}pending_swap")
+            pipe.set(f"{self.cache_prefix}last_swap", json.dumps({
+                'swap_id': swap_id,
+                'model_name': model_name,
+                'status': 'committed' if committed else 'aborted',
+                'message': message,
+                'finished_at': time.time(),
+            }))
+            pipe.execute()
+            return True
+        except redis.exceptions.RedisError:
+            logger.exception("Error finishing model swap")
+            return False
+
+    def get_last_swap(self) -> Optional[Dict[str, Any]]:
+        """Get the outcome of the most recent model swap"""
+        try:
+            last = self.redis_client.get(f"{self.cache_prefix}last_swap")
+            return json.loads(last) if last else None
+        except (redis.exceptions.RedisError, ValueError):
+            logger.exception("Error getting last model swap")
+            return None
+
     def clear_cache(self) -> bool:
         """Clear all model state cache (non-blocking with SCAN)"""
         try:
@@ -286,6 +398,140 @@ class ModelStateManager:
             self.reset_classification_stats()
             return stats
 
+    # Shadow model evaluation methods (candidate model scored against the active one)
+    def get_shadow_model(self) -> Optional[str]:
+        """Get the name of the model currently running in shadow mode"""
+        try:
+            return self.redis_client.get(f"{self.cache_prefix}shadow_model")
+        except redis.exceptions.RedisError:
+            logger.exception("Error getting shadow model from Redis")
+            return None
+
+    def set_shadow_model(self, model_name: str) -> bool:
+        """Set the model to run in shadow mode (no TTL, cleared explicitly)"""
+        try:
+            self.redis_client.set(f"{self.cache_prefix}shadow_model", model_name)
+            return True
+        except redis.exceptions.RedisError:
+            logger.exception("Error setting shadow model in Redis")
+            return False
+
+    def clear_shadow_model(self) -> bool:
+        """Stop shadow evaluation"""
+        try:
+            self.redis_client.delete(f"{self.cache_prefix}shadow_model")
+            return True
+        except redis.exceptions.RedisError:
+            logger.exception("Error clearing shadow model in Redis")
+            return False
+
+    def record_shadow_batch(self, model_name: str, active_model: str, total: int, agreements: int,
+                            confusion: Dict[str, int], latency_ms: float, dropped: int = 0):
+        """
+        Record the outcome of one shadow forward pass (atomic pipeline).
+
+        Args:
+            model_name: Shadow model name
+            active_model: Active model the shadow was compared against
+            total: Number of samples in the batch
+            agreements: Samples where shadow and active top-1 labels matched
+            confusion: Counts keyed by "<active_label>|<shadow_label>"
+            latency_ms: Wall time of the shadow forward pass
+            dropped: Samples dropped because the shadow queue was full
+        """
+        try:
+            key = f"shadow_stats:{model_name}"
+            pipe = self.redis_client.pipeline()
+            pipe.incrby(f"{key}:total", total)
+            pipe.incrby(f"{key}:agreements", agreements)
+            if dropped:
+                pipe.incrby(f"{key}:dropped", dropped)
+            for pair, count in confusion.items():
+                pipe.hincrby(f"{key}:confusion", pair, count)
+            pipe.lpush(f"{key}:latencies", f"{latency_ms:.3f}:{total}")
+            pipe.ltrim(f"{key}:latencies", 0, 999)  # Keep only last 1000 batches
+            pipe.set(f"{key}:compared_against", active_model)
+            pipe.execute()
+        except redis.exceptions.RedisError:
+            logger.exception("Error recording shadow evaluation batch")
+
+    def get_shadow_stats(self, model_name: str) -> dict:
+        """
+        Get agreement rate, per-class confusion and latency stats for a shadow model.
+
+        Confusion is returned as {active_label: {shadow_label: count}}.
+        """
+        try:
+            key = f"shadow_stats:{model_name}"
+            pipe = self.redis_client.pipeline()
+            pipe.mget([f"{key}:total", f"{key}:agreements", f"{key}:dropped", f"{key}:compared_against"])
+            pipe.hgetall(f"{key}:confusion")
+            pipe.lrange(f"{key}:latencies", 0, -1)
+            (total, agreements, dropped, compared_against), confusion_raw, latencies_raw = pipe.execute()
+
+            total = int(total or 0)
+            agreements = int(agreements or 0)
+
+            confusion: Dict[str, Dict[str, int]] = {}
+            for pair, count in confusion_raw.items():
+                active_label, _, shadow_label = pair.partition("|")
+                confusion.setdefault(active_label, {})[shadow_label] = int(count)
+
+            # Latencies are stored per batch as "<ms>:<batch_size>"
+            batch_ms = []
+            per_sample_ms = []
+            for entry in latencies_raw:
+                ms, _, size = entry.partition(":")
+                batch_ms.append(float(ms))
+                per_sample_ms.append(float(ms) / max(int(size or 1), 1))
+            batch_ms.sort()
+
+            def _percentile(values, pct):
+                if not values:
+                    return 0.0
+                return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+            return {
+                'model_name': model_name,
+                'compared_against': compared_against,
+                'total': total,
+                'agreements': agreements,
+                'agreement_rate': (agreements / total) if total else 0.0,
+                'dropped': int(dropped or 0),
+                'confusion': confusion,
+                'latency': {
+                    'batches': len(batch_ms),
+                    'avg_batch_ms': (sum(batch_ms) / len(batch_ms)) if batch_ms else 0.0,
+                    'p50_batch_ms': _percentile(batch_ms, 50),
+                    'p95_batch_ms': _percentile(batch_ms, 95),
+                    'max_batch_ms': batch_ms[-1] if batch_ms else 0.0,
+                    'avg_per_sample_ms': (sum(per_sample_ms) / len(per_sample_ms)) if per_sample_ms else 0.0,
+                },
+            }
+        except redis.exceptions.RedisError:
+            logger.exception("Error getting shadow evaluation stats")
+            return {}
+
+    def reset_shadow_stats(self, model_name: str):
+        """Reset shadow evaluation stats for a model (non-blocking with SCAN)"""
+        try:
+            cursor = 0
+            while True:
+                cursor, keys = self.redis_client.scan(
+                    cursor=cursor,
+                    match=f"shadow_stats:{model_name}:*",
+                    count=1000
+                )
+                if keys:
+                    pipe = self.redis_client.pipeline()
+                    for k in keys:
+                        pipe.delete(k)
+                    pipe.execute()
+                if cursor == 0:
+                    break
+        except redis.exceptions.RedisError:
+            logger.exception("Error resetting shadow evaluation stats")
+
 
 # Global state manager instance
 state_manager = ModelStateManager()
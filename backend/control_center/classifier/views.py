@@ -43,6 +43,7 @@ import os
 from network_data.tasks import create_flow_entry
 from network_device.models import NetworkDevice
 from network_data.tasks import create_flow_entries_batch
+from network_data.ingest_buffer import FLOW, buffer_records, stamp_flow_records
 import logging
 import ipaddress
 
@@ -189,8 +190,11 @@ def classify(request):
             except Exception as e:
                 results.append({'status': 'error', 'message': str(e)})
         # Batch log the flow entries
-        logger.debug(f"[CLASSIFIER] Batching {len(flow_entries_to_log)} flow entries")
-        create_flow_entries_batch.delay(flow_entries_to_log)
+        if flow_entries_to_log:
+            logger.debug(f"[CLASSIFIER] Buffering {len(flow_entries_to_log)} flow entries")
+            stamp_flow_records(flow_entries_to_log)
+            if not buffer_records(FLOW, flow_entries_to_log):
+                create_flow_entries_batch.delay(flow_entries_to_log)
         return JsonResponse(results, safe=False, status=200)
 
 
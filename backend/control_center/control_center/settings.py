@@ -64,6 +64,36 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Classifier: shadow-model evaluation (candidate scored off the response path)
+SHADOW_EVAL_QUEUE_SIZE = env.int("SHADOW_EVAL_QUEUE_SIZE", default=1000)
+SHADOW_EVAL_BATCH_SIZE = env.int("SHADOW_EVAL_BATCH_SIZE", default=64)
+# Classifier: per-process memory budget for loaded models (LRU eviction of non-active models)
+MODEL_CACHE_MAX_MB = env.int("MODEL_CACHE_MAX_MB", default=2048)
+# Classifier: two-phase model swap (seconds to wait for every worker to preload, watcher poll interval)
+MODEL_SWAP_TIMEOUT = env.int("MODEL_SWAP_TIMEOUT", default=120)
+MODEL_SWAP_POLL_INTERVAL = env.float("MODEL_SWAP_POLL_INTERVAL", default=1.0)
+
+# Flow ingestion buffer: records are coalesced in Redis streams and flushed by size or time; beyond MAX_RECORDS waiting records requests write directly
+INGEST_BUFFER_ENABLED = env.bool("INGEST_BUFFER_ENABLED", default=True)
+INGEST_BUFFER_FLUSH_SIZE = env.int("INGEST_BUFFER_FLUSH_SIZE", default=5000)
+INGEST_BUFFER_FLUSH_INTERVAL = env.int("INGEST_BUFFER_FLUSH_INTERVAL", default=2)
+INGEST_BUFFER_MAX_RECORDS = env.int("INGEST_BUFFER_MAX_RECORDS", default=500000)
+# Device/port stats buffer: monitor samples are coalesced in Redis streams; beyond MAX_RECORDS waiting rows samples are dropped
+STATS_BUFFER_ENABLED = env.bool("STATS_BUFFER_ENABLED", default=True)
+STATS_BUFFER_FLUSH_SIZE = env.int("STATS_BUFFER_FLUSH_SIZE", default=2000)
+STATS_BUFFER_FLUSH_INTERVAL = env.int("STATS_BUFFER_FLUSH_INTERVAL", default=2)
+STATS_BUFFER_MAX_RECORDS = env.int("STATS_BUFFER_MAX_RECORDS", default=200000)
+# Flow stat counter deltas: state TTL, max age (s) of a new flow counted in full, and snapshots kept per flow
+FLOW_COUNTER_STATE_TTL = env.int("FLOW_COUNTER_STATE_TTL", default=3600)
+FLOW_COUNTER_NEW_FLOW_SECONDS = env.float("FLOW_COUNTER_NEW_FLOW_SECONDS", default=30.0)
+FLOW_COUNTER_HISTORY = env.int("FLOW_COUNTER_HISTORY", default=16)
+# Device ping sweep: packets per second across all targets, and reply timeout (s)
+PING_PROBE_RATE = env.int("PING_PROBE_RATE", default=1000)
+PING_PROBE_TIMEOUT = env.float("PING_PROBE_TIMEOUT", default=1.0)
+# Dashboard aggregate response cache (seconds per cache bucket, aligned with the 1-minute aggregate refresh)
+AGGREGATE_CACHE_ENABLED = env.bool("AGGREGATE_CACHE_ENABLED", default=True)
+AGGREGATE_CACHE_TTL = env.int("AGGREGATE_CACHE_TTL", default=60)
+
 INSTALLED_APPS = [
     'daphne',
     'celery',
@@ -31,7 +31,7 @@ from general.views import (AddDeviceView, DeviceDetailView, DeviceListView, Plug
                            CheckDeviceConnectionView, DeleteDeviceView, ForceDeleteDeviceView, UpdateDeviceView,
                             CategoryListView)
 from network_map.views import OnosNetworkMap, OvsNetworkMap
-from odl.views import CreateOpenDaylightMeterView, odl_classify_and_apply_policy, OdlMeterDetailView, OdlMeterListView, OdlControllerNodesView, ModelManagementView, ModelLoadView, ModelInfoView
+from odl.views import CreateOpenDaylightMeterView, odl_classify_and_apply_policy, OdlMeterDetailView, OdlMeterListView, OdlControllerNodesView, ModelManagementView, ModelLoadView, ModelInfoView, ShadowModelView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
 from knox import views as knox_views
@@ -123,6 +123,7 @@ urlpatterns = [
     path('api/v1/models/', ModelManagementView.as_view(), name='model-management'),
     path('api/v1/models/load/', ModelLoadView.as_view(), name='model-load'),
     path('api/v1/models/info/', ModelInfoView.as_view(), name='model-info'),
+    path('api/v1/models/shadow/', ShadowModelView.as_view(), name='model-shadow'),
     # ---- PLUGINS ----
     # path('api/v1/plugins/', PluginListView.as_view(), name='plugin-list'),
     # path('api/v1/plugins/check/<str:plugin_name>/', CheckPluginInstallation.as_view(), name='plugin-check'),
@@ -0,0 +1,242 @@
+# File: alert_throttle.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Redis rate limiter for device and port health alerts.
+
+An alert for (entity, metric) may be sent when SET NX PX on its throttle key
+succeeds; the key then blocks the same alert for the metric's throttle
+interval. All checks of one batch go out in a single pipeline, so a check
+costs one Redis operation instead of a locked database transaction.
+
+DeviceHealthAlert and PortUtilizationAlert are kept as an audit record of
+when each alert was last sent: granted alerts are recorded in a Redis hash
+and sync_audit() (run periodically) upserts them into the tables in bulk.
+If Redis is unavailable, throttling falls back to those tables.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .health_windows import DEVICE, PORT, port_entity, split_port_entity
+from .models import DeviceHealthAlert, PortUtilizationAlert
+
+logger = logging.getLogger(__name__)
+
+# Minimum interval between two alerts of the same entity and metric
+THROTTLE_INTERVALS = {
+    DEVICE: {
+        'cpu': timedelta(seconds=60),
+        'memory': timedelta(seconds=60),
+        'disk': timedelta(hours=1),
+    },
+    PORT: {
+        'utilization': timedelta(seconds=30),
+        'link_speed': timedelta(hours=1),
+    },
+}
+# Audit table column per metric
+AUDIT_FIELDS = {
+    DEVICE: {
+        'cpu': 'last_cpu_alert',
+        'memory': 'last_memory_alert',
+        'disk': 'last_disk_alert',
+    },
+    PORT: {
+        'utilization': 'last_utilization_alert',
+        'link_speed': 'last_null_link_speed_alert',
+    },
+}
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Shared Redis connection for the alert throttle"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=getattr(settings, 'CHANNEL_REDIS_HOST', 'redis'),
+            port=getattr(settings, 'CHANNEL_REDIS_PORT', 6379),
+            decode_responses=True,
+            socket_connect_timeout=1.0,
+            socket_timeout=2.0,
+            client_name="alert-throttle"
+        )
+    return _redis_client
+
+
+def _throttle_key(kind: str, entity: str, metric: str) -> str:
+    return f"alert_throttle:{kind}:{entity}:{metric}"
+
+
+def _audit_key(kind: str) -> str:
+    return f"alert_throttle:audit:{kind}"
+
+
+def acquire(kind: str, candidates: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+    """
+    Take the throttle for each (entity, metric) that is free
+
+    Port entities are health_windows.port_entity keys.
+
+    Returns:
+        The (entity, metric) pairs whose alert may be sent now
+    """
+    if not candidates:
+        return set()
+    now = timezone.now()
+    try:
+        client = get_redis()
+        pipe = client.pipeline(transaction=False)
+        for entity, metric in candidates:
+            ttl_ms = int(THROTTLE_INTERVALS[kind][metric].total_seconds() * 1000)
+            pipe.set(_throttle_key(kind, entity, metric), now.isoformat(), nx=True, px=ttl_ms)
+        granted = {candidate for candidate, ok in zip(candidates, pipe.execute()) if ok}
+        if granted:
+            client.hset(_audit_key(kind), mapping={f"{entity}:{metric}": now.isoformat() for entity, metric in granted})
+        return granted
+    except redis.exceptions.RedisError:
+        logger.exception(f"Alert throttle unavailable in Redis; throttling {kind} alerts in the database")
+        return _acquire_from_db(kind, candidates, now)
+
+
+def _entity_filter(kind: str, entities) -> Q:
+    if kind == DEVICE:
+        return Q(ip_address__in=list(entities))
+    entity_filter = Q()
+    for entity in entities:
+        ip_address, port_name = split_port_entity(entity)
+        entity_filter |= Q(ip_address=ip_address, port_name=port_name)
+    return entity_filter
+
+
+def _record_entity(kind: str, record) -> str:
+    if kind == DEVICE:
+        return record.ip_address
+    return port_entity(record.ip_address, record.port_name)
+
+
+def _new_record(kind: str, entity: str):
+    if kind == DEVICE:
+        return DeviceHealthAlert(ip_address=entity)
+    ip_address, port_name = split_port_entity(entity)
+    return PortUtilizationAlert(ip_address=ip_address, port_name=port_name)
+
+
+def _model(kind: str):
+    return DeviceHealthAlert if kind == DEVICE else PortUtilizationAlert
+
+
+def _save_records(kind: str, records):
+    """
+    Write audit rows with one insert for new rows and one UPDATE batch
+
+    A new row may lose the insert to a row written concurrently for the same
+    entity; its send times are then merged into that row, keeping the later
+    time of each field. Must run inside a transaction.
+    """
+    update_fields = list(AUDIT_FIELDS[kind].values())
+    existing = [record for record in records if record.pk is not None]
+    new = {_record_entity(kind, record): record for record in records if record.pk is None}
+    if new:
+        _model(kind).objects.bulk_create(list(new.values()), ignore_conflicts=True)
+        # Re-select (inserted here or by the concurrent writer) and merge
+        for current in _model(kind).objects.select_for_update().filter(_entity_filter(kind, new)):
+            wanted = new.get(_record_entity(kind, current))
+            if wanted is None:
+                continue
+            changed = False
+            for field in update_fields:
+                sent_at = getattr(wanted, field)
+                if sent_at and (not getattr(current, field) or getattr(current, field) < sent_at):
+                    setattr(current, field, sent_at)
+                    changed = True
+            if changed:
+                existing.append(current)
+    if existing:
+        _model(kind).objects.bulk_update(existing, update_fields)
+
+
+def _acquire_from_db(kind: str, candidates: List[Tuple[str, str]], now) -> Set[Tuple[str, str]]:
+    """Fallback throttle: lock the audit rows of all candidates in one transaction"""
+    granted = set()
+    with transaction.atomic():
+        records = {
+            _record_entity(kind, record): record
+            for record in _model(kind).objects.select_for_update().filter(
+                _entity_filter(kind, {entity for entity, _ in candidates})
+            )
+        }
+        changed = {}
+        for entity, metric in candidates:
+            record = records.setdefault(entity, _new_record(kind, entity))
+            field = AUDIT_FIELDS[kind][metric]
+            last_alert = getattr(record, field)
+            if not last_alert or last_alert < now - THROTTLE_INTERVALS[kind][metric]:
+                setattr(record, field, now)
+                changed[entity] = record
+                granted.add((entity, metric))
+        _save_records(kind, list(changed.values()))
+    return granted
+
+
+def sync_audit(kind: str) -> int:
+    """
+    Copy alert send times recorded in Redis into the audit table
+
+    Returns:
+        int: Number of audit rows written
+    """
+    pipe = get_redis().pipeline()
+    pipe.hgetall(_audit_key(kind))
+    pipe.delete(_audit_key(kind))
+    sent_times, _ = pipe.execute()
+    if not sent_times:
+        return 0
+
+    latest: Dict[str, Dict[str, object]] = {}
+    for field, sent_at in sent_times.items():
+        entity, metric = field.rsplit(":", 1)
+        if metric in AUDIT_FIELDS[kind]:
+            latest.setdefault(entity, {})[AUDIT_FIELDS[kind][metric]] = parse_datetime(sent_at)
+
+    with transaction.atomic():
+        records = {
+            _record_entity(kind, record): record
+            for record in _model(kind).objects.select_for_update().filter(_entity_filter(kind, latest))
+        }
+        changed = []
+        for entity, fields in latest.items():
+            record = records.get(entity) or _new_record(kind, entity)
+            for field, sent_at in fields.items():
+                current = getattr(record, field)
+                if not current or current < sent_at:
+                    setattr(record, field, sent_at)
+            changed.append(record)
+        _save_records(kind, changed)
+    return len(changed)
@@ -24,3 +24,6 @@ from django.apps import AppConfig
 class DeviceMonitoringConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'device_monitoring'
+
+    def ready(self):
+        import device_monitoring.signals
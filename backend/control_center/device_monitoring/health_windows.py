@@ -0,0 +1,262 @@
+# File: health_windows.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Rolling health windows for devices and ports, evaluated at ingest.
+
+The ingestion endpoints push every device and port sample onto a short
+per-entity ring buffer (a capped Redis list covering the last
+WINDOW_SECONDS) and read the window back in the same round trip. The
+window is evaluated against the thresholds right away. Each threshold
+crossing is queued as an alert event on a per-kind Redis list, and a
+process_health_alerts task is dispatched to apply throttling and create the
+notifications. Detection latency is one sample, and no database read is
+needed.
+
+A per-(entity, metric) debounce key keeps a sustained breach from queueing
+an event on every sample. The periodic health checks drain the same queues
+as a safety net.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEVICE = "device"
+PORT = "port"
+
+# Averaging window of the health checks (seconds)
+WINDOW_SECONDS = 15
+# Ring buffer length; monitors post about once per second
+WINDOW_MAX_SAMPLES = 64
+# A sustained breach queues at most one event per entity and metric in this interval
+DEBOUNCE_MS = 5000
+# How long a dispatched processing task suppresses further dispatches
+DISPATCH_FLAG_MS = 1000
+
+CPU_THRESHOLD = 90.0
+MEMORY_THRESHOLD = 90.0
+DISK_THRESHOLD = 95.0
+UTILIZATION_THRESHOLD = 85.0
+
+# Queue events whose debounce key was free (KEYS: debounce keys, ARGV[1]: queue, ARGV[2]: ttl, ARGV[3..]: events)
+_ENQUEUE_SCRIPT = """
+local queued = 0
+for i, key in ipairs(KEYS) do
+    if redis.call('SET', key, 1, 'NX', 'PX', ARGV[2]) then
+        redis.call('RPUSH', ARGV[1], ARGV[i + 2])
+        queued = queued + 1
+    end
+end
+return queued
+"""
+
+_redis_client: Optional[redis.Redis] = None
+_enqueue_script = None
+
+
+def get_redis() -> redis.Redis:
+    """Shared Redis connection for the health windows"""
+    global _redis_client, _enqueue_script
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=getattr(settings, 'CHANNEL_REDIS_HOST', 'redis'),
+            port=getattr(settings, 'CHANNEL_REDIS_PORT', 6379),
+            decode_responses=True,
+            socket_connect_timeout=1.0,
+            socket_timeout=2.0,
+            client_name="health-windows"
+        )
+        _enqueue_script = _redis_client.register_script(_ENQUEUE_SCRIPT)
+    return _redis_client
+
+
+def _window_key(kind: str, entity: str) -> str:
+    return f"health:window:{kind}:{entity}"
+
+
+def _queue_key(kind: str) -> str:
+    return f"health:alerts:{kind}"
+
+
+def _dispatch_flag_key(kind: str) -> str:
+    return f"health:alerts:{kind}:scheduled"
+
+
+def port_entity(ip_address: str, port_name: str) -> str:
+    return f"{ip_address}|{port_name}"
+
+
+def split_port_entity(entity: str) -> Tuple[str, str]:
+    ip_address, port_name = entity.split("|", 1)
+    return ip_address, port_name
+
+
+def _push_and_read(pipe, kind: str, entity: str, fields, now_ms: int):
+    key = _window_key(kind, entity)
+    pipe.lpush(key, " ".join([str(now_ms), *("" if v is None else repr(float(v)) for v in fields)]))
+    pipe.ltrim(key, 0, WINDOW_MAX_SAMPLES - 1)
+    pipe.pexpire(key, WINDOW_SECONDS * 4 * 1000)
+    pipe.lrange(key, 0, -1)
+
+
+def _parse_window(raw_samples: List[str], now_ms: int) -> List[List[Optional[float]]]:
+    """Samples (newest first) inside the window"""
+    cutoff_ms = now_ms - WINDOW_SECONDS * 1000
+    samples = []
+    for raw in raw_samples:
+        ts, *values = raw.split(" ")
+        if float(ts) < cutoff_ms:
+            break  # Newest first: everything after is older
+        samples.append([float(v) if v else None for v in values])
+    return samples
+
+
+def evaluate_device_window(samples: List[List[Optional[float]]]) -> Dict[str, float]:
+    """
+    Threshold breaches of a device window
+
+    Returns:
+        {metric: value} for cpu/memory (window average) and disk (latest
+        reading) over their thresholds
+    """
+    if not samples:
+        return {}
+    avg_cpu = sum(s[0] for s in samples) / len(samples)
+    avg_memory = sum(s[1] for s in samples) / len(samples)
+    latest_disk = samples[0][2]
+    breaches = {}
+    if avg_cpu > CPU_THRESHOLD:
+        breaches['cpu'] = avg_cpu
+    if avg_memory > MEMORY_THRESHOLD:
+        breaches['memory'] = avg_memory
+    if latest_disk > DISK_THRESHOLD:
+        breaches['disk'] = latest_disk
+    return breaches
+
+
+def evaluate_port_window(samples: List[List[Optional[float]]]) -> Dict[str, Tuple[Optional[float], float]]:
+    """
+    Threshold breaches of a port window
+
+    Returns:
+        {'utilization': (avg_utilization, avg_throughput)} averaged over samples
+        with a known, non-zero utilization when above UTILIZATION_THRESHOLD,
+        and {'link_speed': (None, avg_throughput)} when there is traffic with
+        zero utilization (no link speed configured)
+    """
+    breaches = {}
+    utilized = [s for s in samples if s[0]]
+    if utilized:
+        avg_utilization = sum(s[0] for s in utilized) / len(utilized)
+        if avg_utilization > UTILIZATION_THRESHOLD:
+            breaches['utilization'] = (avg_utilization, sum(s[1] for s in utilized) / len(utilized))
+    unconfigured = [s for s in samples if s[0] == 0 and s[1] > 0]
+    if unconfigured:
+        breaches['link_speed'] = (None, sum(s[1] for s in unconfigured) / len(unconfigured))
+    return breaches
+
+
+def _enqueue(kind: str, events: List[Dict[str, Any]]) -> int:
+    """Queue breach events (debounced) and dispatch their processing"""
+    if not events:
+        return 0
+    client = get_redis()
+    keys = [f"health:debounce:{kind}:{e['entity']}:{e['metric']}" for e in events]
+    queued = _enqueue_script(
+        keys=keys, args=[_queue_key(kind), DEBOUNCE_MS, *(json.dumps(e) for e in events)]
+    )
+    if queued and client.set(_dispatch_flag_key(kind), 1, nx=True, px=DISPATCH_FLAG_MS):
+        from .tasks import process_health_alerts
+        process_health_alerts.delay(kind)
+    return queued
+
+
+def record_device_sample(ip_address: str, cpu: float, memory: float, disk: float) -> int:
+    """
+    Push a system stats sample onto the device's window and queue any breach
+
+    Returns:
+        int: Number of alert events queued
+    """
+    now_ms = int(time.time() * 1000)
+    pipe = get_redis().pipeline(transaction=False)
+    _push_and_read(pipe, DEVICE, ip_address, (cpu, memory, disk), now_ms)
+    window = _parse_window(pipe.execute()[-1], now_ms)
+    events = [
+        {"entity": ip_address, "metric": metric, "value": value, "ts": now_ms}
+        for metric, value in evaluate_device_window(window).items()
+    ]
+    return _enqueue(DEVICE, events)
+
+
+def record_port_samples(ip_address: str, samples: List[Tuple[str, Optional[float], float]]) -> int:
+    """
+    Push (port_name, utilization_percent, throughput_mbps) samples of one
+    switch in one round trip and queue any breach
+
+    Returns:
+        int: Number of alert events queued
+    """
+    if not samples:
+        return 0
+    now_ms = int(time.time() * 1000)
+    pipe = get_redis().pipeline(transaction=False)
+    entities = []
+    for port_name, utilization, throughput in samples:
+        entity = port_entity(ip_address, port_name)
+        entities.append(entity)
+        _push_and_read(pipe, PORT, entity, (utilization, throughput), now_ms)
+    results = pipe.execute()
+
+    events = []
+    # Each port used four pipeline commands; the window is the last one
+    for entity, raw_window in zip(entities, results[3::4]):
+        for metric, (value, throughput) in evaluate_port_window(_parse_window(raw_window, now_ms)).items():
+            events.append({"entity": entity, "metric": metric, "value": value,
+                           "throughput": throughput, "ts": now_ms})
+    return _enqueue(PORT, events)
+
+
+def drain_alerts(kind: str, max_events: int = 1000) -> List[Dict[str, Any]]:
+    """
+    Atomically take up to max_events queued alert events of one kind
+
+    The dispatch flag is cleared first so events queued while these are
+    being processed dispatch a new task.
+    """
+    client = get_redis()
+    client.delete(_dispatch_flag_key(kind))
+    pipe = client.pipeline()
+    pipe.lrange(_queue_key(kind), 0, max_events - 1)
+    pipe.ltrim(_queue_key(kind), max_events, -1)
+    raw_events, _ = pipe.execute()
+    events = []
+    for raw in raw_events:
+        try:
+            events.append(json.loads(raw))
+        except ValueError:
+            logger.warning(f"Dropping malformed {kind} health alert event: {raw!r}")
+    return events
@@ -0,0 +1,288 @@
+# File: icmp_prober.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Concurrent ICMP echo prober for the device ping sweep.
+
+All targets are pinged at once from a single asyncio loop over one
+unprivileged ICMP datagram socket per address family (Linux ping sockets,
+allowed by net.ipv4.ping_group_range). Probes go out in rounds, one echo
+request per target per round. Sending is paced to PING_PROBE_RATE packets
+per second, and consecutive probes to one target are at least
+ROUND_INTERVAL apart. Replies are matched to probes by sequence number. A
+sweep of N targets therefore takes about
+max(count * N / rate, (count - 1) * ROUND_INTERVAL) + timeout seconds.
+
+If ping sockets are not permitted, the whole sweep runs through a single
+fping process that reads its targets from stdin.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import struct
+import subprocess
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Echo requests per target per sweep, and replies needed to count a device alive
+PING_COUNT = 5
+ALIVE_THRESHOLD = 3
+# Minimum spacing of two probes to the same target (seconds)
+ROUND_INTERVAL = 0.5
+# Packets per second across all targets
+PING_PROBE_RATE = getattr(settings, 'PING_PROBE_RATE', 1000)
+# Time to wait for each reply (seconds)
+PING_PROBE_TIMEOUT = getattr(settings, 'PING_PROBE_TIMEOUT', 1.0)
+
+_ECHO_REQUEST = {socket.AF_INET: 8, socket.AF_INET6: 128}
+_ECHO_REPLY = {socket.AF_INET: 0, socket.AF_INET6: 129}
+_PAYLOAD = b"launch-control-ping"
+
+
+class PingResult(NamedTuple):
+    """Outcome of the probes sent to one target; RTTs in milliseconds"""
+    sent: int
+    received: int
+    min_rtt: Optional[float] = None
+    avg_rtt: Optional[float] = None
+    max_rtt: Optional[float] = None
+
+    @property
+    def loss_percent(self) -> float:
+        return 100.0 * (self.sent - self.received) / self.sent if self.sent else 100.0
+
+    @property
+    def is_alive(self) -> bool:
+        return self.received >= ALIVE_THRESHOLD
+
+
+def _result_from_rtts(sent: int, rtts: List[float]) -> PingResult:
+    if not rtts:
+        return PingResult(sent, 0)
+    return PingResult(sent, len(rtts), min(rtts), sum(rtts) / len(rtts), max(rtts))
+
+
+class _Sweep:
+    """State of one socket-based sweep"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, targets: Dict[str, Tuple[int, str]], timeout: float):
+        self.loop = loop
+        self.targets = targets  # ip -> (family, normalized address)
+        self.timeout = timeout
+        self.sockets: Dict[int, socket.socket] = {}
+        # (family, sequence) -> (ip, send time); sequence numbers wrap at 65536
+        self.in_flight: Dict[Tuple[int, int], Tuple[str, float]] = {}
+        self.sequences = {socket.AF_INET: 0, socket.AF_INET6: 0}
+        self.sent = {ip: 0 for ip in targets}
+        self.rtts: Dict[str, List[float]] = {ip: [] for ip in targets}
+        self.by_address = {address: ip for ip, (_, address) in targets.items()}
+
+    def open(self):
+        """Open a ping socket per family in use; raises OSError if not permitted"""
+        families = {family for family, _ in self.targets.values()}
+        for family in families:
+            proto = socket.IPPROTO_ICMP if family == socket.AF_INET else socket.IPPROTO_ICMPV6
+            sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+            sock.setblocking(False)
+            self.sockets[family] = sock
+            self.loop.add_reader(sock.fileno(), self._receive, family)
+
+    def close(self):
+        for sock in self.sockets.values():
+            self.loop.remove_reader(sock.fileno())
+            sock.close()
+
+    def send(self, ip: str):
+        family, address = self.targets[ip]
+        sequence = self.sequences[family]
+        self.sequences[family] = (sequence + 1) & 0xFFFF
+        # The kernel fills in the identifier and checksum of ping socket packets
+        packet = struct.pack("!BBHHH", _ECHO_REQUEST[family], 0, 0, 0, sequence) + _PAYLOAD
+        self.sent[ip] += 1
+        try:
+            self.sockets[family].sendto(packet, (address, 0))
+        except OSError as e:
+            logger.debug(f"Echo request to {ip} failed: {e}")
+            return
+        self.in_flight[(family, sequence)] = (ip, time.monotonic())
+
+    def _receive(self, family: int):
+        sock = self.sockets[family]
+        while True:
+            try:
+                data, source = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # ICMP errors (e.g. host unreachable) are reported on the socket
+                logger.debug(f"Ping socket error: {e}")
+                continue
+            received_at = time.monotonic()
+            if len(data) < 8 or data[0] != _ECHO_REPLY[family]:
+                continue
+            sequence = struct.unpack("!H", data[6:8])[0]
+            probe = self.in_flight.get((family, sequence))
+            if probe is None:
+                continue
+            ip, sent_at = probe
+            if self.by_address.get(source[0].split("%")[0]) != ip:
+                continue
+            del self.in_flight[(family, sequence)]
+            if received_at - sent_at <= self.timeout:
+                self.rtts[ip].append((received_at - sent_at) * 1000.0)
+
+    async def run(self, count: int, rate: float):
+        ips = list(self.targets)
+        start = self.loop.time()
+        total_sent = 0
+        for round_idx in range(count):
+            round_start = start + round_idx * ROUND_INTERVAL
+            if self.loop.time() < round_start:
+                await asyncio.sleep(round_start - self.loop.time())
+            for ip in ips:
+                # Pace sending to `rate` packets per second since the sweep started
+                while total_sent >= (self.loop.time() - start) * rate + 1:
+                    await asyncio.sleep(0.005)
+                self.send(ip)
+                total_sent += 1
+        # Wait for the last replies
+        deadline = time.monotonic() + self.timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+
+    def results(self) -> Dict[str, PingResult]:
+        return {ip: _result_from_rtts(self.sent[ip], self.rtts[ip]) for ip in self.targets}
+
+
+def _parse_targets(ip_addresses: List[str]) -> Tuple[Dict[str, Tuple[int, str]], List[str]]:
+    """Split addresses into (ip -> (family, normalized address)) and invalid ones"""
+    targets, invalid = {}, []
+    for ip in dict.fromkeys(ip_addresses):
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            invalid.append(ip)
+            continue
+        family = socket.AF_INET if address.version == 4 else socket.AF_INET6
+        targets[ip] = (family, str(address))
+    return targets, invalid
+
+
+def _ping_with_sockets(targets: Dict[str, Tuple[int, str]], count: int, timeout: float,
+                       rate: float) -> Dict[str, PingResult]:
+    async def sweep():
+        state = _Sweep(asyncio.get_running_loop(), targets, timeout)
+        try:
+            state.open()
+            await state.run(count, rate)
+        finally:
+            state.close()
+        return state.results()
+
+    return asyncio.run(sweep())
+
+
+def _parse_fping_line(line: str) -> Optional[Tuple[str, PingResult]]:
+    """
+    Parse an fping summary line, e.g.
+    "10.0.0.1 : xmt/rcv/%loss = 5/5/0%, min/avg/max = 0.31/0.42/0.61"
+    """
+    if 'xmt/rcv/%loss' not in line:
+        return None
+    try:
+        ip = line.split(' : ')[0].strip()
+        sent, received = (int(v) for v in line.split('xmt/rcv/%loss =')[1].split(',')[0].strip().split('/')[:2])
+        if 'min/avg/max =' in line:
+            min_rtt, avg_rtt, max_rtt = (float(v) for v in line.split('min/avg/max =')[1].strip().split('/'))
+            return ip, PingResult(sent, received, min_rtt, avg_rtt, max_rtt)
+        return ip, PingResult(sent, received)
+    except (ValueError, IndexError):
+        logger.warning(f"Failed to parse fping output line: {line}")
+        return None
+
+
+def _ping_with_fping(targets: Dict[str, Tuple[int, str]], count: int, timeout: float,
+                     rate: float) -> Dict[str, PingResult]:
+    """Ping every target with one fping process fed over stdin"""
+    # -i: gap between any two packets (ms), -p: gap between probes to one target (ms)
+    gap_ms = max(1, int(1000 / rate))
+    command = [
+        "fping", "-q", "-c", str(count), "-t", str(int(timeout * 1000)),
+        "-i", str(gap_ms), "-p", str(int(ROUND_INTERVAL * 1000)),
+    ]
+    expected_seconds = max(count * len(targets) * gap_ms / 1000, (count - 1) * ROUND_INTERVAL) + timeout
+    by_address = {address: ip for ip, (_, address) in targets.items()}
+    result = subprocess.run(
+        command,
+        input="\n".join(by_address).encode(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=expected_seconds + 10
+    )
+    results = {ip: PingResult(count, 0) for ip in targets}
+    for line in result.stderr.decode('utf-8').splitlines():
+        parsed = _parse_fping_line(line)
+        if parsed and parsed[0] in by_address:
+            results[by_address[parsed[0]]] = parsed[1]
+    return results
+
+
+def ping_hosts(ip_addresses: List[str], count: int = PING_COUNT, timeout: float = PING_PROBE_TIMEOUT,
+               rate: float = PING_PROBE_RATE) -> Dict[str, PingResult]:
+    """
+    Ping all addresses concurrently
+
+    Args:
+        ip_addresses: Addresses to ping (duplicates are pinged once)
+        count: Echo requests per address
+        timeout: Seconds to wait for each reply
+        rate: Maximum packets per second across all addresses
+
+    Returns:
+        Dict[str, PingResult]: Mapping of IP -> result; unreachable or
+        invalid addresses have no replies
+    """
+    targets, invalid = _parse_targets(ip_addresses)
+    results = {ip: PingResult(0, 0) for ip in invalid}
+    if invalid:
+        logger.warning(f"Not pinging invalid addresses: {invalid}")
+    if not targets:
+        return results
+
+    started = time.monotonic()
+    try:
+        results.update(_ping_with_sockets(targets, count, timeout, rate))
+    except OSError as e:
+        logger.warning(f"ICMP ping sockets unavailable ({e}); check net.ipv4.ping_group_range. Falling back to fping")
+        try:
+            results.update(_ping_with_fping(targets, count, timeout, rate))
+        except subprocess.TimeoutExpired:
+            logger.warning(f"fping sweep of {len(targets)} devices timed out")
+            results.update({ip: PingResult(count, 0) for ip in targets})
+        except FileNotFoundError:
+            logger.error("fping not found. Install with: apt-get install fping")
+            results.update({ip: PingResult(count, 0) for ip in targets})
+    logger.debug(f"Pinged {len(targets)} devices in {time.monotonic() - started:.2f}s")
+    return results
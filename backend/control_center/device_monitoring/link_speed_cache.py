@@ -0,0 +1,57 @@
+# File: link_speed_cache.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Process-level cache of port link speeds keyed by (device IP, port name).
+
+post_openflow_metrics needs the link speed of every port it receives stats
+for, every second, for every switch. The cache loads all configured link
+speeds with one query and serves lookups from memory. Port and Device
+post_save/post_delete signals invalidate it in every web and Celery process
+(see utils.process_cache.InvalidatingProcessCache).
+"""
+
+from typing import Dict, Optional, Tuple
+
+from utils.process_cache import InvalidatingProcessCache
+
+INVALIDATION_CHANNEL = "port_link_speed:invalidate"
+
+
+def _load_link_speeds() -> Dict[Tuple[str, str], int]:
+    from general.models import Port
+    return {
+        (device_ip, name): link_speed
+        for device_ip, name, link_speed in Port.objects.filter(link_speed__isnull=False)
+        .values_list('device__lan_ip_address', 'name', 'link_speed')
+    }
+
+
+class LinkSpeedCache(InvalidatingProcessCache[Tuple[str, str], int]):
+    """(device IP, port name) -> link speed in Mb/s, shared by everything in the process"""
+
+    def __init__(self):
+        super().__init__(_load_link_speeds, INVALIDATION_CHANNEL, name="port-link-speed-cache")
+
+    def link_speed(self, device_ip: str, port_name: str) -> Optional[int]:
+        """Link speed of a port in Mb/s, or None if the port is unknown or has none configured"""
+        return self.get_map().get((device_ip, port_name))
+
+
+link_speed_cache = LinkSpeedCache()
@@ -0,0 +1,51 @@
+"""
+Management command to set up the periodic flush of the device and port stats buffer
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django_celery_beat.models import PeriodicTask, PeriodicTasks, IntervalSchedule
+import json
+
+
+class Command(BaseCommand):
+    help = 'Sets up the periodic task that flushes buffered device and port utilization stats'
+
+    def handle(self, *_args, **_options):
+        interval = getattr(settings, 'STATS_BUFFER_FLUSH_INTERVAL', 2)
+
+        # Create or get the interval schedule
+        schedule, created = IntervalSchedule.objects.get_or_create(
+            every=interval,
+            period=IntervalSchedule.SECONDS,
+        )
+
+        if created:
+            self.stdout.write(self.style.SUCCESS(f'Created {interval}-second interval schedule'))
+
+        # Create or update the periodic task (idempotent - won't recreate if exists)
+        task_name = 'flush_stats_buffers'
+        task, task_created = PeriodicTask.objects.get_or_create(
+            name=task_name,
+            defaults={
+                'interval': schedule,
+                'task': 'device_monitoring.tasks.flush_stats_buffers',
+                'args': json.dumps([]),
+                'enabled': True,
+            }
+        )
+
+        if not task_created:
+            # Update existing task if needed
+            task.interval = schedule
+            task.task = 'device_monitoring.tasks.flush_stats_buffers'
+            task.args = json.dumps([])
+            task.enabled = True
+            task.save()
+            self.stdout.write(self.style.SUCCESS(f'Updated periodic task: {task_name}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Created periodic task: {task_name}'))
+
+        # Notify celery-beat to reload the schedule immediately
+        PeriodicTasks.changed(task)
+
+        self.stdout.write(self.style.SUCCESS(f'Stats buffer flush is now scheduled to run every {interval} seconds'))
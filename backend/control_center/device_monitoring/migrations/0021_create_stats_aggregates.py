@@ -0,0 +1,88 @@
+# File: device_monitoring/migrations/0021_create_stats_aggregates.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+from django.db import migrations
+
+from network_data.migration_utils import continuous_aggregate
+
+# Sums and counts (not averages) are stored so coarser tiers and arbitrary
+# query intervals can re-aggregate exactly: avg = SUM(x_sum) / SUM(x_count).
+# Port minima and maxima keep dips and spikes visible in downsampled charts.
+PORT_RAW_SELECT = """ip_address,
+                    port_name,
+                    SUM(utilization_percent) AS utilization_sum,
+                    COUNT(utilization_percent) AS utilization_count,
+                    MIN(utilization_percent) AS min_utilization,
+                    MAX(utilization_percent) AS max_utilization,
+                    SUM(throughput_mbps) AS throughput_sum,
+                    MIN(throughput_mbps) AS min_throughput,
+                    MAX(throughput_mbps) AS max_throughput,
+                    COUNT(*) AS sample_count"""
+PORT_ROLLUP_SELECT = """ip_address,
+                    port_name,
+                    SUM(utilization_sum) AS utilization_sum,
+                    SUM(utilization_count) AS utilization_count,
+                    MIN(min_utilization) AS min_utilization,
+                    MAX(max_utilization) AS max_utilization,
+                    SUM(throughput_sum) AS throughput_sum,
+                    MIN(min_throughput) AS min_throughput,
+                    MAX(max_throughput) AS max_throughput,
+                    SUM(sample_count) AS sample_count"""
+PORT_GROUP_BY = "ip_address, port_name"
+
+DEVICE_RAW_SELECT = """ip_address,
+                    SUM(cpu) AS cpu_sum, MAX(cpu) AS cpu_max,
+                    SUM(memory) AS memory_sum, MAX(memory) AS memory_max,
+                    SUM(disk) AS disk_sum, MAX(disk) AS disk_max,
+                    COUNT(*) AS sample_count"""
+DEVICE_ROLLUP_SELECT = """ip_address,
+                    SUM(cpu_sum) AS cpu_sum, MAX(cpu_max) AS cpu_max,
+                    SUM(memory_sum) AS memory_sum, MAX(memory_max) AS memory_max,
+                    SUM(disk_sum) AS disk_sum, MAX(disk_max) AS disk_max,
+                    SUM(sample_count) AS sample_count"""
+DEVICE_GROUP_BY = "ip_address"
+
+TEN_SECONDS = dict(width='10 seconds', start_offset='10 minutes', end_offset='10 seconds', schedule_interval='10 seconds')
+ONE_MINUTE = dict(width='1 minute', start_offset='1 hour', end_offset='1 minute', schedule_interval='1 minute')
+ONE_HOUR = dict(width='1 hour', start_offset='3 hours', end_offset='1 hour', schedule_interval='15 minutes')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+    dependencies = [
+        ('device_monitoring', '0020_remove_devicepingstats_device_moni_timestamp_is_alive_idx'),
+    ]
+
+    # 10-second buckets come from the 1 Hz hypertables; 1-minute and hourly
+    # buckets roll up the next finer aggregate.
+    operations = [
+        *continuous_aggregate('device_monitoring_portutilizationstats_10s', 'device_monitoring_portutilizationstats', time_column='timestamp',
+                              select=PORT_RAW_SELECT, group_by=PORT_GROUP_BY, **TEN_SECONDS),
+        *continuous_aggregate('device_monitoring_portutilizationstats_1m', 'device_monitoring_portutilizationstats_10s', time_column='bucket',
+                              select=PORT_ROLLUP_SELECT, group_by=PORT_GROUP_BY, **ONE_MINUTE),
+        *continuous_aggregate('device_monitoring_portutilizationstats_1h', 'device_monitoring_portutilizationstats_1m', time_column='bucket',
+                              select=PORT_ROLLUP_SELECT, group_by=PORT_GROUP_BY, **ONE_HOUR),
+
+        *continuous_aggregate('device_monitoring_devicestats_10s', 'device_monitoring_devicestats', time_column='timestamp',
+                              select=DEVICE_RAW_SELECT, group_by=DEVICE_GROUP_BY, **TEN_SECONDS),
+        *continuous_aggregate('device_monitoring_devicestats_1m', 'device_monitoring_devicestats_10s', time_column='bucket',
+                              select=DEVICE_ROLLUP_SELECT, group_by=DEVICE_GROUP_BY, **ONE_MINUTE),
+        *continuous_aggregate('device_monitoring_devicestats_1h', 'device_monitoring_devicestats_1m', time_column='bucket',
+                              select=DEVICE_ROLLUP_SELECT, group_by=DEVICE_GROUP_BY, **ONE_HOUR),
+    ]
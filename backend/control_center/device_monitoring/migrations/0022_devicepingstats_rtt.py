@@ -0,0 +1,33 @@
+# Generated by Django 5.1 on 2025-10-20 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('device_monitoring', '0021_create_stats_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devicepingstats',
+            name='min_rtt',
+            field=models.FloatField(blank=True, help_text='Minimum round-trip time in ms (null if no replies)', null=True),
+        ),
+        migrations.AddField(
+            model_name='devicepingstats',
+            name='avg_rtt',
+            field=models.FloatField(blank=True, help_text='Average round-trip time in ms (null if no replies)', null=True),
+        ),
+        migrations.AddField(
+            model_name='devicepingstats',
+            name='max_rtt',
+            field=models.FloatField(blank=True, help_text='Maximum round-trip time in ms (null if no replies)', null=True),
+        ),
+        migrations.AddField(
+            model_name='devicepingstats',
+            name='packet_loss',
+            field=models.FloatField(blank=True, help_text='Percentage of pings without a reply', null=True),
+        ),
+    ]
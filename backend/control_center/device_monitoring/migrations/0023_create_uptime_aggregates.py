@@ -0,0 +1,69 @@
+# File: device_monitoring/migrations/0023_create_uptime_aggregates.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+from django.db import migrations
+
+from network_data.migration_utils import continuous_aggregate
+
+# Counts and sums are stored so uptime, RTT and loss can be re-aggregated
+# exactly over any range of buckets.
+PING_RAW_SELECT = """device_id,
+                    COUNT(*) FILTER (WHERE is_alive) AS alive_count,
+                    COUNT(*) AS ping_count,
+                    MIN(timestamp) AS first_ping,
+                    MAX(timestamp) AS last_ping,
+                    MIN(timestamp) FILTER (WHERE is_alive) AS first_alive,
+                    MAX(timestamp) FILTER (WHERE is_alive) AS last_alive,
+                    SUM(avg_rtt) AS rtt_sum,
+                    COUNT(avg_rtt) AS rtt_count,
+                    MIN(min_rtt) AS min_rtt,
+                    MAX(max_rtt) AS max_rtt,
+                    SUM(packet_loss) AS packet_loss_sum,
+                    COUNT(packet_loss) AS packet_loss_count"""
+PING_ROLLUP_SELECT = """device_id,
+                    SUM(alive_count) AS alive_count,
+                    SUM(ping_count) AS ping_count,
+                    MIN(first_ping) AS first_ping,
+                    MAX(last_ping) AS last_ping,
+                    MIN(first_alive) AS first_alive,
+                    MAX(last_alive) AS last_alive,
+                    SUM(rtt_sum) AS rtt_sum,
+                    SUM(rtt_count) AS rtt_count,
+                    MIN(min_rtt) AS min_rtt,
+                    MAX(max_rtt) AS max_rtt,
+                    SUM(packet_loss_sum) AS packet_loss_sum,
+                    SUM(packet_loss_count) AS packet_loss_count"""
+
+
+class Migration(migrations.Migration):
+    atomic = False
+    dependencies = [
+        ('device_monitoring', '0022_devicepingstats_rtt'),
+    ]
+
+    # Devices are pinged once a minute, so 5-minute buckets are the finest
+    # tier worth materializing; hourly buckets roll them up.
+    operations = [
+        *continuous_aggregate('device_monitoring_devicepingstats_5m', 'device_monitoring_devicepingstats', time_column='timestamp',
+                              width='5 minutes', select=PING_RAW_SELECT, group_by='device_id',
+                              start_offset='1 hour', end_offset='5 minutes', schedule_interval='5 minutes'),
+        *continuous_aggregate('device_monitoring_devicepingstats_1h', 'device_monitoring_devicepingstats_5m', time_column='bucket',
+                              width='1 hour', select=PING_ROLLUP_SELECT, group_by='device_id',
+                              start_offset='3 hours', end_offset='1 hour', schedule_interval='15 minutes'),
+    ]
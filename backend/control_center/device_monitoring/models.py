@@ -124,6 +124,26 @@ class DevicePingStats(models.Model):
     successful_pings = models.IntegerField(
         help_text="Number of successful pings out of 5"
     )
+    min_rtt = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Minimum round-trip time in ms (null if no replies)"
+    )
+    avg_rtt = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Average round-trip time in ms (null if no replies)"
+    )
+    max_rtt = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Maximum round-trip time in ms (null if no replies)"
+    )
+    packet_loss = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Percentage of pings without a reply"
+    )
     timestamp = models.DateTimeField(
         auto_now_add=True,
         db_index=True,
@@ -0,0 +1,34 @@
+# File: signals.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from general.models import Device, Port
+from .link_speed_cache import link_speed_cache
+
+
+@receiver(post_save, sender=Port)
+@receiver(post_delete, sender=Port)
+@receiver(post_save, sender=Device)
+@receiver(post_delete, sender=Device)
+def invalidate_link_speed_cache(sender, instance, **kwargs):
+    # Reload link speeds in every process once the change is committed
+    # (Device changes cover a switch's LAN IP changing under its ports)
+    from django.db import transaction
+    transaction.on_commit(link_speed_cache.broadcast_invalidation)
@@ -0,0 +1,168 @@
+# File: stats_aggregates.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Source selection for port utilization and device stats queries.
+
+PortUtilizationStats and DeviceStats have 10-second, 1-minute and hourly
+continuous aggregates (migration 0021) storing per-bucket sums, counts,
+minima and maxima. A query for a given bucket interval reads the coarsest aggregate
+whose width divides the interval and re-buckets it; averages are rebuilt as
+SUM(sum) / SUM(count), so results match a query over the raw rows. Intervals
+finer than 10 seconds read the raw hypertable.
+
+DevicePingStats (one row per device per minute) has 5-minute and hourly
+aggregates (migration 0023) with alive/ping counts and RTT and loss sums.
+"""
+
+import math
+from typing import Dict, Optional, Tuple, Union
+
+PORT_UTILIZATION_TABLE = "device_monitoring_portutilizationstats"
+DEVICE_STATS_TABLE = "device_monitoring_devicestats"
+DEVICE_PING_TABLE = "device_monitoring_devicepingstats"
+
+# (width in seconds, width literal, view), coarsest first
+PORT_UTILIZATION_TIERS = (
+    (3600, '1 hour', 'device_monitoring_portutilizationstats_1h'),
+    (60, '1 minute', 'device_monitoring_portutilizationstats_1m'),
+    (10, '10 seconds', 'device_monitoring_portutilizationstats_10s'),
+)
+DEVICE_STATS_TIERS = (
+    (3600, '1 hour', 'device_monitoring_devicestats_1h'),
+    (60, '1 minute', 'device_monitoring_devicestats_1m'),
+    (10, '10 seconds', 'device_monitoring_devicestats_10s'),
+)
+DEVICE_PING_TIERS = (
+    (3600, '1 hour', 'device_monitoring_devicepingstats_1h'),
+    (300, '5 minutes', 'device_monitoring_devicepingstats_5m'),
+)
+
+INTERVAL_SECONDS: Dict[str, int] = {
+    '1 second': 1,
+    '10 seconds': 10,
+    '30 seconds': 30,
+    '1 minute': 60,
+    '5 minutes': 300,
+    '15 minutes': 900,
+    '1 hour': 3600,
+    '1 day': 86400,
+}
+
+# Aggregate expressions per source: the raw table has one sample per row
+PORT_UTILIZATION_EXPRESSIONS = {
+    'raw': """AVG(utilization_percent) AS avg_utilization,
+                MIN(utilization_percent) AS min_utilization,
+                MAX(utilization_percent) AS max_utilization,
+                AVG(throughput_mbps) AS avg_throughput,
+                MIN(throughput_mbps) AS min_throughput,
+                MAX(throughput_mbps) AS max_throughput""",
+    'aggregate': """SUM(utilization_sum) / NULLIF(SUM(utilization_count), 0) AS avg_utilization,
+                MIN(min_utilization) AS min_utilization,
+                MAX(max_utilization) AS max_utilization,
+                SUM(throughput_sum) / NULLIF(SUM(sample_count), 0) AS avg_throughput,
+                MIN(min_throughput) AS min_throughput,
+                MAX(max_throughput) AS max_throughput""",
+}
+SAMPLE_COUNT_EXPRESSIONS = {
+    'raw': "COUNT(*)",
+    'aggregate': "SUM(sample_count)",
+}
+DEVICE_STATS_EXPRESSIONS = {
+    'raw': """AVG(cpu) AS cpu_avg, MAX(cpu) AS cpu_max,
+                AVG(memory) AS memory_avg, MAX(memory) AS memory_max,
+                AVG(disk) AS disk_avg, MAX(disk) AS disk_max""",
+    'aggregate': """SUM(cpu_sum) / NULLIF(SUM(sample_count), 0) AS cpu_avg, MAX(cpu_max) AS cpu_max,
+                SUM(memory_sum) / NULLIF(SUM(sample_count), 0) AS memory_avg, MAX(memory_max) AS memory_max,
+                SUM(disk_sum) / NULLIF(SUM(sample_count), 0) AS disk_avg, MAX(disk_max) AS disk_max""",
+}
+
+# Uptime series per bucket; time_bucket_gapfill leaves the aggregates of empty
+# buckets NULL, which read as 0% uptime and no pings
+DEVICE_UPTIME_EXPRESSIONS = {
+    'raw': """COALESCE(COUNT(*) FILTER (WHERE is_alive) * 100.0 / NULLIF(COUNT(*), 0), 0) AS uptime_percentage,
+                COALESCE(COUNT(*), 0) AS total_pings,
+                COALESCE(COUNT(*) FILTER (WHERE is_alive), 0) AS alive_count,
+                MIN(timestamp) FILTER (WHERE is_alive) AS first_alive,
+                MAX(timestamp) FILTER (WHERE is_alive) AS last_alive,
+                AVG(avg_rtt) AS avg_rtt,
+                AVG(packet_loss) AS packet_loss""",
+    'aggregate': """COALESCE(SUM(alive_count) * 100.0 / NULLIF(SUM(ping_count), 0), 0) AS uptime_percentage,
+                COALESCE(SUM(ping_count), 0)::bigint AS total_pings,
+                COALESCE(SUM(alive_count), 0)::bigint AS alive_count,
+                MIN(first_alive) AS first_alive,
+                MAX(last_alive) AS last_alive,
+                SUM(rtt_sum) / NULLIF(SUM(rtt_count), 0) AS avg_rtt,
+                SUM(packet_loss_sum) / NULLIF(SUM(packet_loss_count), 0) AS packet_loss""",
+}
+
+
+def select_source(tiers, table: str, interval: Union[str, int]) -> Tuple[str, str, Optional[str]]:
+    """
+    Pick the relation to read for a bucket interval
+
+    Args:
+        tiers: PORT_UTILIZATION_TIERS or DEVICE_STATS_TIERS
+        table: The raw hypertable, used when no aggregate fits
+        interval: A key of INTERVAL_SECONDS, or a width in seconds
+
+    Returns:
+        Tuple of (relation, time column, source width literal or None for the
+        raw table)
+    """
+    seconds = interval if isinstance(interval, int) else INTERVAL_SECONDS[interval]
+    for width_seconds, width, view in tiers:
+        if seconds >= width_seconds and seconds % width_seconds == 0:
+            return view, 'bucket', width
+    return table, 'timestamp', None
+
+
+def time_conditions(time_column: str, width: Optional[str], start=None, end=None) -> Tuple[list, list]:
+    """
+    WHERE conditions and params for an optional [start, end] range
+
+    On an aggregate the bucket containing start is included, so the first
+    bucket of the result is not cut short.
+    """
+    conditions, params = [], []
+    if start is not None:
+        if width:
+            conditions.append(f"{time_column} >= time_bucket('{width}', %s::timestamptz)")
+        else:
+            conditions.append(f"{time_column} >= %s")
+        params.append(start)
+    if end is not None:
+        conditions.append(f"{time_column} <= %s")
+        params.append(end)
+    return conditions, params
+
+
+def downsample_interval(range_seconds: float, max_points: int, min_seconds: int) -> int:
+    """
+    Bucket width (seconds) giving at most max_points buckets over a range
+
+    Widths are rounded up to a multiple of the aggregate widths (10 s, 1 min,
+    1 h) so the result can be served from a continuous aggregate, and never
+    go below min_seconds (the requested interval).
+    """
+    seconds = max(min_seconds, math.ceil(range_seconds / max(max_points, 1)))
+    for step in (3600, 60, 10):
+        if seconds > step:
+            return math.ceil(seconds / step) * step
+    return seconds
@@ -0,0 +1,206 @@
+# File: stats_buffer.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Buffered writer for the DeviceStats and PortUtilizationStats hypertables.
+
+Every monitored switch posts system stats and port metrics once per second.
+Instead of one INSERT transaction per request, the views append validated
+rows (stamped with their arrival time) to a Redis stream per kind. A consumer
+task drains the stream and writes everything it read with one COPY per kind;
+flushes are triggered by size or by a short periodic task. The stream
+handling, including isolation and dead-lettering of entries that fail to
+write, is shared with the flow ingestion buffer (utils.stream_buffer).
+
+Memory is bounded: once STATS_BUFFER_MAX_RECORDS rows are waiting, new
+samples are dropped rather than queued (monitoring samples are superseded a
+second later, and writing them directly would only add load to a database
+that is already behind). Buffered, dropped, written and dead-lettered rows
+are counted per kind in Redis (see buffer_counters).
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from network_data.ingestion import copy_rows, inet_value, varchar_value
+from utils.stream_buffer import StreamBuffer
+from .models import DeviceStats, PortUtilizationStats
+
+logger = logging.getLogger(__name__)
+
+DEVICE_STATS = "device_stats"
+PORT_UTILIZATION = "port_utilization"
+
+STREAM_KEYS = {
+    DEVICE_STATS: "stats_buffer:device_stats",
+    PORT_UTILIZATION: "stats_buffer:port_utilization",
+}
+MODELS = {
+    DEVICE_STATS: DeviceStats,
+    PORT_UTILIZATION: PortUtilizationStats,
+}
+COLUMNS = {
+    DEVICE_STATS: ("timestamp", "ip_address", "cpu", "memory", "disk"),
+    PORT_UTILIZATION: (
+        "timestamp", "ip_address", "port_name", "throughput_mbps", "utilization_percent",
+        "rx_bytes_diff", "tx_bytes_diff", "duration_diff",
+    ),
+}
+PORT_NAME_MAX_LENGTH = PortUtilizationStats._meta.get_field('port_name').max_length
+
+COUNTERS_KEY = "stats_buffer:counters"
+CONSUMER_GROUP = "stats-writers"
+
+STATS_BUFFER_ENABLED = getattr(settings, 'STATS_BUFFER_ENABLED', True)
+# Buffered rows that trigger an immediate flush
+FLUSH_SIZE = getattr(settings, 'STATS_BUFFER_FLUSH_SIZE', 2000)
+# Buffered rows beyond which new samples are dropped
+MAX_RECORDS = getattr(settings, 'STATS_BUFFER_MAX_RECORDS', 200000)
+
+stream_buffer = StreamBuffer(STREAM_KEYS, CONSUMER_GROUP, client_name="stats-buffer")
+
+
+def device_stats_row(ip_address: str, data: Dict[str, Any]) -> Tuple:
+    """
+    Validate a system stats payload into a DeviceStats row
+
+    Raises:
+        ValueError: If ip_address is not an IP address or cpu, memory or disk is not a number
+    """
+    ip_address = inet_value(ip_address, 'ip_address')
+    try:
+        return (
+            timezone.now(),
+            ip_address,
+            float(data.get('cpu', 0.0)),
+            float(data.get('memory', 0.0)),
+            float(data.get('disk', 0.0)),
+        )
+    except (TypeError, ValueError):
+        raise ValueError("cpu, memory and disk must be numbers")
+
+
+def port_utilization_row(ip_address: str, port_name: str, throughput_mbps: float,
+                         utilization_percent: Optional[float], values: Dict[str, Any]) -> Tuple:
+    """
+    Build a PortUtilizationStats row from one port's computed metrics
+
+    Raises:
+        ValueError: If ip_address is not an IP address or port_name is too long
+    """
+    return (
+        timezone.now(),
+        inet_value(ip_address, 'device_ip'),
+        varchar_value(port_name, 'port_name', PORT_NAME_MAX_LENGTH),
+        float(throughput_mbps),
+        utilization_percent,
+        int(values['rx_bytes_diff']),
+        int(values['tx_bytes_diff']),
+        float(values['duration_diff']),
+    )
+
+
+def buffer_rows(kind: str, rows: List[Tuple]) -> bool:
+    """
+    Append rows to the stats buffer, scheduling a flush when it is full enough
+
+    Rows are dropped (and counted) when MAX_RECORDS rows are already waiting.
+
+    Args:
+        kind: DEVICE_STATS or PORT_UTILIZATION
+        rows: Tuples matching COLUMNS[kind]
+
+    Returns:
+        bool: True if the rows were buffered or deliberately dropped; False if
+        the caller should write them directly (buffer disabled or Redis down)
+    """
+    if not rows:
+        return True
+    if not STATS_BUFFER_ENABLED:
+        return False
+
+    try:
+        client = stream_buffer.get_redis()
+        if stream_buffer.pending(kind) + len(rows) > MAX_RECORDS:
+            client.hincrby(COUNTERS_KEY, f"{kind}:dropped", len(rows))
+            return True
+
+        pipe = client.pipeline()
+        pipe.hincrby(COUNTERS_KEY, f"{kind}:buffered", len(rows))
+        pending = stream_buffer.append(kind, {"rows": json.dumps(rows, default=str)}, len(rows), pipe=pipe)
+
+        from .tasks import flush_stats_buffer
+        stream_buffer.schedule_flush(kind, pending, FLUSH_SIZE, flush_stats_buffer)
+        return True
+    except redis.exceptions.RedisError:
+        logger.exception(f"Stats buffer unavailable for {kind} rows")
+        return False
+
+
+def write_rows(kind: str, rows: List[Tuple]) -> int:
+    """Write rows with COPY, falling back to bulk_create off PostgreSQL"""
+    if not rows:
+        return 0
+    model, columns = MODELS[kind], COLUMNS[kind]
+    if connection.vendor == 'postgresql':
+        return copy_rows(model._meta.db_table, columns, rows)
+    model.objects.bulk_create([model(**dict(zip(columns, row))) for row in rows], batch_size=5000)
+    return len(rows)
+
+
+def buffer_counters() -> Dict[str, int]:
+    """Buffered/dropped/written/dead-lettered row counts and lost entries per kind, plus rows currently waiting"""
+    client = stream_buffer.get_redis()
+    counters = {field: int(value) for field, value in client.hgetall(COUNTERS_KEY).items()}
+    for kind in STREAM_KEYS:
+        counters[f"{kind}:pending"] = stream_buffer.pending(kind)
+    return counters
+
+
+def flush(kind: str, max_rounds: int = 20) -> Dict[str, Any]:
+    """
+    Drain buffered rows of one kind into the database
+
+    Each round writes the rows of every entry read with one COPY; see
+    StreamBuffer.flush for how failing entries are isolated.
+
+    Returns:
+        Dict with created, errors and dead_lettered across all rounds
+    """
+    def decode(fields: Dict[str, str]) -> Tuple[List[Tuple], int]:
+        rows = [tuple(row) for row in json.loads(fields["rows"])]
+        return rows, int(fields.get("count", len(rows)))
+
+    def write(payloads: List[List[Tuple]]) -> Dict[str, Any]:
+        return {"created": write_rows(kind, [row for rows in payloads for row in rows])}
+
+    summary = stream_buffer.flush(kind, decode, write, max_rounds=max_rounds)
+
+    pipe = stream_buffer.get_redis().pipeline()
+    pipe.hincrby(COUNTERS_KEY, f"{kind}:written", summary["created"])
+    pipe.hincrby(COUNTERS_KEY, f"{kind}:dead_lettered", summary["dead_lettered"])
+    pipe.hincrby(COUNTERS_KEY, f"{kind}:lost_entries", summary["trimmed"])
+    pipe.execute()
+    return summary
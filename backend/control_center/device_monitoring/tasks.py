@@ -2,21 +2,209 @@
 Celery tasks for device health monitoring
 """
 from celery import shared_task
-from django.contrib.auth import get_user_model
-from django.db import connection, transaction
+from django.db import connection
 from django.utils import timezone
 from datetime import timedelta
 import logging
+import redis
 
-from .models import DeviceStats, DeviceHealthAlert, PortUtilizationStats, PortUtilizationAlert, DevicePingStats
-from .utils import ping_device, ping_devices_with_fallback
+from .models import DeviceStats, PortUtilizationStats, DevicePingStats
+from . import alert_throttle, health_windows, icmp_prober, stats_buffer
+from network_data.ingestion import copy_rows
 from notification.models import Notification
 from network_device.models import NetworkDevice
 
-User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+def _recent_device_stats_from_db(since):
+    """SQL fallback for the device windows when Redis is unavailable"""
+    # Use last(disk, timestamp) to get the most recent disk reading, not MAX
+    query = """
+        SELECT 
+            ip_address,
+            AVG(cpu) as avg_cpu,
+            AVG(memory) as avg_memory,
+            last(disk, timestamp) as latest_disk
+        FROM device_monitoring_devicestats
+        WHERE timestamp >= %s
+        GROUP BY ip_address
+        HAVING AVG(cpu) > %s OR AVG(memory) > %s OR last(disk, timestamp) > %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(query, [since, health_windows.CPU_THRESHOLD, health_windows.MEMORY_THRESHOLD,
+                               health_windows.DISK_THRESHOLD])
+        return cursor.fetchall()
+
+
+def _recent_port_issues_from_db(since):
+    """SQL fallback for the port windows when Redis is unavailable"""
+    # Query for ports exceeding the utilization threshold over the window
+    utilization_query = """
+        SELECT ip_address, port_name, 
+               AVG(utilization_percent) as avg_utilization,
+               AVG(throughput_mbps) as avg_throughput
+        FROM device_monitoring_portutilizationstats
+        WHERE timestamp >= %s
+          AND utilization_percent IS NOT NULL
+          AND utilization_percent > 0
+        GROUP BY ip_address, port_name
+        HAVING AVG(utilization_percent) > %s
+        ORDER BY avg_utilization DESC
+    """
+    
+    # Query for ports with missing link_speed (throughput > 0 but utilization = 0)
+    missing_link_speed_query = """
+        SELECT ip_address, port_name, AVG(throughput_mbps) as avg_throughput
+        FROM device_monitoring_portutilizationstats
+        WHERE timestamp >= %s
+          AND utilization_percent = 0
+          AND throughput_mbps > 0
+        GROUP BY ip_address, port_name
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(utilization_query, [since, health_windows.UTILIZATION_THRESHOLD])
+        utilization_violations = cursor.fetchall()
+        cursor.execute(missing_link_speed_query, [since])
+        missing_link_speed_ports = cursor.fetchall()
+    return utilization_violations, missing_link_speed_ports
+
+
+def _broadcast_alerts(alerts):
+    """
+    Create one broadcast notification (shown to every user) per
+    (message, urgency) alert; read state is kept per user on demand
+    """
+    if not alerts:
+        return 0
+    Notification.objects.bulk_create([
+        Notification(user=None, message=message, urgency=urgency, type='DEVICE_RESOURCE', notifier=None)
+        for message, urgency in alerts
+    ])
+    return len(alerts)
+
+
+def _device_messages(ip_address, breaches):
+    """(metric, message) pairs for a device's {metric: value} breaches"""
+    messages = []
+    if 'cpu' in breaches:
+        messages.append(('cpu', f"Device {ip_address}: CPU usage averaged {breaches['cpu']:.2f}% over last 15 seconds"))
+    if 'memory' in breaches:
+        messages.append(('memory', f"Device {ip_address}: Memory usage averaged {breaches['memory']:.2f}% over last 15 seconds"))
+    if 'disk' in breaches:
+        messages.append(('disk', f"Device {ip_address}: Disk usage is {breaches['disk']:.2f}%"))
+    return messages
+
+
+def _apply_device_alerts(violations):
+    """
+    Throttle and send device alerts
+
+    Args:
+        violations: {ip_address: {metric: value}} with metric in cpu/memory/disk
+
+    Each (device, metric) alert is throttled by alert_throttle (one Redis
+    pipeline for the whole batch).
+    """
+    if not violations:
+        return 0
+    candidates = {}
+    for ip_address, breaches in violations.items():
+        for metric, message in _device_messages(ip_address, breaches):
+            candidates[(ip_address, metric)] = message
+    
+    granted = alert_throttle.acquire(health_windows.DEVICE, list(candidates))
+    for ip_address, metric in set(candidates) - granted:
+        logger.debug(f"Device {ip_address}: {metric} alert throttled")
+    alerts_to_send = [(candidates[key], 'high') for key in candidates if key in granted]
+    
+    created = _broadcast_alerts(alerts_to_send)
+    logger.debug(f"Created {created} health notifications for {len(violations)} device(s)")
+    return len(alerts_to_send)
+
+
+def _apply_port_alerts(utilization_violations, missing_link_speed_ports):
+    """
+    Throttle and send port alerts
+
+    Args:
+        utilization_violations: {(ip_address, port_name): (avg_utilization, avg_throughput)}
+        missing_link_speed_ports: {(ip_address, port_name): avg_throughput}
+    """
+    if not utilization_violations and not missing_link_speed_ports:
+        return 0
+    candidates = {}
+    
+    # Utilization violations, busiest first; urgency is high above 95%
+    for (ip_address, port_name), (avg_utilization, avg_throughput) in sorted(
+            utilization_violations.items(), key=lambda item: item[1][0], reverse=True):
+        logger.debug(f"Port {port_name} on {ip_address}: {avg_utilization:.2f}% utilized")
+        candidates[(health_windows.port_entity(ip_address, port_name), 'utilization')] = (
+            f"Port {port_name} on {ip_address}: {avg_utilization:.2f}% utilized ({avg_throughput:.2f} Mbps)",
+            'high' if avg_utilization > 95 else 'medium'
+        )
+    
+    # Missing link_speed warnings
+    for (ip_address, port_name), avg_throughput in missing_link_speed_ports.items():
+        candidates[(health_windows.port_entity(ip_address, port_name), 'link_speed')] = (
+            f"Port {port_name} on {ip_address}: link_speed not configured "
+            f"(measuring {avg_throughput:.2f} Mbps throughput)",
+            'medium'
+        )
+    
+    granted = alert_throttle.acquire(health_windows.PORT, list(candidates))
+    for entity, metric in set(candidates) - granted:
+        logger.debug(f"Port {entity}: {metric} alert throttled")
+    alerts_to_send = [candidates[key] for key in candidates if key in granted]
+    
+    # Bulk create all notifications
+    created = _broadcast_alerts(alerts_to_send)
+    logger.debug(f"Created {created} port utilization notifications")
+    return len(alerts_to_send)
+
+
+def _process_queued_alerts(kind):
+    """Drain one kind's alert queue and apply its events; returns (events, alerts sent)"""
+    processed = sent = 0
+    while True:
+        events = health_windows.drain_alerts(kind)
+        if not events:
+            return processed, sent
+        processed += len(events)
+        # Later events for the same entity and metric carry the newer window
+        events.sort(key=lambda e: e.get('ts', 0))
+        if kind == health_windows.DEVICE:
+            violations = {}
+            for event in events:
+                violations.setdefault(event['entity'], {})[event['metric']] = event['value']
+            sent += _apply_device_alerts(violations)
+        else:
+            utilization, missing_link_speed = {}, {}
+            for event in events:
+                port = health_windows.split_port_entity(event['entity'])
+                if event['metric'] == 'utilization':
+                    utilization[port] = (event['value'], event['throughput'])
+                else:
+                    missing_link_speed[port] = event['throughput']
+            sent += _apply_port_alerts(utilization, missing_link_speed)
+
+
+@shared_task
+def process_health_alerts(kind):
+    """
+    Apply throttling to queued device or port threshold crossings and notify users.
+
+    Dispatched by the ingestion endpoints as soon as a sample pushes a
+    rolling window over a threshold (see health_windows).
+    """
+    try:
+        processed, sent = _process_queued_alerts(kind)
+        return {"success": True, "events": processed, "alerts": sent}
+    except Exception as e:
+        logger.exception(f"Error processing {kind} health alerts")
+        return {"success": False, "message": str(e)}
+
+
 @shared_task
 def check_device_health():
     """
@@ -27,125 +215,48 @@ def check_device_health():
     - Memory: Average > 90% over last 15 seconds (throttled to once per 60 seconds)
     - Disk: Latest reading > 95% (throttled to once per hour)
     
-    Notifications are throttled per device per metric to prevent spam.
+    Thresholds are evaluated at ingest and crossings are queued and processed
+    immediately by process_health_alerts; this periodic run drains anything
+    left in the queue. If Redis is unavailable the windows are computed from
+    the hypertable instead.
     """
     try:
-        # Get distinct device IPs that have recent stats
-        one_hour_ago = timezone.now() - timedelta(hours=1)
-        sixty_seconds_ago = timezone.now() - timedelta(seconds=60)
-        fifteen_seconds_ago = timezone.now() - timedelta(seconds=15)
+        try:
+            processed, _ = _process_queued_alerts(health_windows.DEVICE)
+        except redis.exceptions.RedisError:
+            logger.exception("Health windows unavailable; evaluating device health from the database")
+            since = timezone.now() - timedelta(seconds=health_windows.WINDOW_SECONDS)
+            violations = {}
+            for ip_address, avg_cpu, avg_memory, latest_disk in _recent_device_stats_from_db(since):
+                breaches = health_windows.evaluate_device_window([[avg_cpu, avg_memory, latest_disk]])
+                if breaches:
+                    violations[ip_address] = breaches
+            _apply_device_alerts(violations)
+            processed = len(violations)
         
-        # Query for CPU and memory averages over last 15 seconds using TimescaleDB
-        # Use last(disk, timestamp) to get the most recent disk reading, not MAX
-        query = """
-            SELECT 
-                ip_address,
-                AVG(cpu) as avg_cpu,
-                AVG(memory) as avg_memory,
-                last(disk, timestamp) as latest_disk
-            FROM device_monitoring_devicestats
-            WHERE timestamp >= %s
-            GROUP BY ip_address
-        """
-        
-        with connection.cursor() as cursor:
-            cursor.execute(query, [fifteen_seconds_ago])
-            device_stats = cursor.fetchall()
-        
-        if not device_stats:
-            logger.debug("No device stats found in last 15 seconds")
-            return {"success": True, "message": "Device health check completed - no devices with recent stats"}
-        
-        
-        # Fetch users once for all devices to avoid redundant queries
-        users = User.objects.all()
-        user_count = users.count()
-        if user_count == 0:
-            logger.warning("No users in system to notify!")
-            return {"success": True, "message": "Device health check completed - no users to notify"}
-        
-        for ip_address, avg_cpu, avg_memory, latest_disk in device_stats:
-            logger.debug(f"Device {ip_address}: CPU={avg_cpu:.2f}%, Memory={avg_memory:.2f}%, Disk={latest_disk:.2f}%")
-            
-            alerts_to_send = []
-            now = timezone.now()
-            
-            # Lock and atomically update throttle timestamps to avoid race conditions
-            with transaction.atomic():
-                # Acquire row-level lock to prevent concurrent task runs from creating duplicates
-                alert_record, _ = DeviceHealthAlert.objects.select_for_update().get_or_create(
-                    ip_address=ip_address
-                )
-                
-                # Check CPU threshold - Throttled to once per 60 seconds
-                if avg_cpu > 90:
-                    logger.debug(f"Device {ip_address}: CPU threshold exceeded - {avg_cpu:.2f}%")
-                    if not alert_record.last_cpu_alert or alert_record.last_cpu_alert < sixty_seconds_ago:
-                        alerts_to_send.append({
-                            'type': 'cpu',
-                            'message': f"Device {ip_address}: CPU usage averaged {avg_cpu:.2f}% over last 15 seconds"
-                        })
-                        alert_record.last_cpu_alert = now
-                    else:
-                        logger.debug(f"Device {ip_address}: CPU alert throttled (last sent: {alert_record.last_cpu_alert})")
-                
-                # Check Memory threshold - Throttled to once per 60 seconds
-                if avg_memory > 90:
-                    logger.debug(f"Device {ip_address}: Memory threshold exceeded - {avg_memory:.2f}%")
-                    if not alert_record.last_memory_alert or alert_record.last_memory_alert < sixty_seconds_ago:
-                        alerts_to_send.append({
-                            'type': 'memory',
-                            'message': f"Device {ip_address}: Memory usage averaged {avg_memory:.2f}% over last 15 seconds"
-                        })
-                        alert_record.last_memory_alert = now
-                    else:
-                        logger.debug(f"Device {ip_address}: Memory alert throttled (last sent: {alert_record.last_memory_alert})")
-                
-                # Check Disk threshold - Throttled to once per hour
-                if latest_disk > 95:
-                    logger.debug(f"Device {ip_address}: Disk threshold exceeded - {latest_disk:.2f}%")
-                    if not alert_record.last_disk_alert or alert_record.last_disk_alert < one_hour_ago:
-                        alerts_to_send.append({
-                            'type': 'disk',
-                            'message': f"Device {ip_address}: Disk usage is {latest_disk:.2f}%"
-                        })
-                        alert_record.last_disk_alert = now
-                    else:
-                        logger.debug(f"Device {ip_address}: Disk alert throttled (last sent: {alert_record.last_disk_alert})")
-                
-                # Persist throttle timestamps atomically only if alerts will be sent
-                if alerts_to_send:
-                    logger.debug(f"Device {ip_address}: {len(alerts_to_send)} alert(s) to send")
-                    alert_record.save()
-            
-            # Create notifications outside the transaction to minimize lock duration
-            if alerts_to_send:
-                notifications_to_create = []
-                
-                for user in users:
-                    for alert in alerts_to_send:
-                        notifications_to_create.append(
-                            Notification(
-                                user=user,
-                                message=alert['message'],
-                                urgency='high',
-                                type='DEVICE_RESOURCE',
-                                notifier=None
-                            )
-                        )
-                
-                # Bulk create notifications for efficiency
-                if notifications_to_create:
-                    Notification.objects.bulk_create(notifications_to_create)
-                    logger.debug(f"Created {len(notifications_to_create)} health notifications for device {ip_address}")
-        
-        return {"success": True, "message": "Device health check completed"}
+        return {"success": True, "message": f"Device health check completed ({processed} pending event(s))"}
     
     except Exception as e:
         logger.exception("Error in check_device_health")
         return {"success": False, "message": str(e)}
 
 
+@shared_task
+def sync_alert_throttle_audit():
+    """
+    Copy alert send times from the Redis throttle into DeviceHealthAlert and
+    PortUtilizationAlert, which are kept as an audit record.
+    """
+    results = {}
+    for kind in (health_windows.DEVICE, health_windows.PORT):
+        try:
+            results[kind] = alert_throttle.sync_audit(kind)
+        except Exception as e:
+            logger.exception(f"Error syncing {kind} alert throttle audit")
+            results[kind] = {"error": str(e)}
+    return results
+
+
 @shared_task
 def check_port_utilization():
     """
@@ -156,154 +267,54 @@ def check_port_utilization():
     - Urgency: medium for 85-95%, high for >95%
     - Missing link_speed: Warn users (throttled to once per hour)
     
-    Uses TimescaleDB for efficient time-series aggregation.
+    Like check_device_health, this drains the port alert queue filled at
+    ingest, falling back to the hypertable if Redis is unavailable.
     """
     try:
-        # Calculate time thresholds
-        thirty_seconds_ago = timezone.now() - timedelta(seconds=30)
-        one_hour_ago = timezone.now() - timedelta(hours=1)
-        fifteen_seconds_ago = timezone.now() - timedelta(seconds=15)
-        
-        # Query for ports exceeding 85% utilization over last 15 seconds
-        utilization_query = """
-            SELECT ip_address, port_name, 
-                   AVG(utilization_percent) as avg_utilization,
-                   AVG(throughput_mbps) as avg_throughput
-            FROM device_monitoring_portutilizationstats
-            WHERE timestamp >= %s
-              AND utilization_percent IS NOT NULL
-              AND utilization_percent > 0
-            GROUP BY ip_address, port_name
-            HAVING AVG(utilization_percent) > 85
-            ORDER BY avg_utilization DESC
-        """
-        
-        # Query for ports with missing link_speed (throughput > 0 but utilization = 0)
-        missing_link_speed_query = """
-            SELECT DISTINCT ip_address, port_name, AVG(throughput_mbps) as avg_throughput
-            FROM device_monitoring_portutilizationstats
-            WHERE timestamp >= %s
-              AND utilization_percent = 0
-              AND throughput_mbps > 0
-            GROUP BY ip_address, port_name
-        """
-        
-        with connection.cursor() as cursor:
-            cursor.execute(utilization_query, [fifteen_seconds_ago])
-            utilization_violations = cursor.fetchall()
-            
-            cursor.execute(missing_link_speed_query, [fifteen_seconds_ago])
-            missing_link_speed_ports = cursor.fetchall()
-        
-        if not utilization_violations and not missing_link_speed_ports:
-            return {"success": True, "message": "Port utilization check completed - no issues found"}
-        
-        # Get all users for notifications
-        users = User.objects.all()
-        user_count = users.count()
-        if user_count == 0:
-            logger.warning("No users in system to notify!")
-            return {"success": True, "message": "Port utilization check completed - no users to notify"}
-        
-        now = timezone.now()
-        notifications_to_create = []
-        
-        # Process utilization violations
-        for ip_address, port_name, avg_utilization, avg_throughput in utilization_violations:
-            logger.debug(f"Port {port_name} on {ip_address}: {avg_utilization:.2f}% utilized")
-            
-            with transaction.atomic():
-                # Lock and check throttle for utilization alerts
-                alert_record, _ = PortUtilizationAlert.objects.select_for_update().get_or_create(
-                    ip_address=ip_address,
-                    port_name=port_name
-                )
-                
-                # Check if we can send an alert (30 second throttle)
-                if (not alert_record.last_utilization_alert or 
-                    alert_record.last_utilization_alert < thirty_seconds_ago):
-                    
-                    # Determine urgency based on utilization level
-                    urgency = 'high' if avg_utilization > 95 else 'medium'
-                    
-                    message = (f"Port {port_name} on {ip_address}: "
-                             f"{avg_utilization:.2f}% utilized ({avg_throughput:.2f} Mbps)")
-                    
-                    # Create notifications for all users
-                    for user in users:
-                        notifications_to_create.append(
-                            Notification(
-                                user=user,
-                                message=message,
-                                urgency=urgency,
-                                type='DEVICE_RESOURCE',
-                                notifier=None
-                            )
-                        )
-                    
-                    alert_record.last_utilization_alert = now
-                    alert_record.save()
-                    logger.debug(f"Created utilization alert for port {port_name} on {ip_address}")
-                else:
-                    logger.debug(f"Utilization alert throttled for port {port_name} on {ip_address}")
-        
-        # Process missing link_speed warnings
-            with transaction.atomic():
-                # Lock and check throttle for link_speed alerts (1 hour throttle)
-                alert_record, _ = PortUtilizationAlert.objects.select_for_update().get_or_create(
-                    ip_address=ip_address,
-                    port_name=port_name
-                )
-                
-                # Check if we can send a link_speed warning (1 hour throttle)
-                if (not alert_record.last_null_link_speed_alert or 
-                    alert_record.last_null_link_speed_alert < one_hour_ago):
-                    
-                    message = (f"Port {port_name} on {ip_address}: link_speed not configured "
-                             f"(measuring {avg_throughput:.2f} Mbps throughput)")
-                    
-                    # Create notifications for all users
-                    for user in users:
-                        notifications_to_create.append(
-                            Notification(
-                                user=user,
-                                message=message,
-                                urgency='medium',
-                                type='DEVICE_RESOURCE',
-                                notifier=None
-                            )
-                        )
-                    
-                    alert_record.last_null_link_speed_alert = now
-                    alert_record.save()
-                    logger.debug(f"Created link_speed warning for port {port_name} on {ip_address}")
-                else:
-                    logger.debug(f"Link_speed warning throttled for port {port_name} on {ip_address}")
-        
-        # Bulk create all notifications
-        if notifications_to_create:
-            Notification.objects.bulk_create(notifications_to_create)
-            logger.debug(f"Created {len(notifications_to_create)} port utilization notifications")
+        try:
+            processed, _ = _process_queued_alerts(health_windows.PORT)
+        except redis.exceptions.RedisError:
+            logger.exception("Health windows unavailable; evaluating port utilization from the database")
+            utilization_rows, missing_link_speed_rows = _recent_port_issues_from_db(
+                timezone.now() - timedelta(seconds=health_windows.WINDOW_SECONDS)
+            )
+            _apply_port_alerts(
+                {(ip, port): (avg_util, avg_tp) for ip, port, avg_util, avg_tp in utilization_rows},
+                {(ip, port): avg_tp for ip, port, avg_tp in missing_link_speed_rows},
+            )
+            processed = len(utilization_rows) + len(missing_link_speed_rows)
         
-        return {"success": True, "message": "Port utilization check completed"}
+        return {"success": True, "message": f"Port utilization check completed ({processed} pending event(s))"}
     
     except Exception as e:
         logger.exception("Error in check_port_utilization")
         return {"success": False, "message": str(e)}
 
 
+PING_STATS_COLUMNS = (
+    "timestamp", "device_id", "is_alive", "successful_pings", "min_rtt", "avg_rtt", "max_rtt", "packet_loss",
+)
+
+
+def _write_ping_rows(rows):
+    """Write DevicePingStats rows with one COPY, falling back to bulk_create off PostgreSQL"""
+    if connection.vendor == 'postgresql':
+        return copy_rows(DevicePingStats._meta.db_table, PING_STATS_COLUMNS, rows)
+    DevicePingStats.objects.bulk_create([DevicePingStats(**dict(zip(PING_STATS_COLUMNS, row))) for row in rows])
+    return len(rows)
+
+
 @shared_task
 def ping_all_monitored_devices():
     """
-    Ping all monitored devices using optimized batch processing.
+    Ping all monitored devices in one concurrent sweep.
     
-    Uses fping's multi-host mode to ping multiple devices simultaneously,
-    with fallback to individual pings if batch fails. Processes devices in
-    batches of 10 for optimal performance.
+    Uses icmp_prober to ping every device at once (rate limited), recording
+    loss and RTTs per device.
     
     Runs every minute via Celery Beat.
     
-    Sends 5 pings using fping. Device is considered alive if 3+ pings succeed.
+    Sends 5 pings per device. Device is considered alive if 3+ pings succeed.
     """
     try:
         devices = NetworkDevice.objects.filter(
@@ -312,7 +323,7 @@ def ping_all_monitored_devices():
         )
         
         device_list = list(devices)
-        logger.debug(f"Pinging {len(device_list)} monitored devices using batch mode")
+        logger.debug(f"Pinging {len(device_list)} monitored devices")
         
         if not device_list:
             logger.debug("No devices to ping")
@@ -322,16 +333,14 @@ def ping_all_monitored_devices():
                 'message': 'No devices to ping'
             }
         
-        # Extract IP addresses and create device mapping
-        ip_to_device = {}
-        ip_addresses = []
+        # Extract IP addresses and create device mapping (devices may share an address)
+        ip_to_device_ids = {}
         
         for device in device_list:
             if device.ip_address:
-                ip_to_device[device.ip_address] = device
-                ip_addresses.append(device.ip_address)
+                ip_to_device_ids.setdefault(device.ip_address, []).append(device.id)
         
-        if not ip_addresses:
+        if not ip_to_device_ids:
             logger.warning("No valid IP addresses found")
             return {
                 'success': True,
@@ -339,44 +348,38 @@ def ping_all_monitored_devices():
                 'message': 'No valid IP addresses found'
             }
         
-        # Ping all devices using batch mode with fallback
-        ping_results = ping_devices_with_fallback(ip_addresses, batch_size=10)
+        # Ping all devices concurrently; every row of the sweep shares its start time
+        sweep_time = timezone.now()
+        ping_results = icmp_prober.ping_hosts(list(ip_to_device_ids))
         
-        # Create DevicePingStats records
-        stats_to_create = []
+        rows = []
         successful_pings = 0
         failed_pings = 0
         
-        for ip_address, (is_alive, successful_count) in ping_results.items():
-            if ip_address in ip_to_device:
-                device = ip_to_device[ip_address]
+        for ip_address, result in ping_results.items():
+            for device_id in ip_to_device_ids.get(ip_address, []):
+                rows.append((
+                    sweep_time, device_id, result.is_alive, result.received,
+                    result.min_rtt, result.avg_rtt, result.max_rtt, result.loss_percent
+                ))
                 
-                stats_to_create.append(
-                    DevicePingStats(
-                        device=device,
-                        is_alive=is_alive,
-                        successful_pings=successful_count
-                    )
-                )
-                
-                if is_alive:
+                if result.is_alive:
                     successful_pings += 1
                 else:
                     failed_pings += 1
-                
-                logger.debug(
-                    f"Pinged {ip_address}: "
-                    f"{successful_count}/5 successful, "
-                    f"{'alive' if is_alive else 'down'}"
-                )
-            else:
-                logger.warning(f"No device found for IP {ip_address}")
+            
+            logger.debug(
+                f"Pinged {ip_address}: "
+                f"{result.received}/{result.sent} successful, "
+                f"rtt min/avg/max = {result.min_rtt}/{result.avg_rtt}/{result.max_rtt} ms, "
+                f"{'alive' if result.is_alive else 'down'}"
+            )
         
-        # Bulk create all stats records
-        if stats_to_create:
-            DevicePingStats.objects.bulk_create(stats_to_create)
+        # Write the whole sweep at once
+        if rows:
+            _write_ping_rows(rows)
             logger.debug(
-                f"Created {len(stats_to_create)} ping stats records: "
+                f"Created {len(rows)} ping stats records: "
                 f"{successful_pings} alive, {failed_pings} down"
             )
         
@@ -394,3 +397,30 @@ def ping_all_monitored_devices():
             'message': str(e)
         }
 
+
+@shared_task
+def flush_stats_buffer(kind):
+    """
+    Drain one kind of buffered sample ("device_stats" or "port_utilization") into the database.
+
+    Dispatched by the stats buffer when enough rows are waiting.
+    """
+    return stats_buffer.flush(kind)
+
+
+@shared_task
+def flush_stats_buffers():
+    """
+    Periodic time-based flush of the device and port stats buffers, so samples
+    reach the hypertables within a few seconds even when no size flush fires.
+    """
+    results = {}
+    for kind in stats_buffer.STREAM_KEYS:
+        try:
+            result = stats_buffer.flush(kind)
+            results[kind] = {"created": result["created"], "errors": len(result["errors"]),
+                             "dead_lettered": result["dead_lettered"]}
+        except Exception as e:
+            logger.exception(f"Error flushing {kind} stats buffer")
+            results[kind] = {"error": str(e)}
+    return results
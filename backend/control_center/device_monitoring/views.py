@@ -22,13 +22,21 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from general.models import Device, Bridge, Port
+from general.models import Device, Bridge
 from django.shortcuts import get_object_or_404
 import json
 import os
 from knox.auth import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from .models import DeviceStats, PortUtilizationStats
+from .models import PortUtilizationStats
+from .link_speed_cache import link_speed_cache
+from .stats_aggregates import (
+    DEVICE_PING_TABLE, DEVICE_PING_TIERS, DEVICE_STATS_EXPRESSIONS, DEVICE_UPTIME_EXPRESSIONS, DEVICE_STATS_TABLE, DEVICE_STATS_TIERS, PORT_UTILIZATION_EXPRESSIONS,
+    PORT_UTILIZATION_TABLE, PORT_UTILIZATION_TIERS, SAMPLE_COUNT_EXPRESSIONS, INTERVAL_SECONDS, downsample_interval,
+    select_source, time_conditions
+)
+from . import health_windows, stats_buffer
+import redis
 from .serializers import PortUtilizationStatsSerializer, DeviceStatsSerializer
 from network_device.models import NetworkDevice
 from network_device.serializers import NetworkDeviceSerializer
@@ -52,8 +60,6 @@ from django.db import connection
 from django.utils.dateparse import parse_datetime
 from django.utils import timezone
 import re
-from datetime import datetime, timedelta
-import pytz
 from utils.ansible_utils import run_playbook_with_extravars, create_temp_inv, create_inv_data
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -145,16 +151,23 @@ def post_device_stats(request):
             logger.warning("Received device stats without ip_address")
             return Response({"status": "error", "message": "ip_address is required"}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Persist stats to database
         try:
-            DeviceStats.objects.create(
-                ip_address=ip_address,
-                cpu=data.get('cpu', 0.0),
-                memory=data.get('memory', 0.0),
-                disk=data.get('disk', 0.0)
-            )
-        except Exception:
-            logger.exception("Failed to save device stats to database")
+            row = stats_buffer.device_stats_row(ip_address, data)
+        except ValueError as ve:
+            return Response({"status": "error", "message": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Persist stats to database (buffered; written directly if the buffer is unavailable)
+        if not stats_buffer.buffer_rows(stats_buffer.DEVICE_STATS, [row]):
+            try:
+                stats_buffer.write_rows(stats_buffer.DEVICE_STATS, [row])
+            except Exception:
+                logger.exception("Failed to save device stats to database")
+        
+        # Evaluate the device's rolling window; threshold crossings are queued for alerting
+        try:
+            health_windows.record_device_sample(ip_address, row[2], row[3], row[4])
+        except redis.exceptions.RedisError:
+            logger.exception("Could not record device stats in the health window")
         
         # Get the channel layer and send the data to the 'device_stats' group
         channel_layer = get_channel_layer()
@@ -198,6 +211,9 @@ def post_openflow_metrics(request):
             'ports': {}
         }
 
+        # Link speeds come from the process cache; all ports are buffered as one batch
+        link_speeds = link_speed_cache.get_map()
+        port_stats = []
         for port_name, values in stats.items():
             # Calculate throughput in bytes per second
             if values['duration_diff'] > 0:
@@ -207,42 +223,32 @@ def post_openflow_metrics(request):
                 throughput_mbps = 0
             throughput_data['ports'][port_name] = throughput_mbps
 
-            # Store port utilization stats in database
+            link_speed_mbps = link_speeds.get((device_ip, port_name))
+            if link_speed_mbps and throughput_mbps > 0:
+                utilization_percent = (throughput_mbps / link_speed_mbps) * 100
+            else:
+                # No link_speed configured, set utilization to 0 but store throughput
+                utilization_percent = 0.0
+
+            port_stats.append(stats_buffer.port_utilization_row(
+                device_ip, port_name, throughput_mbps, utilization_percent, values
+            ))
+
+        # Store port utilization stats in database (buffered; written directly if the buffer is unavailable)
+        if not stats_buffer.buffer_rows(stats_buffer.PORT_UTILIZATION, port_stats):
             try:
-                # Query Port model to get link_speed for utilization calculation
-                port_obj = Port.objects.filter(
-                    device__lan_ip_address=device_ip, 
-                    name=port_name
-                ).first()
-                
-                link_speed_mbps = None
-                utilization_percent = None
-                
-                if port_obj and port_obj.link_speed:
-                    link_speed_mbps = port_obj.link_speed
-                    if throughput_mbps > 0 and link_speed_mbps > 0:
-                        utilization_percent = (throughput_mbps / link_speed_mbps) * 100
-                    else:
-                        utilization_percent = 0.0
-                else:
-                    # No link_speed configured, set utilization to 0 but store throughput
-                    utilization_percent = 0.0
-                    # logger.warning(f"No link_speed configured for port {port_name} on device {device_ip}")
-
-                # Create PortUtilizationStats record
-                PortUtilizationStats.objects.create(
-                    ip_address=device_ip,
-                    port_name=port_name,
-                    throughput_mbps=throughput_mbps,
-                    utilization_percent=utilization_percent,
-                    rx_bytes_diff=values['rx_bytes_diff'],
-                    tx_bytes_diff=values['tx_bytes_diff'],
-                    duration_diff=values['duration_diff']
-                )
-                
+                stats_buffer.write_rows(stats_buffer.PORT_UTILIZATION, port_stats)
             except Exception as db_e:
                 # Log database errors but don't fail the request
-                logger.exception(f"Failed to store port utilization stats for {port_name} on {device_ip}: {db_e}")
+                logger.exception(f"Failed to store port utilization stats for {device_ip}: {db_e}")
+
+        # Evaluate the ports' rolling windows; threshold crossings are queued for alerting
+        try:
+            health_windows.record_port_samples(
+                device_ip, [(row[2], row[4], row[3]) for row in port_stats]
+            )
+        except redis.exceptions.RedisError:
+            logger.exception(f"Could not record port metrics for {device_ip} in the health windows")
 
         # Continue with existing WebSocket functionality
         channel_layer = get_channel_layer()
@@ -305,6 +311,9 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
     - start_time (recommended): ISO 8601 format (e.g., "2025-10-15T00:00:00Z")
     - end_time (optional): ISO 8601 format (default: now)
     - limit (optional): Max records to return (default: 10000, max: 50000)
+    - max_points (optional): Downsample to at most this many rows per port, keeping
+      the min and max throughput row of each pixel bucket (max: 5000). limit is
+      not applied; max_points x ports must stay within 50000 rows
     - hours (optional): Shortcut for last N hours (e.g., hours=24)
     - days (optional): Shortcut for last N days (e.g., days=7)
     
@@ -321,6 +330,8 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
     # Safety limit to prevent excessive data returns
     MAX_LIMIT = 50000
     DEFAULT_LIMIT = 10000
+    # Upper bound for the max_points downsampling parameter (points per port)
+    MAX_POINTS = 5000
 
     def list(self, request, *args, **kwargs):
         """
@@ -339,6 +350,38 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
         
         queryset = self.filter_queryset(self.get_queryset())
         
+        max_points = request.query_params.get('max_points')
+        if max_points is not None:
+            try:
+                max_points = int(max_points)
+            except ValueError:
+                max_points = 0
+            if not 2 <= max_points <= self.MAX_POINTS:
+                return Response(
+                    {"error": f"max_points must be an integer between 2 and {self.MAX_POINTS}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # Downsampled output is bounded by max_points per port, so the row limit
+            # (which would cut whole ports off in timestamp order) is not applied
+            queryset, total_count = self._downsample(queryset, max_points)
+            response_data = self.get_serializer(queryset, many=True).data
+            if len(response_data) > self.MAX_LIMIT:
+                return Response(
+                    {
+                        "error": f"max_points={max_points} across all ports exceeds {self.MAX_LIMIT} rows",
+                        "hint": "Filter by port_name or lower max_points"
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response({
+                'data': response_data,
+                'metadata': {
+                    'count': len(response_data),
+                    'total_available': total_count,
+                    'max_points': max_points,
+                }
+            })
+        
         # Get count before limiting
         total_count = queryset.count()
         
@@ -367,6 +410,68 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
             'metadata': metadata
         })
 
+    def _downsample(self, queryset, max_points):
+        """
+        Keep at most max_points raw rows per port (min/max per pixel bucket).
+
+        The filtered time span of each port is split into max_points / 2 equal
+        buckets and only the rows with the lowest and highest throughput in
+        each bucket are kept, so spikes and dips survive at any window length.
+        Selection runs in the database; only the kept rows are loaded.
+
+        Returns:
+            Tuple of (queryset of the kept rows, number of rows in the filtered
+            window), counted in the same scan
+        """
+        filtered_sql, filtered_params = queryset.order_by().values(
+            'id', 'timestamp', 'ip_address', 'port_name', 'throughput_mbps'
+        ).query.sql_with_params()
+        query = f"""
+            WITH filtered AS ({filtered_sql}),
+            bucketed AS (
+                SELECT
+                    id,
+                    timestamp,
+                    ip_address,
+                    port_name,
+                    throughput_mbps,
+                    width_bucket(
+                        EXTRACT(EPOCH FROM timestamp),
+                        EXTRACT(EPOCH FROM MIN(timestamp) OVER series),
+                        EXTRACT(EPOCH FROM MAX(timestamp) OVER series) + 0.001,
+                        %s
+                    ) AS pixel,
+                    COUNT(*) OVER () AS total_count
+                FROM filtered
+                WINDOW series AS (PARTITION BY ip_address, port_name)
+            ),
+            ranked AS (
+                SELECT
+                    id,
+                    timestamp,
+                    total_count,
+                    ROW_NUMBER() OVER (PARTITION BY ip_address, port_name, pixel
+                                       ORDER BY throughput_mbps DESC, timestamp) AS max_rank,
+                    ROW_NUMBER() OVER (PARTITION BY ip_address, port_name, pixel
+                                       ORDER BY throughput_mbps ASC, timestamp) AS min_rank
+                FROM bucketed
+            )
+            SELECT id, timestamp, total_count FROM ranked WHERE max_rank = 1 OR min_rank = 1
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(query, [*filtered_params, max(max_points // 2, 1)])
+            kept = cursor.fetchall()
+
+        if not kept:
+            return queryset.none(), 0
+        # The time bounds let TimescaleDB skip chunks outside the kept rows
+        timestamps = [row[1] for row in kept]
+        return PortUtilizationStats.objects.filter(
+            id__in=[row[0] for row in kept],
+            timestamp__gte=min(timestamps),
+            timestamp__lte=max(timestamps),
+        ).order_by('timestamp'), kept[0][2]
+
     def _get_limit(self):
         """Get and validate the limit parameter."""
         limit_param = self.request.query_params.get('limit')
@@ -525,15 +630,10 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
             )
         
         # Build query - get all devices with data
-        where_conditions = []
-        params = []
-        
+        start_dt = end_dt = None
         if start_time:
             try:
                 start_dt = parse_datetime(start_time)
-                if start_dt:
-                    where_conditions.append("timestamp >= %s")
-                    params.append(start_dt)
             except ValueError:
                 return Response(
                     {"error": "Invalid start_time format"}, 
@@ -543,30 +643,32 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
         if end_time:
             try:
                 end_dt = parse_datetime(end_time)
-                if end_dt:
-                    where_conditions.append("timestamp <= %s")
-                    params.append(end_dt)
             except ValueError:
                 return Response(
                     {"error": "Invalid end_time format"}, 
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
+        # Read the continuous aggregate matching the interval instead of the raw 1-second rows
+        relation, time_column, width = select_source(
+            PORT_UTILIZATION_TIERS, PORT_UTILIZATION_TABLE, interval
+        )
+        source = 'aggregate' if width else 'raw'
+        where_conditions, params = time_conditions(time_column, width, start_dt, end_dt)
         where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
         
         query = f"""
-            SELECT 
-                ip_address,
-                port_name,
-                AVG(utilization_percent) as avg_utilization,
-                MAX(utilization_percent) as max_utilization,
-                AVG(throughput_mbps) as avg_throughput,
-                MAX(throughput_mbps) as max_throughput,
-                COUNT(*) as data_point_count
-            FROM device_monitoring_portutilizationstats
-            WHERE {where_clause}
-            GROUP BY ip_address, port_name
-            HAVING AVG(utilization_percent) >= %s OR AVG(throughput_mbps) > 0
+            SELECT * FROM (
+                SELECT 
+                    ip_address,
+                    port_name,
+                    {PORT_UTILIZATION_EXPRESSIONS[source]},
+                    {SAMPLE_COUNT_EXPRESSIONS[source]} as data_point_count
+                FROM {relation}
+                WHERE {where_clause}
+                GROUP BY ip_address, port_name
+            ) ports
+            WHERE avg_utilization >= %s OR avg_throughput > 0
             ORDER BY ip_address, port_name
         """
         
@@ -584,10 +686,10 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
                 ip_address = row[0]
                 port_name = row[1]
                 avg_util = float(row[2]) if row[2] is not None else 0
-                max_util = float(row[3]) if row[3] is not None else 0
-                avg_throughput = float(row[4]) if row[4] is not None else 0
-                max_throughput = float(row[5]) if row[5] is not None else 0
-                data_points = int(row[6]) if row[6] is not None else 0
+                max_util = float(row[4]) if row[4] is not None else 0
+                avg_throughput = float(row[5]) if row[5] is not None else 0
+                max_throughput = float(row[7]) if row[7] is not None else 0
+                data_points = int(row[8]) if row[8] is not None else 0
                 
                 # Initialize device if not exists
                 if ip_address not in devices:
@@ -697,9 +799,15 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
           Use 'none' or 'raw' to get unbucketed raw data points
         - hours (optional): Shortcut for last N hours
         - days (optional): Shortcut for last N days
+        - max_points (optional): Cap on points per port. The bucket interval is
+          widened so the window fits in max_points buckets; each bucket keeps its
+          average, minimum and maximum, so spikes and dips stay visible at any
+          window length.
+          Requires start_time, hours or days.
         
         Examples:
         - All devices, catch spikes: ?hours=1&interval=10 seconds
+        - One week at chart resolution: ?ip_address=10.10.10.5&days=7&max_points=500
         - All devices, raw data: ?hours=0.1&interval=raw
         - Single device, 5min buckets: ?ip_address=10.10.10.5&hours=24&interval=5 minutes
         - Network-wide, 1min buckets: ?hours=6&interval=1 minute
@@ -750,29 +858,27 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        # Build SQL query for TimescaleDB aggregation with parameter binding
-        where_conditions = []
-        params = []
-        
-        # Add interval parameter only if bucketing is enabled
-        if not use_raw_data:
-            params = [interval]  # First parameter is the interval
-        
-        # ip_address is now optional - allows network-wide queries
-        if ip_address:
-            where_conditions.append("ip_address = %s")
-            params.append(ip_address)
-        
-        if port_name:
-            where_conditions.append("port_name = %s")
-            params.append(port_name)
+        max_points = request.query_params.get('max_points')
+        if max_points is not None:
+            try:
+                max_points = int(max_points)
+            except ValueError:
+                max_points = 0
+            if not 2 <= max_points <= self.MAX_POINTS:
+                return Response(
+                    {"error": f"max_points must be an integer between 2 and {self.MAX_POINTS}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if not start_time:
+                return Response(
+                    {"error": "max_points requires start_time, hours or days"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
+        start_dt = end_dt = None
         if start_time:
             try:
                 start_dt = parse_datetime(start_time)
-                if start_dt:
-                    where_conditions.append("timestamp >= %s")
-                    params.append(start_dt)
             except ValueError:
                 return Response(
                     {"error": "Invalid start_time format"}, 
@@ -782,15 +888,55 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
         if end_time:
             try:
                 end_dt = parse_datetime(end_time)
-                if end_dt:
-                    where_conditions.append("timestamp <= %s")
-                    params.append(end_dt)
             except ValueError:
                 return Response(
                     {"error": "Invalid end_time format"}, 
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
+        bucket_interval = None if use_raw_data else interval
+        bucket_seconds = None
+        if max_points and start_dt:
+            # Pixel buckets: at most max_points per series, each keeping its
+            # average, minimum and maximum so spikes and dips survive any window length
+            range_seconds = ((end_dt or timezone.now()) - start_dt).total_seconds()
+            min_seconds = 1 if use_raw_data else INTERVAL_SECONDS[interval]
+            bucket_seconds = downsample_interval(range_seconds, max_points, min_seconds)
+            if use_raw_data and range_seconds <= max_points:
+                bucket_seconds = None  # Already fits; keep the raw points
+            if bucket_seconds:
+                use_raw_data = False
+                bucket_interval = f"{bucket_seconds} seconds"
+        
+        # Bucketed queries read the continuous aggregate matching the interval
+        if use_raw_data:
+            relation, time_column, width = PORT_UTILIZATION_TABLE, 'timestamp', None
+        else:
+            relation, time_column, width = select_source(
+                PORT_UTILIZATION_TIERS, PORT_UTILIZATION_TABLE, bucket_seconds or interval
+            )
+        
+        # Build SQL query for TimescaleDB aggregation with parameter binding
+        where_conditions = []
+        params = []
+        
+        # Add interval parameter only if bucketing is enabled
+        if not use_raw_data:
+            params = [bucket_interval]  # First parameter is the interval
+        
+        # ip_address is now optional - allows network-wide queries
+        if ip_address:
+            where_conditions.append("ip_address = %s")
+            params.append(ip_address)
+        
+        if port_name:
+            where_conditions.append("port_name = %s")
+            params.append(port_name)
+        
+        time_where, time_params = time_conditions(time_column, width, start_dt, end_dt)
+        where_conditions.extend(time_where)
+        params.extend(time_params)
+        
         # Construct the TimescaleDB query
         where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
         
@@ -802,8 +948,10 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
                     ip_address,
                     port_name,
                     utilization_percent as avg_utilization,
+                    utilization_percent as min_utilization,
                     utilization_percent as max_utilization,
                     throughput_mbps as avg_throughput,
+                    throughput_mbps as min_throughput,
                     throughput_mbps as max_throughput
                 FROM device_monitoring_portutilizationstats
                 WHERE {where_clause}
@@ -811,22 +959,20 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
             """
         else:
             # Time-bucketed aggregated data
+            source = 'aggregate' if width else 'raw'
             query = f"""
                 SELECT 
-                    time_bucket(%s::interval, timestamp) AS bucket_time,
+                    time_bucket(%s::interval, {time_column}) AS bucket_time,
                     ip_address,
                     port_name,
-                    AVG(utilization_percent) as avg_utilization,
-                    MAX(utilization_percent) as max_utilization,
-                    AVG(throughput_mbps) as avg_throughput,
-                    MAX(throughput_mbps) as max_throughput
-                FROM device_monitoring_portutilizationstats
+                    {PORT_UTILIZATION_EXPRESSIONS[source]}
+                FROM {relation}
                 WHERE {where_clause}
                 GROUP BY bucket_time, ip_address, port_name
                 ORDER BY bucket_time ASC, ip_address, port_name
             """
 
-        logger.debug(f"Query type: {'raw' if use_raw_data else 'bucketed'}")
+        logger.debug(f"Query type: {'raw' if use_raw_data else 'bucketed'}, source: {relation}")
         logger.debug(f"Params: {params}")
         
         try:
@@ -842,16 +988,19 @@ class PortUtilizationStatsViewSet(viewsets.ReadOnlyModelViewSet):
                     'ip_address': row[1], 
                     'port_name': row[2],
                     'avg_utilization': float(row[3]) if row[3] is not None else None,
-                    'max_utilization': float(row[4]) if row[4] is not None else None,
-                    'avg_throughput': float(row[5]) if row[5] is not None else None,
-                    'max_throughput': float(row[6]) if row[6] is not None else None,
+                    'min_utilization': float(row[4]) if row[4] is not None else None,
+                    'max_utilization': float(row[5]) if row[5] is not None else None,
+                    'avg_throughput': float(row[6]) if row[6] is not None else None,
+                    'min_throughput': float(row[7]) if row[7] is not None else None,
+                    'max_throughput': float(row[8]) if row[8] is not None else None,
                 })
             
             return Response({
                 'aggregated_data': results,
-                'interval': 'raw (unbucketed)' if use_raw_data else interval,
+                'interval': 'raw (unbucketed)' if use_raw_data else bucket_interval,
                 'count': len(results),
-                'bucketed': not use_raw_data
+                'bucketed': not use_raw_data,
+                'max_points': max_points
             })
             
         except Exception as e:
@@ -910,41 +1059,34 @@ class DeviceStatsViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        where_conditions = ["ip_address = %s"]
-        params = [ip_address]
-
+        start_dt = end_dt = None
         if start_time:
             try:
                 start_dt = parse_datetime(start_time)
-                if start_dt:
-                    where_conditions.append("timestamp >= %s")
-                    params.append(start_dt)
             except ValueError:
                 return Response({"error": "Invalid start_time format"}, status=status.HTTP_400_BAD_REQUEST)
 
         if end_time:
             try:
                 end_dt = parse_datetime(end_time)
-                if end_dt:
-                    where_conditions.append("timestamp <= %s")
-                    params.append(end_dt)
             except ValueError:
                 return Response({"error": "Invalid end_time format"}, status=status.HTTP_400_BAD_REQUEST)
 
         if not start_time and not end_time and not hours and not days:
             # Default to last 24 hours when no range provided
-            where_conditions.append("timestamp >= %s")
-            params.append(timezone.now() - timezone.timedelta(days=1))
+            start_dt = timezone.now() - timezone.timedelta(days=1)
 
-        where_clause = " AND ".join(where_conditions)
+        # Read the continuous aggregate matching the interval instead of the raw 1-second rows
+        relation, time_column, width = select_source(DEVICE_STATS_TIERS, DEVICE_STATS_TABLE, interval)
+        time_where, time_params = time_conditions(time_column, width, start_dt, end_dt)
+        where_clause = " AND ".join(["ip_address = %s", *time_where])
+        params = [ip_address, *time_params]
 
         query = f"""
             SELECT 
-                time_bucket(%s::interval, timestamp) AS bucket_time,
-                AVG(cpu) AS cpu_avg, MAX(cpu) AS cpu_max,
-                AVG(memory) AS memory_avg, MAX(memory) AS memory_max,
-                AVG(disk) AS disk_avg, MAX(disk) AS disk_max
-            FROM device_monitoring_devicestats
+                time_bucket(%s::interval, {time_column}) AS bucket_time,
+                {DEVICE_STATS_EXPRESSIONS['aggregate' if width else 'raw']}
+            FROM {relation}
             WHERE {where_clause}
             GROUP BY bucket_time
             ORDER BY bucket_time ASC
@@ -1086,29 +1228,33 @@ class DeviceUptimeViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
-        # Build optimized TimescaleDB query with advanced features
-        sql = """
+        # Read the ping aggregate matching the bucket interval; the database
+        # fills empty buckets, so the series is returned as is
+        relation, time_column, width = select_source(
+            DEVICE_PING_TIERS, DEVICE_PING_TABLE, INTERVAL_SECONDS[bucket_interval]
+        )
+        expressions = DEVICE_UPTIME_EXPRESSIONS['aggregate' if width else 'raw']
+        # Series starts at the first bucket boundary inside the period and ends with the current bucket
+        first_bucket = "time_bucket(%s::interval, now() - %s::interval - INTERVAL '1 microsecond') + %s::interval"
+        first_bucket_params = [bucket_interval, period, bucket_interval]
+        sql = f"""
             SELECT
-                time_bucket(%s::interval, timestamp) AS bucket,
-                AVG(CASE WHEN is_alive THEN 1.0 ELSE 0 END) * 100 AS uptime_percentage,
-                COUNT(*) AS total_pings,
-                MIN(CASE WHEN is_alive THEN timestamp END) AS first_alive,
-                MAX(CASE WHEN is_alive THEN timestamp END) AS last_alive,
-                COUNT(CASE WHEN is_alive THEN 1 END) AS alive_count
-            FROM device_monitoring_devicepingstats
-            WHERE device_id = %s 
-              AND timestamp >= now() - interval %s
-            GROUP BY bucket
-            ORDER BY bucket;
+                time_bucket_gapfill(%s::interval, {time_column}, {first_bucket}, now()) AS bucket,
+                {expressions}
+            FROM {relation}
+            WHERE device_id = %s
+              AND {time_column} >= {first_bucket}
+              AND {time_column} <= now()
+            GROUP BY 1
+            ORDER BY 1;
         """
-        params = [bucket_interval, device_id, period]
+        params = [bucket_interval, *first_bucket_params, device_id, *first_bucket_params]
         
         results = self._execute_query(sql, params)
         if isinstance(results, Response):
             return results
         
-        # Fill missing buckets
-        return self._fill_time_buckets(results, period_minutes, bucket_interval)
+        return Response(results, status=status.HTTP_200_OK)
     
     def _get_ping_aggregates(self, request):
         """Consolidated ping aggregates logic with fallback to direct queries."""
@@ -1140,20 +1286,28 @@ class DeviceUptimeViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Use direct TimescaleDB query instead of materialized views
+        # Read the ping aggregate matching the bucket interval, gap-filled per device
         bucket_interval = aggregation_intervals[aggregation_param]
+        relation, time_column, width = select_source(
+            DEVICE_PING_TIERS, DEVICE_PING_TABLE, parse_period_to_minutes(bucket_interval) * 60
+        )
+        expressions = DEVICE_UPTIME_EXPRESSIONS['aggregate' if width else 'raw']
+        if width:
+            # Include the aggregate bucket containing the range start
+            range_condition = f"{time_column} >= time_bucket('{width}', now() - %s::interval)"
+        else:
+            range_condition = f"{time_column} >= now() - %s::interval"
         
-        # Build direct query using time_bucket
-        sql = """
+        sql = f"""
             SELECT 
-                time_bucket(%s::interval, timestamp) AS bucket,
+                time_bucket_gapfill(%s::interval, {time_column}, now() - %s::interval, now()) AS bucket,
                 device_id,
-                AVG(CASE WHEN is_alive THEN 1.0 ELSE 0 END) * 100 AS uptime_percentage,
-                COUNT(*) AS total_pings
-            FROM device_monitoring_devicepingstats
-            WHERE timestamp >= now() - interval %s
+                {expressions}
+            FROM {relation}
+            WHERE {range_condition}
+              AND {time_column} <= now()
         """
-        params = [bucket_interval, time_range]
+        params = [bucket_interval, time_range, time_range]
         
         if device_ids:
             placeholders = ','.join(['%s'] * len(device_ids))
@@ -1161,7 +1315,7 @@ class DeviceUptimeViewSet(viewsets.ViewSet):
             params.extend(device_ids)
         
         sql += """
-            GROUP BY bucket, device_id
+            GROUP BY 1, device_id
             ORDER BY bucket DESC, device_id;
         """
         
@@ -1186,33 +1340,67 @@ class DeviceUptimeViewSet(viewsets.ViewSet):
             )
     
     def _build_uptime_query(self, period, device_ids, min_pings):
-        """Build optimized TimescaleDB query for uptime status."""
-        # Use TimescaleDB's time_bucket for efficient aggregation
-        # Leverage compression and chunk exclusion for fast lookups
-        sql = """
-            SELECT
-                device_id,
-                AVG(CASE WHEN is_alive THEN 1.0 ELSE 0 END) * 100 AS uptime_percentage,
-                COUNT(*) AS total_pings,
-                MIN(timestamp) AS first_ping,
-                MAX(timestamp) AS last_ping
-            FROM device_monitoring_devicepingstats
-            WHERE timestamp >= now() - interval %s
         """
-        params = [period]
-        
+        Build the uptime status query for the window [now - period, now].
+
+        Reads the ping continuous aggregate matching the period: whole
+        buckets inside the window come from the aggregate, and only the pings
+        in the part of the first bucket that falls inside the window are read
+        from the raw hypertable.
+        """
+        relation, _, width = select_source(DEVICE_PING_TIERS, DEVICE_PING_TABLE, parse_period_to_minutes(period) * 60)
+        device_filter, device_params = "", []
         if device_ids:
-            placeholders = ','.join(['%s'] * len(device_ids))
-            sql += f" AND device_id IN ({placeholders})"
-            params.extend(device_ids)
+            device_filter = f" AND device_id IN ({','.join(['%s'] * len(device_ids))})"
+            device_params = list(device_ids)
+        
+        if width is None:
+            sql = f"""
+                SELECT
+                    device_id,
+                    COUNT(*) FILTER (WHERE is_alive) * 100.0 / COUNT(*) AS uptime_percentage,
+                    COUNT(*) AS total_pings,
+                    MIN(timestamp) AS first_ping,
+                    MAX(timestamp) AS last_ping,
+                    AVG(avg_rtt) AS avg_rtt,
+                    AVG(packet_loss) AS packet_loss
+                FROM {DEVICE_PING_TABLE}
+                WHERE timestamp >= now() - %s::interval{device_filter}
+                GROUP BY device_id
+                HAVING COUNT(*) >= %s
+                ORDER BY device_id;
+            """
+            return sql, [period, *device_params, min_pings]
         
-        sql += """
+        # First bucket boundary at or after the window start
+        first_bucket = f"time_bucket('{width}', now() - %s::interval - INTERVAL '1 microsecond') + INTERVAL '{width}'"
+        sql = f"""
+            SELECT
+                device_id,
+                SUM(alive_count) * 100.0 / NULLIF(SUM(ping_count), 0) AS uptime_percentage,
+                SUM(ping_count)::bigint AS total_pings,
+                MIN(first_ping) AS first_ping,
+                MAX(last_ping) AS last_ping,
+                SUM(rtt_sum) / NULLIF(SUM(rtt_count), 0) AS avg_rtt,
+                SUM(packet_loss_sum) / NULLIF(SUM(packet_loss_count), 0) AS packet_loss
+            FROM (
+                SELECT device_id, alive_count, ping_count, first_ping, last_ping,
+                       rtt_sum, rtt_count, packet_loss_sum, packet_loss_count
+                FROM {relation}
+                WHERE bucket >= {first_bucket}{device_filter}
+                UNION ALL
+                SELECT device_id, COUNT(*) FILTER (WHERE is_alive), COUNT(*), MIN(timestamp), MAX(timestamp),
+                       SUM(avg_rtt), COUNT(avg_rtt), SUM(packet_loss), COUNT(packet_loss)
+                FROM {DEVICE_PING_TABLE}
+                WHERE timestamp >= now() - %s::interval
+                  AND timestamp < {first_bucket}{device_filter}
+                GROUP BY device_id
+            ) AS parts
             GROUP BY device_id
-            HAVING COUNT(*) >= %s
+            HAVING SUM(ping_count) >= %s
             ORDER BY device_id;
         """
-        params.append(min_pings)
-        
+        params = [period, *device_params, period, period, *device_params, min_pings]
         return sql, params
     
 # _build_aggregates_query method removed - using direct TimescaleDB queries instead
@@ -1249,7 +1437,9 @@ class DeviceUptimeViewSet(viewsets.ViewSet):
             results.append({
                 'device_id': device_id,
                 'uptime_percentage': 0.0,
-                'total_pings': 0
+                'total_pings': 0,
+                'avg_rtt': None,
+                'packet_loss': None
             })
         
         # Adjust for incomplete data
@@ -1270,57 +1460,6 @@ class DeviceUptimeViewSet(viewsets.ViewSet):
         
         return Response(results, status=status.HTTP_200_OK)
 
-    def _fill_time_buckets(self, results, period_minutes, bucket_interval):
-        """Fill missing time buckets with 0% uptime."""
-        now = datetime.utcnow().replace(second=0, microsecond=0, tzinfo=pytz.UTC)
-        start_time = now - timedelta(minutes=period_minutes)
-        
-        bucket_minutes = parse_period_to_minutes(bucket_interval)
-        bucket_delta = timedelta(minutes=bucket_minutes)
-        
-        # Generate expected buckets
-        expected_buckets = []
-        t = start_time.replace(second=0, microsecond=0)
-        minutes_to_add = (bucket_minutes - t.minute % bucket_minutes) if t.minute % bucket_minutes != 0 else 0
-        t = t + timedelta(minutes=minutes_to_add)
-        
-        while t <= now:
-            expected_buckets.append(t)
-            t += bucket_delta
-        
-        # Build result lookup
-        result_by_bucket = {}
-        for r in results:
-            bucket_dt = r['bucket']
-            if isinstance(bucket_dt, str):
-                bucket_dt = datetime.fromisoformat(bucket_dt.replace('Z', '+00:00'))
-            result_by_bucket[bucket_dt] = r
-        
-        # Fill missing buckets
-        filled_results = []
-        for bucket_time in expected_buckets:
-            r = result_by_bucket.get(bucket_time)
-            
-            if r:
-                bucket_val = r['bucket']
-                if isinstance(bucket_val, datetime):
-                    bucket_val = bucket_val.isoformat().replace('+00:00', 'Z')
-                elif isinstance(bucket_val, str) and bucket_val.endswith('+00:00'):
-                    bucket_val = bucket_val.replace('+00:00', 'Z')
-                
-                r = dict(r)
-                r['bucket'] = bucket_val
-                filled_results.append(r)
-            else:
-                filled_results.append({
-                    'bucket': bucket_time.isoformat().replace('+00:00', 'Z'),
-                    'uptime_percentage': 0.0,
-                    'total_pings': 0
-                })
-        
-        filled_results.sort(key=lambda r: r['bucket'])
-        return Response(filled_results, status=status.HTTP_200_OK)
-
     def _enrich_with_device_info(self, results):
         """Enrich results with device information."""
         device_ids_in_results = [r['device_id'] for r in results]
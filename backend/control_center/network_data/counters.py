@@ -0,0 +1,266 @@
+# network_data/counters.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Per-interval deltas for cumulative OpenFlow counters.
+
+The flow monitor reports cumulative packet/byte counters for every flow on
+each poll. At ingest the last FLOW_COUNTER_HISTORY snapshots of each flow,
+keyed by (cookie, mac, port, protocol), are kept in Redis with the deltas
+they were given, and every new snapshot is stored with the change since the
+previous one, so usage over a window is a plain SUM.
+
+Delta rules for a snapshot:
+- previous snapshot exists and counters/duration did not go backwards:
+  current - previous
+- counters or duration went backwards (flow re-installed, switch restart):
+  the counters restarted from zero, so the delta is the current value
+- no previous snapshot (new flow or expired state): the current value if the
+  flow is younger than FLOW_COUNTER_NEW_FLOW_SECONDS, otherwise unknown (NULL)
+- a snapshot still in the flow's history replayed (a retried or bisected
+  write): the deltas it was given the first time
+- any other snapshot not newer than the latest one (out of order, or a replay
+  older than the history): NULL, and the stored state is left alone
+
+The computation runs in a Lua script so concurrent ingestion workers see a
+consistent previous snapshot. If Redis is unavailable an in-process state is
+used instead.
+"""
+
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import redis
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY_PREFIX = "flowstat:counters"
+STATE_TTL_MS = int(getattr(settings, 'FLOW_COUNTER_STATE_TTL', 3600) * 1000)
+NEW_FLOW_SECONDS = getattr(settings, 'FLOW_COUNTER_NEW_FLOW_SECONDS', 30.0)
+# Snapshots kept per flow so replayed snapshots get their original deltas
+HISTORY_LENGTH = getattr(settings, 'FLOW_COUNTER_HISTORY', 16)
+# Snapshots per script call (each one is a key plus four arguments)
+SCRIPT_CHUNK_SIZE = 1000
+# Flows tracked by the in-process fallback state
+LOCAL_STATE_MAX_FLOWS = 100000
+
+# Column positions in a FLOWSTAT_COLUMNS row (see network_data.ingestion)
+_TIMESTAMP, _CLASSIFICATION, _DURATION, _PACKETS, _BYTES = 0, 1, 3, 4, 5
+_MAC, _PROTOCOL, _PORT = 7, 8, 9
+
+# Returned by the script when a delta is unknown
+_UNKNOWN = -1
+
+# State per flow: "ts packets bytes duration d_packets d_bytes" per snapshot, newest first
+_DELTA_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+local new_flow_seconds = tonumber(ARGV[2])
+local history_fields = tonumber(ARGV[3]) * 6
+local out = {}
+for i, key in ipairs(KEYS) do
+    local base = 3 + (i - 1) * 4
+    local ts = tonumber(ARGV[base + 1])
+    local packets = tonumber(ARGV[base + 2])
+    local bytes = tonumber(ARGV[base + 3])
+    local duration = tonumber(ARGV[base + 4])
+    local d_packets, d_bytes = -1, -1
+    local store = true
+
+    local prev = redis.call('GET', key)
+    local raw, p = {}, {}
+    if prev then
+        for field in string.gmatch(prev, '%S+') do
+            raw[#raw + 1] = field
+            p[#p + 1] = tonumber(field)
+        end
+    end
+    if #p >= 6 then
+        if ts <= p[1] then
+            -- Replayed or out of order: reuse the deltas of a matching snapshot, if kept
+            store = false
+            for j = 0, #p / 6 - 1 do
+                local o = j * 6
+                if ts == p[o + 1] and packets == p[o + 2] and bytes == p[o + 3] then
+                    d_packets, d_bytes = p[o + 5], p[o + 6]
+                    break
+                end
+            end
+        elseif packets < p[2] or bytes < p[3] or duration < p[4] then
+            d_packets, d_bytes = packets, bytes
+        else
+            d_packets, d_bytes = packets - p[2], bytes - p[3]
+        end
+    elseif duration <= new_flow_seconds then
+        d_packets, d_bytes = packets, bytes
+    end
+
+    if store then
+        local state = {ARGV[base + 1], ARGV[base + 2], ARGV[base + 3], ARGV[base + 4],
+            string.format('%d', d_packets), string.format('%d', d_bytes)}
+        for k = 1, math.min(#raw, history_fields - 6) do
+            state[#state + 1] = raw[k]
+        end
+        redis.call('SET', key, table.concat(state, ' '), 'PX', ttl)
+    end
+    out[2 * i - 1] = d_packets
+    out[2 * i] = d_bytes
+end
+return out
+"""
+
+_redis_client: Optional[redis.Redis] = None
+_delta_script = None
+_local_state: "OrderedDict[str, List[Tuple]]" = OrderedDict()
+
+
+def get_redis() -> redis.Redis:
+    """Shared Redis connection for the counter state"""
+    global _redis_client, _delta_script
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=getattr(settings, 'CHANNEL_REDIS_HOST', 'redis'),
+            port=getattr(settings, 'CHANNEL_REDIS_PORT', 6379),
+            decode_responses=True,
+            socket_connect_timeout=1.0,
+            socket_timeout=2.0,
+            client_name="flow-counters"
+        )
+        _delta_script = _redis_client.register_script(_DELTA_SCRIPT)
+    return _redis_client
+
+
+def _timestamp_ms(value) -> int:
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if not isinstance(value, datetime):
+        raise ValueError(f"Invalid timestamp: {value}")
+    return int(value.timestamp() * 1000)
+
+
+def _flow_key(row: Tuple) -> str:
+    return f"{STATE_KEY_PREFIX}:{row[_CLASSIFICATION]}|{row[_MAC] or ''}|{row[_PORT] or 0}|{row[_PROTOCOL] or ''}"
+
+
+def compute_delta(history: Optional[List[Tuple]], sample: Tuple[int, int, int, float]) -> Tuple[Optional[int], Optional[int], bool]:
+    """
+    Apply the delta rules to one (ts_ms, packets, bytes, duration) snapshot
+
+    Mirrors the Lua script and backs the in-process fallback. The stored
+    history holds the flow's latest snapshots, newest first, each followed by
+    its own deltas, so replaying one of them (a retried write) yields the same
+    deltas again.
+
+    Returns:
+        Tuple of (packet_delta, byte_delta, store) where store says whether the
+        snapshot should be added to the history
+    """
+    ts, packets, byte_count, duration = sample
+    if not history:
+        if duration <= NEW_FLOW_SECONDS:
+            return packets, byte_count, True
+        return None, None, True
+
+    p_ts, p_packets, p_bytes, p_duration, _, _ = history[0]
+    if ts <= p_ts:
+        for h_ts, h_packets, h_bytes, _, h_d_packets, h_d_bytes in history:
+            if (ts, packets, byte_count) == (h_ts, h_packets, h_bytes):
+                return h_d_packets, h_d_bytes, False
+        return None, None, False
+    if packets < p_packets or byte_count < p_bytes or duration < p_duration:
+        return packets, byte_count, True
+    return packets - p_packets, byte_count - p_bytes, True
+
+
+def _redis_deltas(keys: List[str], samples: List[Tuple[int, int, int, float]]) -> List[Tuple[Optional[int], Optional[int]]]:
+    get_redis()
+    deltas = []
+    for start in range(0, len(keys), SCRIPT_CHUNK_SIZE):
+        chunk_keys = keys[start:start + SCRIPT_CHUNK_SIZE]
+        args = [STATE_TTL_MS, NEW_FLOW_SECONDS, HISTORY_LENGTH]
+        for ts, packets, byte_count, duration in samples[start:start + SCRIPT_CHUNK_SIZE]:
+            args.extend((ts, packets, byte_count, repr(float(duration))))
+        result = _delta_script(keys=chunk_keys, args=args)
+        for i in range(0, len(result), 2):
+            d_packets, d_bytes = result[i], result[i + 1]
+            deltas.append((
+                None if d_packets == _UNKNOWN else d_packets,
+                None if d_bytes == _UNKNOWN else d_bytes,
+            ))
+    return deltas
+
+
+def _local_deltas(keys: List[str], samples: List[Tuple[int, int, int, float]]) -> List[Tuple[Optional[int], Optional[int]]]:
+    deltas = []
+    for key, sample in zip(keys, samples):
+        history = _local_state.get(key)
+        d_packets, d_bytes, store = compute_delta(history, sample)
+        if store:
+            _local_state[key] = [sample + (d_packets, d_bytes)] + (history or [])[:HISTORY_LENGTH - 1]
+            _local_state.move_to_end(key)
+            while len(_local_state) > LOCAL_STATE_MAX_FLOWS:
+                _local_state.popitem(last=False)
+        deltas.append((d_packets, d_bytes))
+    return deltas
+
+
+def attach_deltas(rows: List[Tuple]) -> List[Tuple]:
+    """
+    Append (packet_delta, byte_delta) to validated FLOWSTAT_COLUMNS rows
+
+    Rows are processed oldest first so several snapshots of one flow in the
+    same batch chain correctly; the returned rows are in that order.
+
+    Args:
+        rows: Row tuples from the flow stat row builders
+
+    Returns:
+        List of row tuples with the two delta columns appended
+    """
+    if not rows:
+        return []
+
+    samples = []
+    for row in rows:
+        try:
+            ts = _timestamp_ms(row[_TIMESTAMP])
+        except (TypeError, ValueError):
+            ts = None
+        samples.append(ts)
+
+    # Rows whose timestamp cannot be read keep unknown deltas and do not touch the state
+    order = sorted((i for i, ts in enumerate(samples) if ts is not None), key=lambda i: samples[i])
+    keys = [_flow_key(rows[i]) for i in order]
+    snapshots = [
+        (samples[i], int(rows[i][_PACKETS]), int(rows[i][_BYTES]), float(rows[i][_DURATION]))
+        for i in order
+    ]
+
+    try:
+        deltas = _redis_deltas(keys, snapshots)
+    except redis.exceptions.RedisError:
+        logger.exception("Counter state unavailable in Redis; using in-process state")
+        deltas = _local_deltas(keys, snapshots)
+
+    result = [rows[i] + delta for i, delta in zip(order, deltas)]
+    result.extend(rows[i] + (None, None) for i, ts in enumerate(samples) if ts is None)
+    return result
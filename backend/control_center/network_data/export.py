@@ -0,0 +1,262 @@
+# network_data/export.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Streaming export of raw Flow and FlowStat history.
+
+Rows are read in pages with keyset pagination on the (timestamp, id) primary
+key of the hypertables: each page is one indexed range query starting after
+the last row of the previous page, so memory use is bounded by the page size
+whatever the time range, and late pages cost the same as early ones.
+
+Pages are encoded as NDJSON, CSV or Parquet (one row group per page; needs
+pyarrow) and yielded as they are produced, for a file or, through
+stream_async, a StreamingHttpResponse served under ASGI.
+"""
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+from .models import Flow, FlowStat
+
+# Rows per keyset page (and per Parquet row group)
+EXPORT_CHUNK_SIZE = 5000
+
+# Exportable tables: columns with their type tag, and the columns that may be filtered on
+EXPORT_SPECS = {
+    'flow': {
+        'table': Flow._meta.db_table,
+        'columns': [
+            ('id', 'int'), ('timestamp', 'timestamp'), ('src_ip', 'str'), ('dst_ip', 'str'),
+            ('src_mac', 'str'), ('dst_mac', 'str'), ('src_port', 'int'), ('dst_port', 'int'),
+            ('protocol', 'str'), ('classification', 'str'),
+        ],
+        'filters': ('src_mac', 'classification'),
+    },
+    'flowstat': {
+        'table': FlowStat._meta.db_table,
+        'columns': [
+            ('id', 'int'), ('timestamp', 'timestamp'), ('classification', 'str'), ('meter_id', 'int'),
+            ('duration_seconds', 'float'), ('packet_count', 'int'), ('byte_count', 'int'),
+            ('packet_delta', 'int'), ('byte_delta', 'int'), ('priority', 'int'),
+            ('mac_address', 'str'), ('protocol', 'str'), ('port', 'int'),
+        ],
+        'filters': ('mac_address', 'classification'),
+    },
+}
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def _clean_filters(kind: str, filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    filters = {column: value for column, value in (filters or {}).items() if value is not None}
+    unknown = set(filters) - set(EXPORT_SPECS[kind]['filters'])
+    if unknown:
+        raise ValueError(f"Cannot filter {kind} export by {', '.join(sorted(unknown))}")
+    return filters
+
+
+def iter_pages(kind: str, start, end, filters: Optional[Dict[str, Any]] = None,
+               chunk_size: int = EXPORT_CHUNK_SIZE,
+               after: Optional[Tuple[Any, int]] = None) -> Iterator[List[Tuple]]:
+    """
+    Yield pages of rows in (timestamp, id) order for start <= timestamp < end
+
+    Args:
+        kind: Key of EXPORT_SPECS ('flow' or 'flowstat')
+        start: Inclusive lower bound (aware datetime)
+        end: Exclusive upper bound (aware datetime)
+        filters: Optional {column: value} equality filters (see EXPORT_SPECS)
+        chunk_size: Rows per page
+        after: Optional (timestamp, id) of the last row already exported, to resume
+
+    Raises:
+        ValueError: On an unknown kind or filter column
+    """
+    spec = EXPORT_SPECS[kind]
+    filters = _clean_filters(kind, filters)
+
+    column_sql = ", ".join(name for name, _ in spec['columns'])
+    filter_sql = "".join(f" AND {column} = %s" for column in filters)
+    base_sql = f"SELECT {column_sql} FROM {spec['table']} WHERE timestamp >= %s AND timestamp < %s{filter_sql}"
+    base_params = [start, end, *filters.values()]
+
+    last_key = after
+    while True:
+        if last_key is None:
+            sql = f"{base_sql} ORDER BY timestamp, id LIMIT %s"
+            params = [*base_params, chunk_size]
+        else:
+            sql = f"{base_sql} AND (timestamp, id) > (%s, %s) ORDER BY timestamp, id LIMIT %s"
+            params = [*base_params, last_key[0], last_key[1], chunk_size]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            page = cursor.fetchall()
+        if not page:
+            return
+        yield page
+        if len(page) < chunk_size:
+            return
+        # Columns start with (id, timestamp)
+        last_key = (page[-1][1], page[-1][0])
+
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def _encode_ndjson(columns: List[str], pages: Iterator[List[Tuple]]) -> Iterator[bytes]:
+    for page in pages:
+        yield "".join(
+            json.dumps(dict(zip(columns, map(_json_value, row)))) + "\n" for row in page
+        ).encode()
+
+
+def _encode_csv(columns: List[str], pages: Iterator[List[Tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    for page in pages:
+        writer.writerows([_json_value(value) for value in row] for row in page)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        # Parquet metadata records absolute offsets, so the position never resets
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _encode_parquet(spec_columns: List[Tuple[str, str]], pages: Iterator[List[Tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'str': pa.string(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+    }
+    schema = pa.schema([(name, arrow_types[tag]) for name, tag in spec_columns])
+    sink = _StreamSink()
+    with pq.ParquetWriter(sink, schema, compression='zstd') as writer:
+        for page in pages:
+            arrays = [
+                pa.array([row[i] for row in page], type=schema.field(i).type)
+                for i in range(len(spec_columns))
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def export_rows(kind: str, fmt: str, start, end, filters: Optional[Dict[str, Any]] = None,
+                chunk_size: int = EXPORT_CHUNK_SIZE,
+                after: Optional[Tuple[Any, int]] = None) -> Iterator[bytes]:
+    """
+    Stream an export of one table as encoded byte chunks (one per page)
+
+    Args:
+        kind: 'flow' or 'flowstat'
+        fmt: 'ndjson', 'csv' or 'parquet'
+        start, end, filters, chunk_size, after: See iter_pages
+
+    Raises:
+        ValueError: On an unknown kind, format or filter column, or Parquet without pyarrow
+    """
+    if kind not in EXPORT_SPECS:
+        raise ValueError(f"Unknown export kind: {kind}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == 'parquet' and not parquet_available():
+        raise ValueError("Parquet export requires pyarrow")
+    # Validate before streaming starts; the generators only run once the response is sent
+    filters = _clean_filters(kind, filters)
+
+    spec_columns = EXPORT_SPECS[kind]['columns']
+    pages = iter_pages(kind, start, end, filters, chunk_size, after)
+    if fmt == 'ndjson':
+        return _encode_ndjson([name for name, _ in spec_columns], pages)
+    if fmt == 'csv':
+        return _encode_csv([name for name, _ in spec_columns], pages)
+    return _encode_parquet(spec_columns, pages)
+
+
+async def stream_async(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Serve an export_rows iterator as an async iterator, one chunk at a time
+
+    Under ASGI a StreamingHttpResponse given a sync iterator collects the whole
+    iterator before sending anything. Here each chunk (one keyset page query
+    plus its encoding) is produced with sync_to_async in the thread that owns
+    the database connection, so the response streams with bounded memory.
+    """
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        # Runs the generators' cleanup (e.g. the Parquet writer) if the client disconnects
+        await sync_to_async(chunks.close, thread_sensitive=True)()
@@ -0,0 +1,192 @@
+# network_data/ingest_buffer.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Micro-batching ingestion buffer for flow and flow stat records.
+
+Request handlers append records to a Redis stream per record kind instead of
+dispatching one Celery task per request. A consumer task drains the stream
+through a consumer group and writes everything it read with a single COPY per
+kind. Flushes are triggered by size (enough records buffered) or by time (a
+short periodic task), so many small requests become few large DB writes.
+
+Entries are only acknowledged once their rows are written. A batch that fails
+is bisected so one bad entry cannot hold back the rest, and an entry that
+keeps failing is moved to a dead-letter stream (see utils.stream_buffer).
+
+Ingest is never lossy: once INGEST_BUFFER_MAX_RECORDS records are waiting
+(e.g. the database is down and flushes keep failing), buffer_records returns
+False and the caller dispatches the direct write task instead. Overflows,
+lost entries and dead-lettered entries are counted per kind (see
+buffer_counters).
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+
+import redis
+from django.conf import settings
+from django.utils import timezone
+
+from utils.stream_buffer import StreamBuffer
+from .ingestion import (
+    columnar_flow_stat_rows, flow_rows, flow_stat_rows, write_flow_rows, write_flow_stat_rows
+)
+
+logger = logging.getLogger(__name__)
+
+FLOW = "flow"
+FLOWSTAT = "flowstat"
+
+STREAM_KEYS = {
+    FLOW: "ingest_buffer:flow",
+    FLOWSTAT: "ingest_buffer:flowstat",
+}
+ROW_BUILDERS = {
+    FLOW: flow_rows,
+    FLOWSTAT: flow_stat_rows,
+}
+ROW_WRITERS = {
+    FLOW: write_flow_rows,
+    FLOWSTAT: write_flow_stat_rows,
+}
+
+CONSUMER_GROUP = "ingest-writers"
+COUNTERS_KEY = "ingest_buffer:counters"
+
+INGEST_BUFFER_ENABLED = getattr(settings, 'INGEST_BUFFER_ENABLED', True)
+# Buffered records that trigger an immediate flush
+FLUSH_SIZE = getattr(settings, 'INGEST_BUFFER_FLUSH_SIZE', 5000)
+# Buffered records beyond which callers write directly instead of buffering
+MAX_RECORDS = getattr(settings, 'INGEST_BUFFER_MAX_RECORDS', 500000)
+
+stream_buffer = StreamBuffer(STREAM_KEYS, CONSUMER_GROUP, client_name="ingest-buffer")
+
+
+def _append(kind: str, fields: Dict[str, str], count: int) -> bool:
+    """Buffer one entry; False (and counted) if MAX_RECORDS records are already waiting"""
+    if stream_buffer.pending(kind) + count > MAX_RECORDS:
+        logger.warning(f"Ingestion buffer for {kind} is full; writing {count} records directly")
+        stream_buffer.get_redis().hincrby(COUNTERS_KEY, f"{kind}:overflow", count)
+        return False
+    pending = stream_buffer.append(kind, fields, count)
+    from .tasks import flush_ingest_buffer
+    stream_buffer.schedule_flush(kind, pending, FLUSH_SIZE, flush_ingest_buffer)
+    return True
+
+
+def buffer_records(kind: str, records: List[Dict[str, Any]]) -> bool:
+    """
+    Append records to the ingestion buffer, scheduling a flush when it is full
+
+    Args:
+        kind: FLOW or FLOWSTAT
+        records: Payloads accepted by the matching ingestion writer
+
+    Returns:
+        bool: True if the records were buffered; False if the caller should
+        fall back to dispatching the write task directly (buffer disabled,
+        full or unavailable)
+    """
+    if not records:
+        return True
+    if not INGEST_BUFFER_ENABLED:
+        return False
+
+    try:
+        return _append(kind, {"records": json.dumps(records, default=str)}, len(records))
+    except redis.exceptions.RedisError:
+        logger.exception(f"Ingestion buffer unavailable for {kind} records")
+        return False
+
+
+def buffer_columnar_flow_stats(payload: Dict[str, Any], count: int) -> bool:
+    """
+    Append a validated columnar (version 2) flow stat batch to the buffer as-is
+
+    The batch is converted to rows with the other buffered records at flush time.
+
+    Returns:
+        bool: True if buffered; False if the caller should dispatch directly
+    """
+    if not INGEST_BUFFER_ENABLED:
+        return False
+    try:
+        return _append(FLOWSTAT, {"columnar": json.dumps(payload)}, count)
+    except redis.exceptions.RedisError:
+        logger.exception("Ingestion buffer unavailable for columnar flow stats")
+        return False
+
+
+def stamp_flow_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Give flows their arrival time, since buffered rows are written after a delay"""
+    now = timezone.now().isoformat()
+    for record in records:
+        record.setdefault('timestamp', now)
+    return records
+
+
+def flush(kind: str, max_rounds: int = 20) -> Dict[str, Any]:
+    """
+    Drain buffered records of one kind into the database
+
+    Each round converts every record read (per-record dicts and columnar
+    batches alike) to rows and writes them with one COPY; see
+    StreamBuffer.flush for how failing entries are isolated.
+
+    Returns:
+        Dict with created, errors, received, dead_lettered and trimmed counts across all rounds
+    """
+    def decode(fields: Dict[str, str]) -> Tuple[Tuple[List[tuple], List[str], int], int]:
+        if "columnar" in fields:
+            built = columnar_flow_stat_rows(json.loads(fields["columnar"]))
+        else:
+            built = ROW_BUILDERS[kind](json.loads(fields["records"]))
+        return built, int(fields.get("count", built[2]))
+
+    def write(payloads: List[Tuple[List[tuple], List[str], int]]) -> Dict[str, Any]:
+        rows: List[tuple] = []
+        errors: List[str] = []
+        received = 0
+        for entry_rows, entry_errors, entry_received in payloads:
+            rows.extend(entry_rows)
+            errors.extend(entry_errors)
+            received += entry_received
+        return ROW_WRITERS[kind](rows, errors, received, raise_errors=True)
+
+    summary = stream_buffer.flush(kind, decode, write, max_rounds=max_rounds)
+    summary.setdefault("received", 0)
+
+    pipe = stream_buffer.get_redis().pipeline()
+    pipe.hincrby(COUNTERS_KEY, f"{kind}:written", summary["created"])
+    pipe.hincrby(COUNTERS_KEY, f"{kind}:dead_lettered", summary["dead_lettered"])
+    pipe.hincrby(COUNTERS_KEY, f"{kind}:lost_entries", summary["trimmed"])
+    pipe.execute()
+    return summary
+
+
+def buffer_counters() -> Dict[str, int]:
+    """Written/overflow/dead-lettered/lost counts per kind, plus records currently waiting"""
+    counters = {
+        field: int(value) for field, value in stream_buffer.get_redis().hgetall(COUNTERS_KEY).items()
+    }
+    for kind in STREAM_KEYS:
+        counters[f"{kind}:pending"] = stream_buffer.pending(kind)
+    return counters
@@ -0,0 +1,487 @@
+# network_data/ingestion.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Bulk ingestion writer for the Flow and FlowStat hypertables.
+
+Rows are validated into plain tuples and streamed into TimescaleDB with
+``COPY ... FROM STDIN`` (CSV), skipping Django model instantiation and the
+multi-row INSERT statements generated by ``bulk_create``. Every writer returns
+the same ``{"created", "errors", "received"}`` summary as the Celery tasks.
+"""
+
+import csv
+import io
+import ipaddress
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .counters import attach_deltas
+from .models import Flow, FlowStat
+
+logger = logging.getLogger(__name__)
+
+# Rows per COPY statement; bounds the size of the in-memory CSV buffer
+COPY_CHUNK_SIZE = 50000
+
+# Marker COPY interprets as NULL (an unquoted empty field stays an empty string)
+COPY_NULL = r"\N"
+
+FLOW_TABLE = Flow._meta.db_table
+FLOW_COLUMNS = (
+    "timestamp", "src_ip", "dst_ip", "src_mac", "dst_mac",
+    "src_port", "dst_port", "protocol", "classification",
+)
+
+# Columnar flow stat schema (one array per field); see validate_columnar_flow_stats
+COLUMNAR_SCHEMA_VERSION = 2
+COLUMNAR_FIELDS = (
+    "cookie", "meter", "duration", "packets", "bytes",
+    "priority", "mac_address", "protocol", "port",
+)
+COLUMNAR_REQUIRED = ("cookie", "packets", "bytes")
+
+FLOWSTAT_TABLE = FlowStat._meta.db_table
+FLOWSTAT_COLUMNS = (
+    "timestamp", "classification", "meter_id", "duration_seconds", "packet_count",
+    "byte_count", "priority", "mac_address", "protocol", "port",
+    "packet_delta", "byte_delta",
+)
+
+
+def _max_length(model, field: str) -> int:
+    return model._meta.get_field(field).max_length
+
+
+# varchar limits: a longer value would abort the whole COPY chunk
+FLOW_MAX_LENGTHS = {field: _max_length(Flow, field) for field in ("src_mac", "dst_mac", "protocol", "classification")}
+FLOWSTAT_MAX_LENGTHS = {field: _max_length(FlowStat, field) for field in ("classification", "mac_address", "protocol")}
+
+
+def inet_value(value: Any, field: str) -> str:
+    """Validate an IPv4/IPv6 address for an inet column"""
+    try:
+        return str(ipaddress.ip_address(str(value).strip()))
+    except ValueError:
+        raise ValueError(f"Invalid IP address for {field}: {value!r}")
+
+
+def varchar_value(value: Any, field: str, max_length: int) -> Optional[str]:
+    """Check a value fits its varchar column (None passes through)"""
+    if value is None:
+        return None
+    value = str(value)
+    if len(value) > max_length:
+        raise ValueError(f"{field} longer than {max_length} characters: {value[:max_length]}...")
+    return value
+
+
+def _port(value: Any, field: str) -> Optional[int]:
+    """Validate an optional TCP/UDP port"""
+    if value is None or value == "":
+        return None
+    try:
+        port = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field}: {value!r}")
+    if not 0 <= port <= 65535:
+        raise ValueError(f"{field} out of range: {port}")
+    return port
+
+
+def parse_duration_seconds(duration: Any) -> float:
+    """Parse an OpenFlow duration ("224.533s") or a number of seconds"""
+    if isinstance(duration, str) and duration.endswith('s'):
+        return float(duration.rstrip('s'))
+    if isinstance(duration, (int, float)):
+        return float(duration)
+    return 0.0
+
+
+def build_flow_stat_row(data: Dict[str, Any]) -> Tuple:
+    """
+    Validate one flow stat payload into a FLOWSTAT_COLUMNS tuple (without the delta columns)
+
+    Raises:
+        ValueError: If the timestamp or duration cannot be parsed, or a value
+            would not fit its column
+    """
+    ts_str = data.get('timestamp')
+    timestamp = parse_datetime(ts_str) if isinstance(ts_str, str) else ts_str
+    if not timestamp:
+        raise ValueError(f"Invalid timestamp format: {ts_str}")
+
+    duration = data.get('duration', "0s")
+    try:
+        duration_seconds = parse_duration_seconds(duration)
+    except ValueError:
+        raise ValueError(f"Could not parse duration string: {duration}")
+
+    return (
+        timestamp,
+        varchar_value(data.get('classification', 'unknown_cookie'), 'classification', FLOWSTAT_MAX_LENGTHS['classification']),
+        int(data.get('meter', 0)),
+        duration_seconds,
+        int(data.get('packets', 0)),
+        int(data.get('bytes', 0)),
+        int(data.get('priority', 0)),
+        varchar_value(data.get('mac_address', ""), 'mac_address', FLOWSTAT_MAX_LENGTHS['mac_address']),
+        varchar_value(data.get('protocol', ""), 'protocol', FLOWSTAT_MAX_LENGTHS['protocol']),
+        int(data.get('port', 0) or 0),
+    )
+
+
+def build_flow_row(data: Dict[str, Any], timestamp) -> Tuple:
+    """
+    Validate one classified flow payload into a FLOW_COLUMNS tuple
+
+    Raises:
+        ValueError: If a NOT NULL column is missing, an address is not a valid
+            IP or a value does not fit its column (any of these would fail the
+            whole COPY)
+    """
+    for field in ('src_ip', 'dst_ip', 'src_mac', 'classification'):
+        if data.get(field) is None:
+            raise ValueError(f"Missing required field: {field}")
+
+    # Buffered flows carry their arrival time; direct writes use the batch time
+    ts_str = data.get('timestamp')
+    if ts_str:
+        timestamp = parse_datetime(ts_str) if isinstance(ts_str, str) else ts_str
+        if not timestamp:
+            raise ValueError(f"Invalid timestamp format: {ts_str}")
+
+    return (
+        timestamp,
+        inet_value(data['src_ip'], 'src_ip'),
+        inet_value(data['dst_ip'], 'dst_ip'),
+        varchar_value(data['src_mac'], 'src_mac', FLOW_MAX_LENGTHS['src_mac']),
+        varchar_value(data.get('dst_mac'), 'dst_mac', FLOW_MAX_LENGTHS['dst_mac']),
+        _port(data.get('src_port'), 'src_port'),
+        _port(data.get('dst_port'), 'dst_port'),
+        varchar_value(data.get('protocol'), 'protocol', FLOW_MAX_LENGTHS['protocol']),
+        varchar_value(data['classification'], 'classification', FLOW_MAX_LENGTHS['classification']),
+    )
+
+
+def _format_value(value: Any) -> Any:
+    if value is None:
+        return COPY_NULL
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def copy_rows(table: str, columns: Sequence[str], rows: List[Tuple]) -> int:
+    """
+    Stream rows into a table with a single COPY ... FROM STDIN
+
+    Args:
+        table: Target table name
+        columns: Column names matching the tuple layout of each row
+        rows: Validated row tuples
+
+    Returns:
+        int: Number of rows written
+    """
+    if not rows:
+        return 0
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in rows:
+        writer.writerow([_format_value(v) for v in row])
+    buffer.seek(0)
+
+    sql = (
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN "
+        f"WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+    with connection.cursor() as cursor, connection.wrap_database_errors:
+        # Django's CursorWrapper exposes the psycopg2 cursor as .cursor; errors are
+        # re-raised as django.db exceptions (DataError, OperationalError, ...)
+        cursor.cursor.copy_expert(sql, buffer)
+    return len(rows)
+
+
+def _write_rows(model, table: str, columns: Sequence[str], rows: List[Tuple],
+                errors: List[str], raise_errors: bool = False) -> int:
+    """
+    Write rows in COPY-sized chunks, falling back to bulk_create off PostgreSQL
+
+    A failed chunk is logged and recorded in errors, or re-raised with
+    raise_errors so the caller can retry or isolate the batch.
+    """
+    created = 0
+    for start in range(0, len(rows), COPY_CHUNK_SIZE):
+        chunk = rows[start:start + COPY_CHUNK_SIZE]
+        try:
+            if connection.vendor == 'postgresql':
+                created += copy_rows(table, columns, chunk)
+            else:
+                model.objects.bulk_create(
+                    [model(**dict(zip(columns, row))) for row in chunk],
+                    batch_size=5000
+                )
+                created += len(chunk)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.exception(f"Bulk ingestion into {table} failed for {len(chunk)} rows")
+            errors.append(f"COPY into {table} failed for rows {start}-{start + len(chunk) - 1}: {e}")
+    return created
+
+
+def flow_stat_rows(data_list: Iterable[Dict[str, Any]]) -> Tuple[List[Tuple], List[str], int]:
+    """
+    Validate flow stat payloads (one dict per record) into row tuples
+
+    Returns:
+        Tuple of (rows, errors, received)
+    """
+    rows: List[Tuple] = []
+    errors: List[str] = []
+    received = 0
+
+    for idx, data in enumerate(data_list):
+        received += 1
+        try:
+            rows.append(build_flow_stat_row(data))
+        except Exception as e:
+            errors.append(f"Error processing record at index {idx}: {e}")
+
+    return rows, errors, received
+
+
+def validate_columnar_flow_stats(payload: Dict[str, Any]) -> int:
+    """
+    Check the structure of a columnar (version 2) flow stat batch
+
+    Version 2 sends one array per field instead of one object per record::
+
+        {
+            "version": 2,
+            "timestamp_ms": 1760870400000,      # or a "timestamp_ms" column
+            "columns": {
+                "cookie": [...], "packets": [...], "bytes": [...],
+                "meter": [...], "duration": [...], "priority": [...],
+                "mac_address": [...], "protocol": [...], "port": [...]
+            }
+        }
+
+    Timestamps are epoch milliseconds, durations float seconds and cookies
+    unsigned 64-bit integers. Only cookie, packets and bytes are required.
+
+    Returns:
+        int: Number of records in the batch
+
+    Raises:
+        ValueError: If the version, required columns or column lengths are wrong
+    """
+    if not isinstance(payload, dict) or payload.get('version') != COLUMNAR_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported flow stat schema version: {payload.get('version') if isinstance(payload, dict) else None}")
+
+    columns = payload.get('columns')
+    if not isinstance(columns, dict):
+        raise ValueError("'columns' must be an object of field arrays")
+
+    missing = [name for name in COLUMNAR_REQUIRED if name not in columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    if 'timestamp_ms' not in columns and 'timestamp_ms' not in payload:
+        raise ValueError("A batch 'timestamp_ms' or a 'timestamp_ms' column is required")
+
+    unknown = set(columns) - set(COLUMNAR_FIELDS) - {'timestamp_ms'}
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+
+    count = len(columns['cookie'])
+    for name, values in columns.items():
+        if not isinstance(values, list) or len(values) != count:
+            raise ValueError(f"Column '{name}' must be an array of length {count}")
+    return count
+
+
+def columnar_flow_stat_rows(payload: Dict[str, Any]) -> Tuple[List[Tuple], List[str], int]:
+    """
+    Convert a columnar (version 2) flow stat batch into row tuples with vectorized numpy casts
+
+    Rows with negative counters, a non-finite or negative duration, an
+    out-of-range port or a mac_address/protocol longer than its column are
+    dropped and reported as one aggregated error.
+
+    Returns:
+        Tuple of (rows, errors, received)
+
+    Raises:
+        ValueError: If the batch structure or a column's type is invalid
+    """
+    count = validate_columnar_flow_stats(payload)
+    if count == 0:
+        return [], [], 0
+    columns = payload['columns']
+
+    def _column(name, dtype, default):
+        values = columns.get(name)
+        if values is None:
+            return np.full(count, default, dtype=dtype)
+        try:
+            return np.asarray(values, dtype=dtype)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ValueError(f"Column '{name}' has invalid values: {e}")
+
+    ts_ms = columns.get('timestamp_ms', payload.get('timestamp_ms'))
+    try:
+        ts_ms = np.broadcast_to(np.asarray(ts_ms, dtype=np.int64), (count,))
+    except (TypeError, ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid timestamp_ms: {e}")
+    timestamps = np.datetime_as_string(ts_ms.astype('datetime64[ms]'), unit='ms', timezone='UTC')
+
+    cookies = _column('cookie', np.uint64, 0).astype(str)
+    meters = _column('meter', np.int64, 0)
+    durations = _column('duration', np.float64, 0.0)
+    packets = _column('packets', np.int64, 0)
+    byte_counts = _column('bytes', np.int64, 0)
+    priorities = _column('priority', np.int64, 0)
+    ports = _column('port', np.int64, 0)
+    macs = np.array([m or "" for m in columns.get('mac_address', [""] * count)], dtype=object)
+    protocols = np.array([p or "" for p in columns.get('protocol', [""] * count)], dtype=object)
+
+    fits = np.array([
+        len(str(m)) <= FLOWSTAT_MAX_LENGTHS['mac_address'] and len(str(p)) <= FLOWSTAT_MAX_LENGTHS['protocol']
+        for m, p in zip(macs, protocols)
+    ], dtype=bool)
+
+    valid = (
+        (packets >= 0) & (byte_counts >= 0) & np.isfinite(durations) & (durations >= 0)
+        & (ports >= 0) & (ports <= 65535) & (ts_ms > 0) & fits
+    )
+
+    errors: List[str] = []
+    if not valid.all():
+        bad = np.flatnonzero(~valid)
+        errors.append(
+            f"Dropped {len(bad)} invalid records (negative counters, duration, port or timestamp, "
+            f"or an over-long mac_address/protocol) "
+            f"at indices {bad[:10].tolist()}{'...' if len(bad) > 10 else ''}"
+        )
+
+    rows = list(zip(
+        timestamps[valid].tolist(),
+        cookies[valid].tolist(),
+        meters[valid].tolist(),
+        durations[valid].tolist(),
+        packets[valid].tolist(),
+        byte_counts[valid].tolist(),
+        priorities[valid].tolist(),
+        macs[valid].tolist(),
+        protocols[valid].tolist(),
+        ports[valid].tolist(),
+    ))
+    return rows, errors, count
+
+
+def flow_rows(data_list: Iterable[Dict[str, Any]], timestamp: Optional[Any] = None) -> Tuple[List[Tuple], List[str], int]:
+    """
+    Validate classified flow payloads into row tuples
+
+    Args:
+        data_list: Flow payloads
+        timestamp: Timestamp for rows without their own (defaults to now, matching auto_now_add)
+
+    Returns:
+        Tuple of (rows, errors, received)
+    """
+    timestamp = timestamp or timezone.now()
+    rows: List[Tuple] = []
+    errors: List[str] = []
+    received = 0
+
+    for idx, data in enumerate(data_list):
+        received += 1
+        try:
+            rows.append(build_flow_row(data, timestamp))
+        except Exception as e:
+            errors.append(f"Error processing record at index {idx}: {e}")
+
+    return rows, errors, received
+
+
+def write_flow_stat_rows(rows: List[Tuple], errors: List[str], received: int,
+                         raise_errors: bool = False) -> Dict[str, Any]:
+    """Attach counter deltas, COPY validated flow stat rows and build the created/errors/received summary"""
+    created = _write_rows(FlowStat, FLOWSTAT_TABLE, FLOWSTAT_COLUMNS, attach_deltas(rows), errors, raise_errors)
+    return {
+        "created": created,
+        "errors": errors,
+        "received": received
+    }
+
+
+def write_flow_rows(rows: List[Tuple], errors: List[str], received: int,
+                    raise_errors: bool = False) -> Dict[str, Any]:
+    """COPY validated flow rows and build the created/errors/received summary"""
+    created = _write_rows(Flow, FLOW_TABLE, FLOW_COLUMNS, rows, errors, raise_errors)
+    return {
+        "created": created,
+        "errors": errors,
+        "received": received
+    }
+
+
+def write_flow_stats(data_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Validate and COPY a batch of flow stat payloads into network_data_flowstat
+
+    Returns:
+        Dict with created, errors and received counts
+    """
+    return write_flow_stat_rows(*flow_stat_rows(data_list))
+
+
+def write_columnar_flow_stats(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate and COPY a columnar (version 2) flow stat batch into network_data_flowstat
+
+    Returns:
+        Dict with created, errors and received counts
+    """
+    try:
+        return write_flow_stat_rows(*columnar_flow_stat_rows(payload))
+    except ValueError as e:
+        return {"created": 0, "errors": [str(e)], "received": 0}
+
+
+def write_flows(data_list: Iterable[Dict[str, Any]], timestamp: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Validate and COPY a batch of classified flows into network_data_flow
+
+    Args:
+        data_list: Flow payloads
+        timestamp: Timestamp for rows without their own (defaults to now, matching auto_now_add)
+
+    Returns:
+        Dict with created, errors and received counts
+    """
+    return write_flow_rows(*flow_rows(data_list, timestamp))
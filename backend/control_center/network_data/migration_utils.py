@@ -0,0 +1,70 @@
+# File: network_data/migration_utils.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Operation builders shared by the TimescaleDB migrations of network_data and
+device_monitoring.
+"""
+
+from django.db import migrations
+
+
+def continuous_aggregate(view_name, source, width, select, group_by, start_offset, end_offset,
+                         schedule_interval, time_column='bucket'):
+    """
+    Build the operations for one continuous aggregate on top of `source`
+    (a hypertable, or a finer aggregate bucketed on its `bucket` column).
+
+    The view is created with real-time aggregation enabled so buckets not yet
+    materialized are computed from the source at query time, existing history
+    is materialized, and a refresh policy is added. Migrations using it must
+    set atomic = False, since refresh_continuous_aggregate cannot run in a
+    transaction.
+    """
+    return [
+        migrations.RunSQL(
+            sql=f"""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS {view_name}
+                WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+                SELECT
+                    time_bucket('{width}', {time_column}) AS bucket,
+                    {select}
+                FROM {source}
+                GROUP BY 1, {group_by}
+                WITH NO DATA;
+            """,
+            reverse_sql=f"DROP MATERIALIZED VIEW IF EXISTS {view_name};"
+        ),
+        # Materialize existing history (runs outside a transaction)
+        migrations.RunSQL(
+            sql=f"CALL refresh_continuous_aggregate('{view_name}', NULL, NULL);",
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            sql=f"""
+                SELECT add_continuous_aggregate_policy(
+                    '{view_name}',
+                    start_offset => INTERVAL '{start_offset}',
+                    end_offset => INTERVAL '{end_offset}',
+                    schedule_interval => INTERVAL '{schedule_interval}'
+                );
+            """,
+            reverse_sql=f"SELECT remove_continuous_aggregate_policy('{view_name}', if_exists => true);"
+        ),
+    ]
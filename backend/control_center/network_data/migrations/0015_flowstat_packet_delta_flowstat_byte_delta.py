@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network_data', '0014_flowstat_network_dat_mac_add_866198_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flowstat',
+            name='packet_delta',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='flowstat',
+            name='byte_delta',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
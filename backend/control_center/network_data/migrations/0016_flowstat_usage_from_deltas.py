@@ -0,0 +1,120 @@
+# File: network_data/migrations/0016_flowstat_usage_from_deltas.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+from django.db import migrations
+
+
+USAGE_AGGREGATE_POLICIES = """
+    SELECT add_continuous_aggregate_policy(
+        'network_data_flowstat_usage_1min',
+        start_offset => INTERVAL '3 minute',
+        end_offset => INTERVAL '1 minute',
+        schedule_interval => INTERVAL '1 minute'
+    );
+
+    ALTER MATERIALIZED VIEW network_data_flowstat_usage_1min SET (
+        timescaledb.compress,
+        timescaledb.compress_segmentby = 'mac_address, classification, protocol',
+        timescaledb.compress_orderby = 'bucket DESC'
+    );
+
+    DO $$
+    BEGIN
+        PERFORM add_compression_policy('network_data_flowstat_usage_1min', INTERVAL '7 days');
+    EXCEPTION
+        WHEN duplicate_object THEN
+            NULL;
+    END $$;
+"""
+
+
+class Migration(migrations.Migration):
+    atomic = False
+    dependencies = [
+        ('network_data', '0015_flowstat_packet_delta_flowstat_byte_delta'),
+    ]
+
+    operations = [
+        # On reverse these run last: refresh and re-add policies on the recreated original aggregate
+        migrations.RunSQL(
+            sql=migrations.RunSQL.noop,
+            reverse_sql=USAGE_AGGREGATE_POLICIES
+        ),
+        migrations.RunSQL(
+            sql=migrations.RunSQL.noop,
+            reverse_sql="CALL refresh_continuous_aggregate('network_data_flowstat_usage_1min', NULL, NULL);"
+        ),
+
+        # Rebuild the usage aggregate on the per-interval deltas written at ingest.
+        # usage_bytes falls back to MAX - MIN for buckets that only hold rows
+        # ingested before deltas existed.
+        migrations.RunSQL(
+            sql="""
+                DROP MATERIALIZED VIEW IF EXISTS network_data_flowstat_usage_1min CASCADE;
+
+                CREATE MATERIALIZED VIEW network_data_flowstat_usage_1min
+                WITH (timescaledb.continuous) AS
+                SELECT
+                    time_bucket('1 minute', timestamp) AS bucket,
+                    mac_address,
+                    classification,
+                    protocol,
+                    port,
+                    MAX(byte_count) AS max_bytes,
+                    MIN(byte_count) AS min_bytes,
+                    SUM(byte_delta) AS delta_bytes,
+                    SUM(packet_delta) AS delta_packets,
+                    COALESCE(SUM(byte_delta), MAX(byte_count) - MIN(byte_count)) AS usage_bytes
+                FROM network_data_flowstat
+                WHERE mac_address IS NOT NULL
+                GROUP BY bucket, mac_address, classification, protocol, port
+                WITH NO DATA;
+            """,
+            reverse_sql="""
+                DROP MATERIALIZED VIEW IF EXISTS network_data_flowstat_usage_1min CASCADE;
+
+                CREATE MATERIALIZED VIEW network_data_flowstat_usage_1min
+                WITH (timescaledb.continuous) AS
+                SELECT
+                    time_bucket('1 minute', timestamp) AS bucket,
+                    mac_address,
+                    classification,
+                    protocol,
+                    port,
+                    MAX(byte_count) AS max_bytes,
+                    MIN(byte_count) AS min_bytes,
+                    (MAX(byte_count) - MIN(byte_count)) AS usage_bytes
+                FROM network_data_flowstat
+                WHERE mac_address IS NOT NULL
+                GROUP BY bucket, mac_address, classification, protocol, port
+                WITH NO DATA;
+            """
+        ),
+
+        # Materialize existing history before compression applies
+        migrations.RunSQL(
+            sql="CALL refresh_continuous_aggregate('network_data_flowstat_usage_1min', NULL, NULL);",
+            reverse_sql=migrations.RunSQL.noop
+        ),
+
+        migrations.RunSQL(
+            sql=USAGE_AGGREGATE_POLICIES,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,62 @@
+# File: network_data/migrations/0017_create_hierarchical_aggregates.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+from django.db import migrations
+
+from network_data.migration_utils import continuous_aggregate
+
+FLOW_SELECT = "classification, SUM(count) AS count"
+FLOW_BY_MAC_SELECT = "src_mac, classification, SUM(count) AS count"
+USAGE_SELECT = """mac_address,
+                    classification,
+                    protocol,
+                    port,
+                    SUM(usage_bytes) AS usage_bytes,
+                    SUM(delta_bytes) AS delta_bytes,
+                    SUM(delta_packets) AS delta_packets"""
+USAGE_GROUP_BY = "mac_address, classification, protocol, port"
+
+HOURLY = dict(width='1 hour', start_offset='3 hours', end_offset='1 hour', schedule_interval='15 minutes')
+DAILY = dict(width='1 day', start_offset='3 days', end_offset='1 day', schedule_interval='1 hour')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+    dependencies = [
+        ('network_data', '0016_flowstat_usage_from_deltas'),
+    ]
+
+    # Hourly aggregates roll up the 1-minute ones and daily aggregates roll up
+    # the hourly ones, so long-range queries read 24x / 1440x fewer buckets.
+    operations = [
+        *continuous_aggregate('network_data_flow_1h', 'network_data_flow_1min',
+                              select=FLOW_SELECT, group_by='classification', **HOURLY),
+        *continuous_aggregate('network_data_flow_1d', 'network_data_flow_1h',
+                              select=FLOW_SELECT, group_by='classification', **DAILY),
+
+        *continuous_aggregate('network_data_flow_by_mac_1h', 'network_data_flow_by_mac_1min',
+                              select=FLOW_BY_MAC_SELECT, group_by='src_mac, classification', **HOURLY),
+        *continuous_aggregate('network_data_flow_by_mac_1d', 'network_data_flow_by_mac_1h',
+                              select=FLOW_BY_MAC_SELECT, group_by='src_mac, classification', **DAILY),
+
+        *continuous_aggregate('network_data_flowstat_usage_1h', 'network_data_flowstat_usage_1min',
+                              select=USAGE_SELECT, group_by=USAGE_GROUP_BY, **HOURLY),
+        *continuous_aggregate('network_data_flowstat_usage_1d', 'network_data_flowstat_usage_1h',
+                              select=USAGE_SELECT, group_by=USAGE_GROUP_BY, **DAILY),
+    ]
@@ -0,0 +1,63 @@
+# File: network_data/migrations/0018_materialized_only_rollups.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+from django.db import migrations
+
+
+BASE_VIEWS = [
+    'network_data_flow_1min',
+    'network_data_flow_by_mac_1min',
+    'network_data_flowstat_usage_1min',
+]
+ROLLUP_VIEWS = [
+    'network_data_flow_1h',
+    'network_data_flow_1d',
+    'network_data_flow_by_mac_1h',
+    'network_data_flow_by_mac_1d',
+    'network_data_flowstat_usage_1h',
+    'network_data_flowstat_usage_1d',
+]
+
+
+def materialized_only(view_name, reverse_sql):
+    return migrations.RunSQL(
+        sql=f"ALTER MATERIALIZED VIEW {view_name} SET (timescaledb.materialized_only = true);",
+        reverse_sql=reverse_sql
+    )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+    dependencies = [
+        ('network_data', '0017_create_hierarchical_aggregates'),
+    ]
+
+    # network_data.timescaledb_utils.query_period_aggregate reads each tier up to
+    # its materialization watermark and stitches the tail from finer tiers and the
+    # raw hypertable, so the views no longer need real-time aggregation.
+    operations = [
+        *[materialized_only(view_name, migrations.RunSQL.noop) for view_name in BASE_VIEWS],
+        *[
+            materialized_only(
+                view_name,
+                f"ALTER MATERIALIZED VIEW {view_name} SET (timescaledb.materialized_only = false);"
+            )
+            for view_name in ROLLUP_VIEWS
+        ],
+    ]
@@ -41,6 +41,9 @@ class FlowStat(models.Model):
     duration_seconds = models.FloatField()
     packet_count = models.BigIntegerField()  # Can be large
     byte_count = models.BigIntegerField()  # Can be large
+    # Change since the previous snapshot of the same flow (null when unknown)
+    packet_delta = models.BigIntegerField(null=True, blank=True)
+    byte_delta = models.BigIntegerField(null=True, blank=True)
     priority = models.IntegerField()
 
     mac_address = models.CharField(max_length=17, blank=True, null=True)
@@ -0,0 +1,162 @@
+# network_data/response_cache.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Redis response cache for the dashboard aggregate endpoints.
+
+Responses are keyed on (endpoint, normalized query params, time bucket) where
+the bucket is the current AGGREGATE_CACHE_TTL-second interval, aligned with
+the 1-minute refresh of the continuous aggregates. Every viewer polling the
+same period within an interval shares one response.
+
+On a miss only one request computes the response (single-flight via a
+SET NX lock); concurrent requests for the same key wait for it to be stored
+instead of querying TimescaleDB themselves. If Redis is unavailable the view
+runs uncached.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+import redis
+from django.conf import settings
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .timescaledb_utils import parse_period
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "aggregate_cache"
+AGGREGATE_CACHE_ENABLED = getattr(settings, 'AGGREGATE_CACHE_ENABLED', True)
+# Seconds per cache bucket; matches the 1-minute aggregate refresh policy
+AGGREGATE_CACHE_TTL = getattr(settings, 'AGGREGATE_CACHE_TTL', 60)
+# How long the request holding the lock may take before others stop waiting
+LOCK_TIMEOUT_MS = 10000
+# Poll interval while waiting for another request to fill the cache
+WAIT_INTERVAL = 0.05
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Shared Redis connection for the response cache"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=getattr(settings, 'CHANNEL_REDIS_HOST', 'redis'),
+            port=getattr(settings, 'CHANNEL_REDIS_PORT', 6379),
+            decode_responses=True,
+            socket_connect_timeout=1.0,
+            socket_timeout=2.0,
+            client_name="aggregate-cache"
+        )
+    return _redis_client
+
+
+def normalize_period(value: str) -> str:
+    """'1 hour', '60 minutes' and '3600seconds' share one cache entry"""
+    try:
+        return str(int(parse_period(value).total_seconds()))
+    except ValueError:
+        return value.strip()
+
+
+def normalize_mac(value: str) -> str:
+    return value.strip().lower().replace('-', ':')
+
+
+def cache_key(endpoint: str, params: Dict[str, str], now: Optional[float] = None) -> str:
+    """Key for an endpoint, its normalized params and the current time bucket"""
+    bucket = int((now or time.time()) // AGGREGATE_CACHE_TTL)
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+    return f"{CACHE_KEY_PREFIX}:{endpoint}:{digest}:{bucket}"
+
+
+def _wait_for(client: redis.Redis, key: str, lock_key: str) -> Optional[str]:
+    """Wait for the lock holder to store the response; None if it gave up or failed"""
+    deadline = time.monotonic() + LOCK_TIMEOUT_MS / 1000
+    while time.monotonic() < deadline:
+        cached = client.get(key)
+        if cached is not None:
+            return cached
+        if not client.exists(lock_key):
+            return client.get(key)
+        time.sleep(WAIT_INTERVAL)
+    return None
+
+
+def cached_aggregate(endpoint: str, params: Dict[str, Callable[[str], str]]):
+    """
+    Cache a GET aggregate view's successful responses in Redis
+
+    Apply below @api_view so the wrapped function receives the DRF request.
+
+    Args:
+        endpoint: Name used in the cache key
+        params: Query params that vary the response, mapped to their normalizer
+            (a missing param is keyed as its absence; the view applies defaults)
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not AGGREGATE_CACHE_ENABLED:
+                return view_func(request, *args, **kwargs)
+
+            key_params = {}
+            for name, normalize in params.items():
+                value = request.query_params.get(name)
+                key_params[name] = normalize(value) if value is not None else None
+            key = cache_key(endpoint, key_params)
+            lock_key = f"{key}:lock"
+
+            try:
+                client = get_redis()
+                cached = client.get(key)
+                if cached is None and not client.set(lock_key, 1, nx=True, px=LOCK_TIMEOUT_MS):
+                    # Another request is computing this response
+                    cached = _wait_for(client, key, lock_key)
+                    if cached is None:
+                        return view_func(request, *args, **kwargs)
+                if cached is not None:
+                    return Response(json.loads(cached), status=200)
+            except redis.exceptions.RedisError:
+                logger.exception(f"Response cache unavailable for {endpoint}")
+                return view_func(request, *args, **kwargs)
+
+            # This request holds the lock: compute, store successful responses, release
+            try:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code == 200:
+                    try:
+                        client.set(key, json.dumps(response.data, cls=JSONEncoder), ex=AGGREGATE_CACHE_TTL)
+                    except redis.exceptions.RedisError:
+                        logger.exception(f"Could not cache response for {endpoint}")
+                return response
+            finally:
+                try:
+                    client.delete(lock_key)
+                except redis.exceptions.RedisError:
+                    logger.exception(f"Could not release response cache lock for {endpoint}")
+        return wrapper
+    return decorator
@@ -23,6 +23,9 @@ from .models import Flow, AggregatedFlow
 from celery import shared_task
 from django.utils.dateparse import parse_datetime
 from .models import FlowStat
+from .counters import attach_deltas
+from .ingestion import FLOWSTAT_COLUMNS, write_columnar_flow_stats, write_flow_stats, write_flows
+from . import ingest_buffer
 import threading
 import time
 import requests
@@ -115,18 +118,20 @@ def create_flow_stat_entry(data):
         elif isinstance(duration_str, (int, float)):
             duration_seconds = float(duration_str)
 
-        flow_stat = FlowStat.objects.create(
-            timestamp=timestamp,
-            classification=str(data.get('classification', 'unknown_cookie')),  # 'classification' from client IS the cookie
-            meter_id=int(data.get('meter', 0)),  # Meter ID from the flow action
-            duration_seconds=duration_seconds,
-            packet_count=int(data.get('packets', 0)),
-            byte_count=int(data.get('bytes', 0)),
-            priority=int(data.get('priority', 0)),
-            mac_address=data.get('mac_address', ""),
-            protocol=data.get('protocol', ""),
-            port=int(data.get('port', 0) or 0)  # Ensure port is int, default 0
+        row = (
+            timestamp,
+            str(data.get('classification', 'unknown_cookie')),  # 'classification' from client IS the cookie
+            int(data.get('meter', 0)),  # Meter ID from the flow action
+            duration_seconds,
+            int(data.get('packets', 0)),
+            int(data.get('bytes', 0)),
+            int(data.get('priority', 0)),
+            data.get('mac_address', ""),
+            data.get('protocol', ""),
+            int(data.get('port', 0) or 0)  # Ensure port is int, default 0
         )
+        # Adds packet_delta / byte_delta from the flow's previous snapshot
+        flow_stat = FlowStat.objects.create(**dict(zip(FLOWSTAT_COLUMNS, attach_deltas([row])[0])))
         # logger.info(f"FlowStat entry created with id {flow_stat.id} for cookie {flow_stat.cookie}")
         return f"FlowStat entry created with id {flow_stat.id}"
     except KeyError as e:
@@ -160,66 +165,23 @@ def create_flow_stat_entries_batch(data_list):
       - port: int (either tp_src or tp_dst)
       - classification: application classification
 
-    This task converts the timestamp and duration as necessary, then creates the FlowStat entries in bulk.
-    Optimized for TimescaleDB with larger batch sizes and better error handling.
+    Rows are validated into tuples and streamed into the hypertable with COPY
+    (see network_data.ingestion), skipping model instantiation entirely.
     """
-    objs = []
-    errors = []
-    
-    # Pre-allocate list for better memory efficiency
-    objs = [None] * len(data_list)
-    obj_count = 0
-    
-    for idx, data in enumerate(data_list):
-        try:
-            ts_str = data.get('timestamp')
-            timestamp = parse_datetime(ts_str) if isinstance(ts_str, str) else ts_str
-            if not timestamp:
-                raise ValueError(f"Invalid timestamp format at index {idx}: {ts_str}")
-
-            duration_str = data.get('duration', "0s")  # Default to "0s"
-            duration_seconds = 0.0
-            if isinstance(duration_str, str) and duration_str.endswith('s'):
-                try:
-                    duration_seconds = float(duration_str.rstrip('s'))
-                except ValueError:
-                    errors.append(f"Could not parse duration string at index {idx}: {duration_str}")
-                    continue
-            elif isinstance(duration_str, (int, float)):
-                duration_seconds = float(duration_str)
+    return write_flow_stats(data_list)
 
-            obj = FlowStat(
-                timestamp=timestamp,
-                classification=str(data.get('classification', 'unknown_cookie')),
-                meter_id=int(data.get('meter', 0)),
-                duration_seconds=duration_seconds,
-                packet_count=int(data.get('packets', 0)),
-                byte_count=int(data.get('bytes', 0)),
-                priority=int(data.get('priority', 0)),
-                mac_address=data.get('mac_address', ""),
-                protocol=data.get('protocol', ""),
-                port=int(data.get('port', 0) or 0)
-            )
-            objs[obj_count] = obj
-            obj_count += 1
-        except Exception as e:
-            errors.append(f"Error processing record at index {idx}: {e}")
 
-    created_count = 0
-    try:
-        if obj_count > 0:
-            # Use larger batch size for TimescaleDB optimization
-            # TimescaleDB handles large batches more efficiently
-            FlowStat.objects.bulk_create(objs[:obj_count], batch_size=5000)  # type: ignore[attr-defined]
-            created_count = obj_count
-    except Exception as e:
-        errors.append(f"bulk_create failed: {e}")
+@shared_task
+def create_flow_stat_entries_columnar(payload):
+    """
+    Celery task to create FlowStat records from a columnar (version 2) batch.
 
-    return {
-        "created": created_count,
-        "errors": errors,
-        "received": len(data_list)
-    }
+    The payload carries one array per field, epoch-millisecond timestamps,
+    float-second durations and integer cookies (see
+    network_data.ingestion.validate_columnar_flow_stats), so conversion is a
+    handful of vectorized casts instead of per-record parsing.
+    """
+    return write_columnar_flow_stats(payload)
 
 
 @shared_task
@@ -233,41 +195,36 @@ def create_flow_entries_batch(data_list):
       - dst_mac (optional)
       - src_port (optional)
       - dst_port (optional)
+      - protocol (optional)
       - classification
-    Optimized for TimescaleDB with larger batch sizes and better memory efficiency.
+    Rows are streamed into the hypertable with COPY (see network_data.ingestion).
     """
-    # Pre-allocate list for better memory efficiency
-    objs = [None] * len(data_list)
-    obj_count = 0
-    errors = []
-    
-    for idx, data in enumerate(data_list):
+    return write_flows(data_list)
+
+
+@shared_task
+def flush_ingest_buffer(kind):
+    """
+    Drain one kind of buffered record ("flow" or "flowstat") into the database.
+
+    Dispatched by the ingestion buffer when enough records are waiting.
+    """
+    return ingest_buffer.flush(kind)
+
+
+@shared_task
+def flush_ingest_buffers():
+    """
+    Periodic time-based flush of every ingestion buffer, so small trickles of
+    records are written within a few seconds even when no size flush fires.
+    """
+    results = {}
+    for kind in ingest_buffer.STREAM_KEYS:
         try:
-            obj = Flow(
-                src_ip=data.get('src_ip'),
-                dst_ip=data.get('dst_ip'),
-                src_mac=data.get('src_mac'),
-                dst_mac=data.get('dst_mac'),
-                src_port=data.get('src_port'),
-                dst_port=data.get('dst_port'),
-                classification=data.get('classification'),
-            )
-            objs[obj_count] = obj
-            obj_count += 1
+            result = ingest_buffer.flush(kind)
+            results[kind] = {"created": result["created"], "received": result["received"],
+                             "errors": len(result["errors"]), "dead_lettered": result["dead_lettered"]}
         except Exception as e:
-            errors.append(f"Error processing record at index {idx}: {e}")
-    
-    created_count = 0
-    try:
-        if obj_count > 0:
-            # Use larger batch size for TimescaleDB optimization
-            Flow.objects.bulk_create(objs[:obj_count], batch_size=5000)  # type: ignore[attr-defined]
-            created_count = obj_count
-    except Exception as e:
-        errors.append(f"bulk_create failed: {e}")
-    
-    return {
-        "created": created_count,
-        "errors": errors,
-        "received": len(data_list)
-    }
+            logger.exception(f"Error flushing {kind} ingestion buffer")
+            results[kind] = {"error": str(e)}
+    return results
@@ -0,0 +1,109 @@
+# network_data/tests.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import redis
+from django.test import SimpleTestCase
+
+from network_data import counters
+
+
+def _row(ts, packets, byte_count, duration, mac="aa:bb:cc:dd:ee:ff", port=443):
+    """A FLOWSTAT_COLUMNS row without the delta columns"""
+    return (ts, "video", 1, duration, packets, byte_count, 100, mac, "tcp", port)
+
+
+@mock.patch.object(counters, 'NEW_FLOW_SECONDS', 30.0)
+class ComputeDeltaTests(SimpleTestCase):
+    """Delta rules applied to one snapshot against a flow's history"""
+
+    def test_new_flow_within_cutoff_counts_from_zero(self):
+        self.assertEqual(counters.compute_delta(None, (1000, 10, 1500, 30.0)), (10, 1500, True))
+
+    def test_new_flow_past_cutoff_is_unknown(self):
+        self.assertEqual(counters.compute_delta([], (1000, 10, 1500, 30.5)), (None, None, True))
+
+    def test_increment_since_previous_snapshot(self):
+        history = [(1000, 10, 1500, 5.0, 10, 1500)]
+        self.assertEqual(counters.compute_delta(history, (2000, 25, 4000, 6.0)), (15, 2500, True))
+
+    def test_counter_reset_counts_from_zero(self):
+        history = [(1000, 100, 90000, 50.0, 5, 500)]
+        self.assertEqual(counters.compute_delta(history, (2000, 3, 200, 51.0)), (3, 200, True))
+
+    def test_duration_reset_counts_from_zero(self):
+        history = [(1000, 10, 1500, 50.0, 5, 500)]
+        self.assertEqual(counters.compute_delta(history, (2000, 12, 1800, 1.0)), (12, 1800, True))
+
+    def test_replay_in_history_returns_original_deltas(self):
+        history = [(2000, 25, 4000, 6.0, 15, 2500), (1000, 10, 1500, 5.0, 10, 1500)]
+        self.assertEqual(counters.compute_delta(history, (2000, 25, 4000, 6.0)), (15, 2500, False))
+        self.assertEqual(counters.compute_delta(history, (1000, 10, 1500, 5.0)), (10, 1500, False))
+
+    def test_older_snapshot_not_in_history_is_unknown(self):
+        history = [(2000, 25, 4000, 6.0, 15, 2500)]
+        self.assertEqual(counters.compute_delta(history, (1000, 10, 1500, 5.0)), (None, None, False))
+
+    def test_same_timestamp_with_other_counters_is_unknown(self):
+        history = [(2000, 25, 4000, 6.0, 15, 2500)]
+        self.assertEqual(counters.compute_delta(history, (2000, 26, 4100, 6.0)), (None, None, False))
+
+
+@mock.patch.object(counters, 'NEW_FLOW_SECONDS', 30.0)
+@mock.patch.object(counters, 'HISTORY_LENGTH', 2)
+class LocalStateTests(SimpleTestCase):
+    """In-process fallback used when Redis is unavailable"""
+
+    def setUp(self):
+        counters._local_state.clear()
+
+    def tearDown(self):
+        counters._local_state.clear()
+
+    def test_chains_snapshots_and_replays_them(self):
+        samples = [(1000, 10, 1500, 5.0), (2000, 25, 4000, 6.0)]
+        self.assertEqual(counters._local_deltas(["flow", "flow"], samples), [(10, 1500), (15, 2500)])
+        # A retried write of both snapshots gets the same deltas and leaves the state alone
+        self.assertEqual(counters._local_deltas(["flow", "flow"], samples), [(10, 1500), (15, 2500)])
+        self.assertEqual(counters._local_state["flow"][0][:4], (2000, 25, 4000, 6.0))
+
+    def test_replay_older_than_history_is_unknown(self):
+        samples = [(1000, 10, 1500, 5.0), (2000, 25, 4000, 6.0), (3000, 30, 5000, 7.0)]
+        counters._local_deltas(["flow"] * 3, samples)
+        self.assertEqual(len(counters._local_state["flow"]), 2)
+        self.assertEqual(counters._local_deltas(["flow"], samples[:1]), [(None, None)])
+        self.assertEqual(counters._local_deltas(["flow"], samples[1:2]), [(15, 2500)])
+
+    def test_attach_deltas_falls_back_when_redis_is_down(self):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            _row(start + timedelta(seconds=10), 25, 4000, 6.0),
+            _row(start, 10, 1500, 5.0),
+            _row("not a timestamp", 1, 1, 1.0),
+            _row(start, 7, 700, 120.0, port=80),
+        ]
+        with mock.patch.object(counters, '_redis_deltas', side_effect=redis.exceptions.ConnectionError):
+            result = counters.attach_deltas(rows)
+
+        # Oldest first, rows with unreadable timestamps last with unknown deltas
+        self.assertEqual([row[-2:] for row in result], [(10, 1500), (None, None), (15, 2500), (None, None)])
+        self.assertEqual([row[9] for row in result[:3]], [443, 80, 443])
+        self.assertEqual(result[3][0], "not a timestamp")
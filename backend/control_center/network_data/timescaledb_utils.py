@@ -1,12 +1,270 @@
 """
 TimescaleDB utility functions for network_data app
 """
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.db import connection
 from django.conf import settings
+from django.utils import timezone
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+PERIOD_REGEX = re.compile(r"^\s*(\d+)\s*(second|minute|hour|day)s?\s*$", re.IGNORECASE)
+
+# Continuous aggregate tiers per series, finest first: (bucket width, view name).
+# Hourly views roll up the 1-minute views and daily views roll up the hourly ones.
+ROLLUP_TIERS = {
+    'flow': [
+        (timedelta(minutes=1), 'network_data_flow_1min'),
+        (timedelta(hours=1), 'network_data_flow_1h'),
+        (timedelta(days=1), 'network_data_flow_1d'),
+    ],
+    'flow_by_mac': [
+        (timedelta(minutes=1), 'network_data_flow_by_mac_1min'),
+        (timedelta(hours=1), 'network_data_flow_by_mac_1h'),
+        (timedelta(days=1), 'network_data_flow_by_mac_1d'),
+    ],
+    'flowstat_usage': [
+        (timedelta(minutes=1), 'network_data_flowstat_usage_1min'),
+        (timedelta(hours=1), 'network_data_flowstat_usage_1h'),
+        (timedelta(days=1), 'network_data_flowstat_usage_1d'),
+    ],
+}
+
+# A tier is used only if the period spans at least this many of its buckets,
+# so few finer buckets are needed around its edges
+MIN_BUCKETS_PER_PERIOD = 24
+# time_bucket() origin: buckets of every width start at multiples of it
+BUCKET_ORIGIN = datetime(2000, 1, 3, tzinfo=dt_timezone.utc)
+
+
+def parse_period(period):
+    """
+    Parse a '<integer> <unit>' look-back period (e.g. '30 days') into a timedelta
+
+    Raises:
+        ValueError: If the period is not in the expected format
+    """
+    match = PERIOD_REGEX.match(period or '')
+    if not match:
+        raise ValueError(f"Invalid period format: {period}")
+    value, unit = int(match.group(1)), match.group(2).lower()
+    return timedelta(**{f"{unit}s": value})
+
+
+def select_rollup(series, period):
+    """
+    Pick the coarsest continuous aggregate that still resolves the requested period
+
+    Args:
+        series: Key of ROLLUP_TIERS ('flow', 'flow_by_mac' or 'flowstat_usage')
+        period: Look-back period string or timedelta
+
+    Returns:
+        str: View name to query; the 1-minute view for short periods
+    """
+    span = parse_period(period) if isinstance(period, str) else period
+    tiers = ROLLUP_TIERS[series]
+    view_name = tiers[0][1]
+    for width, name in tiers[1:]:
+        if span >= width * MIN_BUCKETS_PER_PERIOD:
+            view_name = name
+    return view_name
+
+
+# Metrics the period query builder can compute. Each lists the series it can be
+# read from (first match wins), the column summed in the rollups and, for the
+# ranges not covered by a rollup, the per-bucket aggregate computed on the raw
+# hypertable exactly as the 1-minute view defines it (per minute and per
+# SERIES_COLUMNS key), so a range reports the same total before and after it
+# is materialized.
+PERIOD_METRICS = {
+    'flow_count': {
+        'series': ['flow', 'flow_by_mac'],
+        'value': 'count',
+        'raw_table': 'network_data_flow',
+        'raw_value': 'COUNT(*)',
+        'raw_where': None,
+    },
+    'usage_bytes': {
+        'series': ['flowstat_usage'],
+        'value': 'usage_bytes',
+        'raw_table': 'network_data_flowstat',
+        # Same as network_data_flowstat_usage_1min (migration 0016)
+        'raw_value': 'COALESCE(SUM(byte_delta), MAX(byte_count) - MIN(byte_count))',
+        'raw_where': 'mac_address IS NOT NULL',
+    },
+}
+
+# Columns each series can be grouped or filtered by (same names in the raw table)
+SERIES_COLUMNS = {
+    'flow': {'classification'},
+    'flow_by_mac': {'src_mac', 'classification'},
+    'flowstat_usage': {'mac_address', 'classification', 'protocol', 'port'},
+}
+
+
+def _rollup_watermarks(tiers):
+    """
+    End of the materialized data in each tier (last bucket + width), or None if empty
+
+    The rollups are materialized-only, so everything at or after the watermark
+    still has to be read from a finer tier or the raw hypertable.
+    """
+    selects = ", ".join(f"(SELECT MAX(bucket) FROM {name})" for _, name in tiers)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {selects};")
+        last_buckets = cursor.fetchone()
+    return [
+        (last + width) if last is not None else None
+        for (width, _), last in zip(tiers, last_buckets)
+    ]
+
+
+def _align_up(moment, width):
+    """First time_bucket boundary of the given width at or after moment"""
+    offset = (moment - BUCKET_ORIGIN) % width
+    return moment if not offset else moment + (width - offset)
+
+
+def _cover_range(start, end, tiers, watermarks):
+    """
+    Split [start, end) into (view name or None for raw, start, end) ranges
+
+    The coarsest tier takes the whole buckets that lie inside the range and
+    below its watermark; the partial buckets before and after them are
+    covered the same way by the finer tiers, and finally by the raw hypertable.
+    end None means up to now.
+    """
+    if start is not None and end is not None and start >= end:
+        return []
+    if not tiers:
+        return [(None, start, end)]
+    (width, name), watermark = tiers[-1], watermarks[-1]
+    finer, finer_watermarks = tiers[:-1], watermarks[:-1]
+    if watermark is None:
+        return _cover_range(start, end, finer, finer_watermarks)
+    first = _align_up(start, width)
+    last = watermark if end is None else min(end - (end - BUCKET_ORIGIN) % width, watermark)
+    if first >= last:
+        return _cover_range(start, end, finer, finer_watermarks)
+    return (
+        _cover_range(start, first, finer, finer_watermarks)
+        + [(name, first, last)]
+        + _cover_range(last, end, finer, finer_watermarks)
+    )
+
+
+def query_period_aggregate(metric, group_by, period, filters=None, order_desc=False,
+                           limit=None, min_total=None, category_names=False,
+                           unknown_category='unallocated'):
+    """
+    Sum a metric over a look-back period, grouped by the given columns
+
+    Reads the whole buckets of the coarsest rollup selected by select_rollup()
+    that lie in the period and below its watermark. The partial coarse bucket
+    at the start of the period and the range after the watermark are read
+    from each finer rollup the same way, and what is left (the real-time tail
+    and any sub-minute head) from the raw hypertable, so results are complete
+    without real-time aggregation on the views.
+
+    Args:
+        metric: Key of PERIOD_METRICS ('flow_count' or 'usage_bytes')
+        group_by: Columns to group by (may be empty for a single total)
+        period: Look-back period, e.g. '30 days'
+        filters: Optional {column: value} equality filters
+        order_desc: Order rows by the total, largest first
+        limit: Optional maximum number of rows
+        min_total: Optional lower bound (exclusive) on the total, e.g. a usage limit
+        category_names: Translate the classification cookie to its category name by
+            joining odl_category_cookie_map, so several cookies with one name are
+            grouped together in the database
+        unknown_category: Name for cookies without a category (None keeps the raw value)
+
+    Returns:
+        List of row tuples: the group_by values (classification translated when
+        category_names is set) followed by the total
+
+    Raises:
+        ValueError: On an unknown metric, unsupported column or invalid period
+    """
+    definition = PERIOD_METRICS[metric]
+    group_by = list(group_by)
+    filters = filters or {}
+    columns = set(group_by) | set(filters)
+    series = next((name for name in definition['series'] if columns <= SERIES_COLUMNS[name]), None)
+    if series is None:
+        raise ValueError(f"Metric {metric} cannot be grouped or filtered by {', '.join(sorted(columns))}")
+
+    span = parse_period(period)
+    view_name = select_rollup(series, span)
+    tiers = ROLLUP_TIERS[series]
+    tiers = tiers[:[name for _, name in tiers].index(view_name) + 1]
+    watermarks = _rollup_watermarks(tiers)
+
+    group_sql = ", ".join(group_by)
+    select_prefix = f"{group_sql}, " if group_by else ""
+    filter_sql = "".join(f" AND {column} = %s" for column in filters)
+    filter_params = list(filters.values())
+
+    raw_key = sorted(SERIES_COLUMNS[series])
+    raw_where = f" AND {definition['raw_where']}" if definition['raw_where'] else ""
+    parts, params = [], []
+    for name, start, end in _cover_range(timezone.now() - span, None, tiers, watermarks):
+        if name is not None:
+            parts.append(
+                f"SELECT {select_prefix}{definition['value']} AS value FROM {name} "
+                f"WHERE bucket >= %s AND bucket < %s{filter_sql}"
+            )
+            params.extend([start, end, *filter_params])
+            continue
+        # Per-minute, per-key values as in the 1-minute view, then summed per group
+        end_sql = " AND timestamp < %s" if end is not None else ""
+        parts.append(
+            f"SELECT {select_prefix}SUM(value) AS value FROM ("
+            f"SELECT {', '.join(raw_key)}, {definition['raw_value']} AS value "
+            f"FROM {definition['raw_table']} "
+            f"WHERE timestamp >= %s{end_sql}{raw_where}{filter_sql} "
+            f"GROUP BY time_bucket('1 minute', timestamp), {', '.join(raw_key)}"
+            f") AS raw_buckets"
+            + (f" GROUP BY {group_sql}" if group_by else "")
+        )
+        params.extend([start, *([end] if end is not None else []), *filter_params])
+
+    outer_columns = []
+    join_sql = ""
+    for column in group_by:
+        if category_names and column == 'classification':
+            fallback = "%s" if unknown_category is not None else "periods.classification"
+            outer_columns.append(f"COALESCE(cookie_map.name, {fallback})")
+            join_sql = " LEFT JOIN odl_category_cookie_map AS cookie_map ON cookie_map.cookie = periods.classification"
+        else:
+            outer_columns.append(f"periods.{column}")
+    # The fallback name is the first placeholder of the query (in the outer SELECT list)
+    if join_sql and unknown_category is not None:
+        params.insert(0, unknown_category)
+
+    outer_prefix = "".join(f"{expression}, " for expression in outer_columns)
+    query = (
+        f"SELECT {outer_prefix}SUM(value) AS total "
+        f"FROM ({' UNION ALL '.join(parts)}) AS periods{join_sql}"
+    )
+    if group_by:
+        query += " GROUP BY " + ", ".join(str(position) for position in range(1, len(group_by) + 1))
+    if min_total is not None:
+        query += " HAVING SUM(value) > %s"
+        params.append(min_total)
+    if order_desc:
+        query += " ORDER BY total DESC NULLS LAST"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(query + ";", params)
+        return cursor.fetchall()
+
 
 def get_hypertable_info():
     """
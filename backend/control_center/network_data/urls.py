@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import aggregate_flows, aggregate_flows_by_mac, log_flow, data_used_per_classification, data_used_per_user, data_used_per_user_per_classification
+from .views import aggregate_flows, aggregate_flows_by_mac, log_flow, data_used_per_classification, data_used_per_user, data_used_per_user_per_classification, export_flow_history
 
 app_name = 'network_data'
 
@@ -14,5 +14,6 @@ urlpatterns = [
     path('network/aggregate-flows/', aggregate_flows, name='aggregate-flows'),
     path('network/aggregate-flows-mac/', aggregate_flows_by_mac, name='aggregate-flows-by-mac'),
     path('network/log-flow-stats/', log_flow, name='log-flow-stats'),
+    path('network/export/', export_flow_history, name='export-flow-history'),
     path('', include(router.urls)),
 ]
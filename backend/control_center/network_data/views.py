@@ -2,7 +2,6 @@ import datetime
 import json
 
 from django.core.exceptions import ValidationError
-from django.db import connection
 from django.http.response import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.response import Response
@@ -16,7 +15,6 @@ import re
 from rest_framework import status
 from django.core.validators import RegexValidator
 
-from odl.models import Category
 from django.utils import timezone as django_timezone
 from django.conf import settings
 
@@ -30,9 +28,39 @@ mac_address_validator = RegexValidator(
     regex=r'^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$',
     message="Enter a valid MAC address in format XX:XX:XX:XX:XX:XX."
 )
-from .tasks import create_flow_stat_entry, create_flow_stat_entries_batch
+from .tasks import create_flow_stat_entry, create_flow_stat_entries_batch, create_flow_stat_entries_columnar
+from . import ingest_buffer
+from .ingestion import validate_columnar_flow_stats
+from .timescaledb_utils import query_period_aggregate
+from .response_cache import cached_aggregate, normalize_mac, normalize_period
+from .export import EXPORT_FORMATS, EXPORT_SPECS, export_rows, stream_async
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
 from django.db.models import Q
 
+def _log_flow_columnar(payload):
+    """
+    Accept a columnar (version 2) flow stat batch: one array per field with
+    epoch-millisecond timestamps, float-second durations and integer cookies.
+    The structure is validated here; values are converted at write time.
+    """
+    try:
+        count = validate_columnar_flow_stats(payload)
+    except ValueError as e:
+        return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        if not ingest_buffer.buffer_columnar_flow_stats(payload, count):
+            create_flow_stat_entries_columnar.delay(payload)
+    except Exception as e:
+        logger.exception(f"Error dispatching columnar flow stat batch: {e}")
+        return Response({"status": "error", "message": "Failed to dispatch flow stat batch."},
+                        status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    return Response({"status": "success", "message": f"Accepted {count} flow stat entries (version 2)."},
+                    status=status.HTTP_202_ACCEPTED)
+
+
 def get_latest_flow_by_mac_port(mac, port):
     """
     Returns the latest Flow record where either:
@@ -53,10 +81,12 @@ def get_latest_flow_by_mac_port(mac, port):
 def log_flow(request):
     if request.method == 'POST':
         stats_data_list = request.data
+        if isinstance(stats_data_list, dict) and 'version' in stats_data_list:
+            return _log_flow_columnar(stats_data_list)
         if not isinstance(stats_data_list, list):
             logger.debug("Received non-list data for log_flow_stats")
             return Response(
-                {"status": "error", "message": "Expected a list of flow stat objects."},
+                {"status": "error", "message": "Expected a list of flow stat objects or a columnar (version 2) batch."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         # print("Received stats_data_list: {}".format(stats_data_list))
@@ -64,8 +94,9 @@ def log_flow(request):
         failed_tasks = 0
 
         try:
-            # Asynchronously call the Celery task for each stat entry
-            create_flow_stat_entries_batch.delay(stats_data_list)
+            # Coalesce with other requests in the ingestion buffer; dispatch directly if it is unavailable
+            if not ingest_buffer.buffer_records(ingest_buffer.FLOWSTAT, stats_data_list):
+                create_flow_stat_entries_batch.delay(stats_data_list)
             successful_tasks += 1
         except Exception as e:  # Catch issues with .delay() itself, though rare
             logger.exception(f"Error dispatching Celery task for stats_data_list: {stats_data_list}, Error: {e}")
@@ -81,6 +112,7 @@ def log_flow(request):
 @api_view(['GET'])
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
+@cached_aggregate('aggregate_flows', {'period': normalize_period})
 def aggregate_flows(request):
     """
     Retrieve aggregated flow data for a specified look-back period.
@@ -109,18 +141,8 @@ def aggregate_flows(request):
                 "where unit is seconds, minutes, hours, or days."
             )
 
-        # Use a raw SQL query to sum counts per classification over the specified period.
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT classification, SUM(count) AS total_count
-                FROM network_data_flow_1min
-                WHERE bucket >= NOW() - %s::interval
-                GROUP BY classification;
-                """,
-                [period]
-            )
-            rows = cursor.fetchall()
+        # Sum counts per classification from the coarsest rollup that resolves the period
+        rows = query_period_aggregate('flow_count', ['classification'], period)
 
         # Convert the results into a dictionary mapping classification -> total count.
         data = {classification: total_count for classification, total_count in rows}
@@ -138,6 +160,7 @@ def aggregate_flows(request):
 @api_view(['GET'])
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
+@cached_aggregate('aggregate_flows_by_mac', {'period': normalize_period, 'mac_address': normalize_mac})
 def aggregate_flows_by_mac(request):
     """
     Retrieve aggregated flow data for a specified look-back period filtered by a MAC address.
@@ -173,19 +196,10 @@ def aggregate_flows_by_mac(request):
         # Validate using the RegexValidator (this will raise a ValidationError if invalid)
         mac_address_validator(mac)
 
-        # Use a parameterized raw SQL query to sum counts per classification for the given MAC address.
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT src_mac, classification, SUM(count) AS total_count
-                FROM network_data_flow_by_mac_1min
-                WHERE bucket >= NOW() - %s::interval
-                  AND src_mac = %s
-                GROUP BY src_mac, classification;
-                """,
-                [period, mac]
-            )
-            rows = cursor.fetchall()
+        # Sum counts per classification for the given MAC address
+        rows = query_period_aggregate(
+            'flow_count', ['src_mac', 'classification'], period, filters={'src_mac': mac}
+        )
 
         # Convert the results into a dictionary mapping classification -> total count.
         data = {classification: total_count for _, classification, total_count in rows}
@@ -205,32 +219,13 @@ def aggregate_flows_by_mac(request):
 
 
 @api_view(['GET'])
+@cached_aggregate('data_used_per_classification', {'period': normalize_period})
 def data_used_per_classification(request):
     """
-    Retrieve the data usage per classification for the specified period.
-    For each unique flow (mac_address, port, protocol, classification), the usage is calculated
-    as (max(bytes) - min(bytes)) over the period.
+    Retrieve the data usage per category name for the specified period.
+    Usage is the sum of the per-interval byte deltas recorded at ingest for each
+    flow (mac_address, port, protocol, classification) over the period.
     """
-    # 1. Fetch Category Mappings
-    # Category.category_cookie is a CharField storing the string representation
-    # of the integer cookie.
-    try:
-        categories = Category.objects.all()
-        category_cookie_to_name_map = {
-            cat.category_cookie: cat.name
-            for cat in categories
-            if cat.category_cookie and cat.name
-        }
-        # print(category_cookie_to_name_map)
-    except Exception as e:
-        logger.exception(f"Error fetching category mappings: {e}")
-        return Response(
-            {
-                "status": "error",
-                "message": "Could not load category mappings.",
-            },
-            status=500,
-        )
     period = request.query_params.get('period', '15 minutes').strip()
     if not ALLOWED_PERIOD_REGEX.match(period):
         return Response(
@@ -238,60 +233,29 @@ def data_used_per_classification(request):
             status=400
         )
 
-
-    # Use the optimized continuous aggregate for better performance
-    query = """
-    SELECT classification, SUM(usage_bytes) AS total_bytes
-    FROM network_data_flowstat_usage_1min
-    WHERE bucket >= NOW() - %s::interval
-    GROUP BY classification;
-    """
-    rows = []
+    # Cookies are translated to category names and summed per name in the database;
+    # cookies without a category are reported as "unallocated"
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT NOW();")
-            db_now = cursor.fetchone()[0]  # Aware, in session's timezone (settings.TIME_ZONE)
-            # print(f"Database NOW(): {db_now.isoformat()}")
-            # print(f"Database NOW() timezone: {db_now.tzinfo}")
-            cursor.execute(query, [period])
-            rows = cursor.fetchall()
+        rows = query_period_aggregate('usage_bytes', ['classification'], period, category_names=True)
     except Exception as e:
-        logger.exception(f"Database query error: {e}")  # Replace with logging
+        logger.exception(f"Database query error: {e}")
         return Response(
             {"status": "error", "message": "Error querying data usage."},
             status=500,
         )
-    # print(rows)
-
-    # 2. Process rows, translate classification cookies, and aggregate
-    data = {}
-    for classification_cookie_val, total_bytes_val in rows:
-        # Ensure total_bytes_val is a number (it could be None if SUM results in NULL)
-        current_bytes = total_bytes_val if total_bytes_val is not None else 0
-
-        classification_name = "unallocated"  # Default value
 
-        if classification_cookie_val is not None:
-            # The classification_cookie_val from the DB is the OVS/ODL cookie
-            classification_cookie_str = str(classification_cookie_val)
-            classification_name = category_cookie_to_name_map.get(
-                classification_cookie_str, "unallocated"
-            )
-
-        # Aggregate bytes for the same classification name
-        data[classification_name] = (
-                data.get(classification_name, 0) + current_bytes
-        )
+    data = {classification_name: total_bytes or 0 for classification_name, total_bytes in rows}
     # print(data)
     return Response(data, status=200)
 
 
 @api_view(['GET'])
+@cached_aggregate('data_used_per_user', {'period': normalize_period})
 def data_used_per_user(request):
     """
     Retrieve the data usage per user (mac_address) for the specified period.
-    For each unique flow, the usage is (max(bytes) - min(bytes)) over the period,
-    then aggregated by the mac_address.
+    Usage is the sum of the per-interval byte deltas recorded at ingest over the
+    period, aggregated by the mac_address.
     """
     period = request.query_params.get('period', '15 minutes').strip()
     if not ALLOWED_PERIOD_REGEX.match(period):
@@ -299,46 +263,19 @@ def data_used_per_user(request):
             {"status": "error", "message": "Invalid period format. Expected '<integer> <unit>'."},
             status=400
         )
-    # Use the optimized continuous aggregate for better performance
-    query = """
-        SELECT mac_address, SUM(usage_bytes) AS total_bytes
-        FROM network_data_flowstat_usage_1min
-        WHERE bucket >= NOW() - %s::interval
-        GROUP BY mac_address;
-        """
-    with connection.cursor() as cursor:
-        cursor.execute(query, [period])
-        rows = cursor.fetchall()
+    rows = query_period_aggregate('usage_bytes', ['mac_address'], period)
     data = {mac: total_bytes for mac, total_bytes in rows}
     return Response(data, status=200)
 
 
 @api_view(['GET'])
+@cached_aggregate('data_used_per_user_per_classification', {'period': normalize_period})
 def data_used_per_user_per_classification(request):
     """
     Retrieve the data usage per user per classification for the specified period.
-    For each unique flow, the usage is (max(bytes) - min(bytes)) over the period,
-    then aggregated by mac_address and classification.
+    Usage is the sum of the per-interval byte deltas recorded at ingest over the
+    period, aggregated by mac_address and classification.
     """
-    # 1. Fetch Category Mappings
-    # Category.category_cookie is a CharField storing the string representation
-    # of the integer cookie.
-    try:
-        categories = Category.objects.all()
-        category_cookie_to_name_map = {
-            cat.category_cookie: cat.name
-            for cat in categories
-            if cat.category_cookie and cat.name
-        }
-    except Exception as e:
-        logger.exception(f"Error fetching category mappings: {e}")
-        return Response(
-            {
-                "status": "error",
-                "message": "Could not load category mappings.",
-            },
-            status=500,
-        )
     period = request.query_params.get('period', '15 minutes').strip()
     if not ALLOWED_PERIOD_REGEX.match(period):
         return Response(
@@ -346,30 +283,86 @@ def data_used_per_user_per_classification(request):
             status=400
         )
 
+    # Cookies are translated to category names and summed per (mac, name) in the database
+    rows = query_period_aggregate(
+        'usage_bytes', ['mac_address', 'classification'], period, category_names=True
+    )
+    data = {}
+    for mac, classification_name, total_bytes in rows:
+        data.setdefault(mac, {})[classification_name] = total_bytes
+    return Response(data, status=200)
+
+
+def _parse_export_time(value, default):
+    """Parse an ISO 8601 datetime query param (naive values use the server time zone)"""
+    if not value:
+        return default
+    # A '+' in a UTC offset arrives as a space when the query string is not encoded
+    parsed = parse_datetime(re.sub(r' (\d{2}:?\d{2})$', r'+\1', value.strip()))
+    if parsed is None:
+        raise ValidationError(f"Invalid datetime: {value}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
 
 
-    # Use the optimized continuous aggregate for better performance
-    query = """
-    SELECT mac_address, classification, SUM(usage_bytes) AS total_bytes
-    FROM network_data_flowstat_usage_1min
-    WHERE bucket >= NOW() - %s::interval
-    GROUP BY mac_address, classification;
+@api_view(['GET'])
+@authentication_classes([TokenAuthentication])
+@permission_classes([IsAuthenticated])
+def export_flow_history(request):
     """
-    with connection.cursor() as cursor:
-        cursor.execute(query, [period])
-        rows = cursor.fetchall()
-    # 2. Process rows and translate classification cookies
-    data = {}
-    for mac, classification_cookie_val, total_bytes in rows:
-        classification_name = "unallocated"
-        if classification_cookie_val is not None:
-            # The classification_cookie_val from the DB is an OVS/ODL cookie
-            classification_cookie_str = str(classification_cookie_val)
-            classification_name = category_cookie_to_name_map.get(
-                classification_cookie_str, "unallocated"
-            )
+    Stream raw Flow or FlowStat rows for a time range.
 
-        if mac not in data:
-            data[mac] = {}
-        data[mac][classification_name] = total_bytes
-    return Response(data, status=200)
\ No newline at end of file
+    Query Parameters:
+        kind (optional): 'flowstat' (default) or 'flow'.
+        output (optional): 'ndjson' (default), 'csv' or 'parquet'. ('format' is
+            reserved by DRF for renderer selection.)
+        start (optional): ISO 8601 start, inclusive. Defaults to 24 hours before end.
+        end (optional): ISO 8601 end, exclusive. Defaults to now.
+        after_timestamp, after_id (optional): Resume after the last exported row.
+        mac_address / src_mac, classification (optional): Equality filters.
+
+    Rows are streamed in (timestamp, id) order using keyset pagination, so
+    memory use stays constant regardless of the range.
+    """
+    try:
+        kind = request.query_params.get('kind', 'flowstat')
+        fmt = request.query_params.get('output', 'ndjson')
+        if kind not in EXPORT_SPECS:
+            raise ValidationError(f"Invalid kind. Expected one of: {', '.join(EXPORT_SPECS)}.")
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError(f"Invalid output. Expected one of: {', '.join(EXPORT_FORMATS)}.")
+
+        end = _parse_export_time(request.query_params.get('end'), timezone.now())
+        start = _parse_export_time(request.query_params.get('start'), end - datetime.timedelta(hours=24))
+        if start >= end:
+            raise ValidationError("'start' must be before 'end'.")
+
+        after = None
+        if request.query_params.get('after_timestamp') or request.query_params.get('after_id'):
+            try:
+                after = (
+                    _parse_export_time(request.query_params.get('after_timestamp'), None),
+                    int(request.query_params.get('after_id')),
+                )
+            except (TypeError, ValueError):
+                raise ValidationError("'after_timestamp' and 'after_id' must be given together.")
+            if after[0] is None:
+                raise ValidationError("'after_timestamp' and 'after_id' must be given together.")
+
+        filters = {
+            column: request.query_params.get(column)
+            for column in EXPORT_SPECS[kind]['filters']
+        }
+        chunks = export_rows(kind, fmt, start, end, filters=filters, after=after)
+    except ValidationError as ve:
+        return Response({"status": "error", "message": ve.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+    except ValueError as e:
+        return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    content_type, extension = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(stream_async(chunks), content_type=content_type)
+    response['Content-Disposition'] = (
+        f'attachment; filename="{kind}-{start:%Y%m%dT%H%M%S}-{end:%Y%m%dT%H%M%S}.{extension}"'
+    )
+    return response
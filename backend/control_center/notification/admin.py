@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notifier, Notification, NetworkSummaryNotification, DataUsageNotification, ApplicationUsageNotification
+from .models import Notifier, Notification, NotificationReadState, NotificationReadMarker, NetworkSummaryNotification, DataUsageNotification, ApplicationUsageNotification
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
@@ -7,6 +7,17 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ('user__username', 'message')
     list_filter = ('type', 'urgency', 'is_read', 'created_at')
 
+@admin.register(NotificationReadState)
+class NotificationReadStateAdmin(admin.ModelAdmin):
+    list_display = ('notification', 'user', 'is_read', 'updated_at')
+    search_fields = ('user__username',)
+    list_filter = ('is_read',)
+
+@admin.register(NotificationReadMarker)
+class NotificationReadMarkerAdmin(admin.ModelAdmin):
+    list_display = ('user', 'broadcasts_read_until')
+    search_fields = ('user__username',)
+
 @admin.register(Notifier)
 class NotifierAdmin(admin.ModelAdmin):
     list_display = ('user', 'phone_number', 'chat_id', 'telegram_api_key')
@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models import Case, Exists, OuterRef, Q, Subquery, Value, When
 from django.conf import settings
+from django.utils import timezone
 from django_celery_beat.models import PeriodicTask, PeriodicTasks, IntervalSchedule
 import json
 
@@ -12,11 +14,54 @@ class Notifier(models.Model):
     def __str__(self):
         return f"Notifier for {self.user.username} ({self.phone_number})"
 
+class NotificationQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """
+        Notifications visible to a user: their own plus broadcasts created
+        since they joined, annotated with the user's read state as `read_by_user`
+        """
+        read_states = NotificationReadState.objects.filter(notification=OuterRef('pk'), user=user)
+        read_until = NotificationReadMarker.objects.filter(user=user).values('broadcasts_read_until')[:1]
+        return self.filter(
+            Q(user=user) | Q(user__isnull=True, created_at__gte=user.date_joined)
+        ).annotate(
+            read_by_user=Case(
+                When(user__isnull=False, then='is_read'),
+                When(Exists(read_states.filter(is_read=True)), then=Value(True)),
+                When(Exists(read_states.filter(is_read=False)), then=Value(False)),
+                When(created_at__lte=Subquery(read_until), then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            )
+        )
+
+    def mark_all_read(self, user):
+        """
+        Mark every notification visible to the user as read
+
+        Broadcasts are covered by moving the user's read marker, so this costs
+        one row whatever the number of broadcasts.
+
+        Returns:
+            int: Number of notifications that were unread
+        """
+        now = timezone.now()
+        updated = self.filter(user=user, is_read=False).update(is_read=True)
+        unread_broadcasts = self.for_user(user).filter(user__isnull=True, read_by_user=False).count()
+        NotificationReadState.objects.filter(user=user, is_read=False).update(is_read=True)
+        NotificationReadMarker.objects.update_or_create(user=user, defaults={'broadcasts_read_until': now})
+        return updated + unread_broadcasts
+
+
 class Notification(models.Model):
+    # A notification without a user is a broadcast to all users; per-user read
+    # state of broadcasts lives in NotificationReadState / NotificationReadMarker
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
-        related_name="notifications"
+        related_name="notifications",
+        blank=True,
+        null=True
     )
     message = models.TextField()
     is_read = models.BooleanField(default=False, db_index=True)
@@ -37,6 +82,8 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     notifier = models.ForeignKey(Notifier, on_delete=models.CASCADE, blank=True, null=True)
 
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
@@ -44,11 +91,56 @@ class Notification(models.Model):
             models.Index(fields=["user", "-created_at"], name="notif_user_created_idx"),
             # Composite index for filtering by user, read status, and ordering
             models.Index(fields=["user", "is_read", "-created_at"], name="notif_user_read_created_idx"),
+            # Broadcasts ordered by created_at
+            models.Index(fields=["-created_at"], condition=Q(user__isnull=True), name="notif_broadcast_created_idx"),
         ]
 
     def __str__(self):
+        if self.user_id is None:
+            return f"Broadcast notification: {self.message[:20]}"
         return f"Notification for {self.user.username}: {self.message[:20]}"
 
+    @property
+    def is_broadcast(self):
+        return self.user_id is None
+
+    def set_read(self, user, read=True):
+        """Set the read state of this notification for a user"""
+        if not self.is_broadcast:
+            self.is_read = read
+            self.save(update_fields=["is_read"])
+        else:
+            NotificationReadState.objects.update_or_create(notification=self, user=user, defaults={"is_read": read})
+
+
+class NotificationReadState(models.Model):
+    """
+    Read state of one broadcast notification for one user, created the first
+    time the user changes it; it overrides the user's NotificationReadMarker
+    """
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name="read_states")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notification_read_states")
+    is_read = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["notification", "user"], name="notif_read_state_unique"),
+        ]
+
+    def __str__(self):
+        state = "read" if self.is_read else "unread"
+        return f"Notification {self.notification_id} {state} for {self.user.username}"
+
+
+class NotificationReadMarker(models.Model):
+    """Broadcasts created up to broadcasts_read_until count as read for the user ("mark all read")"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notification_read_marker")
+    broadcasts_read_until = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user.username} read broadcasts until {self.broadcasts_read_until}"
+
 
 class NetworkSummaryNotification(models.Model):
     FREQUENCY_CHOICES = [
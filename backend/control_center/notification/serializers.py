@@ -17,6 +17,24 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'message', 'is_read', 'created_at', 'notifier', 'notifier_chat_id']
         read_only_fields = ['id', 'created_at']
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Broadcasts share one row across users; report the requesting user's read state
+        if hasattr(instance, 'read_by_user'):
+            data['is_read'] = instance.read_by_user
+        return data
+
+    def update(self, instance, validated_data):
+        request = self.context.get("request")
+        if 'is_read' in validated_data:
+            is_read = validated_data.pop('is_read')
+            instance.set_read(request.user, is_read)
+            instance.read_by_user = is_read
+        if instance.is_broadcast:
+            # Only the read state of a broadcast is per user
+            return instance
+        return super().update(instance, validated_data)
+
 
 class NetworkSummaryNotificationSerializer(serializers.ModelSerializer):
     class Meta:
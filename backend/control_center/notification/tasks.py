@@ -5,8 +5,8 @@ from .models import Notifier, Notification, NetworkSummaryNotification, DataUsag
 from account.models import UserProfile
 from celery import shared_task
 import requests
-from django.db import connection
-from django.apps import apps
+from network_data.timescaledb_utils import query_period_aggregate
+from odl.cookie_registry import category_name_for_cookie
 import logging
 
 User = get_user_model()
@@ -103,24 +103,10 @@ def monitor_telegram_registration(user_id, unique_token):
 
 def get_top_users(n, period):
     """
-    Retrieve top `n` users by data usage within the last `period` using the difference
-    between the latest and earliest bytes for each unique flow.
+    Retrieve top `n` users by data usage within the last `period` as the sum of
+    the per-interval byte deltas recorded at ingest.
     """
-    query = """
-        SELECT mac_address, SUM(max_bytes - min_bytes) AS total_bytes
-        FROM (
-          SELECT mac_address, MAX(byte_count) AS max_bytes, MIN(byte_count) AS min_bytes
-          FROM network_data_flowstat
-          WHERE timestamp >= NOW() - %s::interval
-          GROUP BY mac_address, port, protocol, classification
-        ) AS sub
-        GROUP BY mac_address
-        ORDER BY total_bytes DESC
-        LIMIT %s;
-        """
-    with connection.cursor() as cursor:
-        cursor.execute(query, [period, n])
-        rows = cursor.fetchall()
+    rows = query_period_aggregate('usage_bytes', ['mac_address'], period, order_desc=True, limit=n)
 
     return [
         {"mac_address": mac, "total_mb": format_megabytes(total_bytes)}
@@ -131,8 +117,7 @@ def get_top_users(n, period):
 def get_category_name_from_cookie(cookie):
     """Return the category name for a given cookie, or the cookie itself if not found."""
     try:
-        Category = apps.get_model('odl', 'Category')
-        return Category.objects.get(category_cookie=str(cookie)).name
+        return category_name_for_cookie(cookie, default=str(cookie))
     except Exception:
         return str(cookie)
 
@@ -140,43 +125,22 @@ def get_category_name_from_cookie(cookie):
 def get_top_classes(n, period):
     """
     Retrieve top `n` application classifications by data usage within the last `period`
-    using the difference between the latest and earliest bytes for each unique flow.
+    as the sum of the per-interval byte deltas recorded at ingest.
     """
-    query = """
-    SELECT classification, SUM(max_bytes - min_bytes) AS total_bytes
-    FROM (
-      SELECT classification, MAX(byte_count) AS max_bytes, MIN(byte_count) AS min_bytes
-      FROM network_data_flowstat
-      WHERE timestamp >= NOW() - %s::interval
-      GROUP BY mac_address, port, protocol, classification
-    ) AS sub
-    GROUP BY classification
-    ORDER BY total_bytes DESC
-    LIMIT %s;
-    """
-    with connection.cursor() as cursor:
-        cursor.execute(query, [period, n])
-        rows = cursor.fetchall()
+    rows = query_period_aggregate(
+        'usage_bytes', ['classification'], period, order_desc=True, limit=n,
+        category_names=True, unknown_category=None
+    )
 
     return [
-        {"classification": get_category_name_from_cookie(classification), "total_mb": format_megabytes(total_bytes)}
+        {"classification": classification, "total_mb": format_megabytes(total_bytes)}
         for classification, total_bytes in rows
     ]
 
 
 def get_top_flows(n=5, period="1 minute"):
     """Retrieve top `n` most frequent flows from aggregate_flows within the last `period`."""
-    query = """
-    SELECT classification, SUM(count) AS total_count
-    FROM network_data_flow_1min
-    WHERE bucket >= NOW() - %s::interval
-    GROUP BY classification
-    ORDER BY total_count DESC
-    LIMIT %s;
-    """
-    with connection.cursor() as cursor:
-        cursor.execute(query, [period, n])
-        rows = cursor.fetchall()
+    rows = query_period_aggregate('flow_count', ['classification'], period, order_desc=True, limit=n)
 
     return [
         {"classification": classification, "total_count": total_count}
@@ -247,25 +211,12 @@ def send_network_summary(notification_id):
 def get_users_exceeding_limit(limit_mb, period):
     """
     Fetch users who have exceeded the data limit within the given time period,
-    where usage is calculated as the sum of (latest bytes - earliest bytes)
-    for each unique flow.
+    where usage is calculated as the sum of the per-interval byte deltas
+    recorded at ingest.
     """
-
-    query = """
-        SELECT mac_address, SUM(max_bytes - min_bytes) AS total_bytes
-        FROM (
-          SELECT mac_address, MAX(byte_count) AS max_bytes, MIN(byte_count) AS min_bytes
-          FROM network_data_flowstat
-          WHERE timestamp >= NOW() - %s::interval
-          GROUP BY mac_address, port, protocol, classification
-        ) AS sub
-        GROUP BY mac_address
-        HAVING SUM(max_bytes - min_bytes) > %s * 1024 * 1024
-        ORDER BY total_bytes DESC;
-        """
-    with connection.cursor() as cursor:
-        cursor.execute(query, [period, limit_mb])
-        rows = cursor.fetchall()
+    rows = query_period_aggregate(
+        'usage_bytes', ['mac_address'], period, order_desc=True, min_total=limit_mb * 1024 * 1024
+    )
     return [
         {"mac_address": mac, "total_mb": format_megabytes(total_bytes)}
         for mac, total_bytes in rows
@@ -328,7 +279,7 @@ def check_data_usage(notification_id):
 def check_application_usage(notification_id):
     """
     Checks if any applications have exceeded the data limit and sends an alert via Telegram.
-    Usage is calculated as the sum of (latest bytes - earliest bytes) for each unique flow
+    Usage is calculated as the sum of the per-interval byte deltas recorded at ingest,
     grouped by classification.
     """
     try:
@@ -342,24 +293,14 @@ def check_application_usage(notification_id):
         # Convert frequency into a valid PostgreSQL interval format
         period = f"{notification.frequency} minutes" if notification.frequency < 60 else f"{notification.frequency // 60} hours"
 
-        query = """
-            SELECT classification, SUM(max_bytes - min_bytes) AS total_bytes
-            FROM (
-              SELECT classification, MAX(byte_count) AS max_bytes, MIN(byte_count) AS min_bytes
-              FROM network_data_flowstat
-              WHERE timestamp >= NOW() - %s::interval
-              GROUP BY mac_address, port, protocol, classification
-            ) AS sub
-            GROUP BY classification
-            HAVING SUM(max_bytes - min_bytes) > %s * 1024 * 1024
-            ORDER BY total_bytes DESC;
-            """
-        with connection.cursor() as cursor:
-            cursor.execute(query, [period, notification.data_limit_mb])
-            rows = cursor.fetchall()
+        rows = query_period_aggregate(
+            'usage_bytes', ['classification'], period, order_desc=True,
+            min_total=notification.data_limit_mb * 1024 * 1024,
+            category_names=True, unknown_category=None
+        )
 
         exceeded_apps = [
-            {"classification": get_category_name_from_cookie(classification), "total_mb": format_megabytes(total_bytes)}
+            {"classification": classification, "total_mb": format_megabytes(total_bytes)}
             for classification, total_bytes in rows
         ]
 
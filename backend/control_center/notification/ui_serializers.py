@@ -26,6 +26,24 @@ class NetworkNotificationUISerializer(serializers.ModelSerializer):
         except Exception:
             return None
     
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Broadcasts share one row across users; report the requesting user's read state
+        if hasattr(instance, 'read_by_user'):
+            data['read'] = instance.read_by_user
+        return data
+
+    def update(self, instance, validated_data):
+        request = self.context.get("request")
+        if 'is_read' in validated_data:
+            is_read = validated_data.pop('is_read')
+            instance.set_read(request.user, is_read)
+            instance.read_by_user = is_read
+        if instance.is_broadcast:
+            # Only the read state of a broadcast is per user
+            return instance
+        return super().update(instance, validated_data)
+
     def create(self, validated_data):
         # Automatically set the user from the request context
         request = self.context.get("request")
@@ -1,5 +1,6 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
@@ -21,25 +22,31 @@ class NetworkNotificationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """
-        Filter notifications to current user only, ordered by newest first.
+        Filter notifications to current user (own and broadcast), ordered by newest first.
         Supports optional 'read' query parameter to filter by read status.
         """
-        qs = Notification.objects.filter(user=self.request.user).order_by("-created_at")
+        qs = Notification.objects.for_user(self.request.user).select_related("user").order_by("-created_at")
         read = self.request.query_params.get("read")
         if read is not None:
             if read.lower() == "true":
-                qs = qs.filter(is_read=True)
+                qs = qs.filter(read_by_user=True)
             elif read.lower() == "false":
-                qs = qs.filter(is_read=False)
+                qs = qs.filter(read_by_user=False)
         return qs
 
+    def perform_destroy(self, instance):
+        # Broadcasts are shared by all users
+        if instance.is_broadcast:
+            raise PermissionDenied("Broadcast notifications cannot be deleted; mark them as read instead.")
+        instance.delete()
+
     @action(detail=False, methods=["post"], url_path="read/all")
     def mark_all_read(self, request):
         """
         Custom action to mark all unread notifications as read.
         Endpoint: POST /network-notifications/read/all/
         """
-        updated = Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        updated = Notification.objects.mark_all_read(request.user)
         return Response({"updated": updated}, status=status.HTTP_200_OK)
 
 
@@ -5,6 +5,7 @@ import logging
 import requests
 from django.conf import settings
 from rest_framework import viewsets, status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
@@ -17,13 +18,19 @@ logger = logging.getLogger(__name__)
 class NotificationViewSet(viewsets.ModelViewSet):
     """
     API endpoint that allows notifications to be viewed or edited.
-    Returns notifications only for the authenticated user.
+    Returns notifications only for the authenticated user (own and broadcast).
     """
     serializer_class = NotificationSerializer
 
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return Notification.objects.for_user(self.request.user)
+
+    def perform_destroy(self, instance):
+        # Broadcasts are shared by all users
+        if instance.is_broadcast:
+            raise PermissionDenied("Broadcast notifications cannot be deleted; mark them as read instead.")
+        instance.delete()
 
 
 class TelegramTestView(APIView):
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OdlConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'odl'
+
+    def ready(self):
+        import odl.signals
@@ -0,0 +1,70 @@
+# File: cookie_registry.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Process-level registry mapping category cookies to category names.
+
+Flow stats and flows store the OpenFlow cookie of their category as the
+classification. The registry loads the cookie -> name map once per process
+and serves lookups from memory. Category post_save/post_delete signals
+invalidate it in every web and Celery process (see
+utils.process_cache.InvalidatingProcessCache).
+
+For SQL, the odl_category_cookie_map view exposes the same (cookie, name)
+pairs for joins.
+"""
+
+from typing import Dict, Optional
+
+from utils.process_cache import InvalidatingProcessCache
+
+INVALIDATION_CHANNEL = "category_cookie_map:invalidate"
+# SQL view with one (cookie, name) row per category that has a cookie
+COOKIE_MAP_VIEW = "odl_category_cookie_map"
+
+
+def _load_cookie_map() -> Dict[str, str]:
+    from .models import Category
+    return {
+        cookie: name
+        for cookie, name in Category.objects.filter(category_cookie__isnull=False)
+        .values_list('category_cookie', 'name')
+        if name
+    }
+
+
+class CookieRegistry(InvalidatingProcessCache[str, str]):
+    """Cookie -> category name map shared by everything in the process"""
+
+    def __init__(self):
+        super().__init__(_load_cookie_map, INVALIDATION_CHANNEL, name="category-cookie-registry")
+
+    def name_for(self, cookie, default: Optional[str] = None) -> Optional[str]:
+        """Category name for a cookie (int or str), or default if unknown"""
+        if cookie is None:
+            return default
+        return self.get_map().get(str(cookie), default)
+
+
+cookie_registry = CookieRegistry()
+
+
+def category_name_for_cookie(cookie, default: Optional[str] = None) -> Optional[str]:
+    """Shortcut for cookie_registry.name_for"""
+    return cookie_registry.name_for(cookie, default)
@@ -0,0 +1,40 @@
+# File: migrations/0006_category_cookie_map_view.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('odl', '0005_alter_category_name_alter_category_unique_together_and_more'),
+    ]
+
+    operations = [
+        # Cookie -> category name mapping for SQL joins against flow classifications.
+        # category_cookie is unique, so each cookie maps to exactly one name.
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE VIEW odl_category_cookie_map AS
+                SELECT category_cookie AS cookie, name
+                FROM odl_category
+                WHERE category_cookie IS NOT NULL;
+            """,
+            reverse_sql="DROP VIEW IF EXISTS odl_category_cookie_map;"
+        ),
+    ]
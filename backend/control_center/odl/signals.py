@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cookie_registry import cookie_registry
+from .models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cookie_map(sender, instance, **kwargs):
+    # Reload the cookie -> name map in every process once the change is committed
+    from django.db import transaction
+    transaction.on_commit(cookie_registry.broadcast_invalidation)
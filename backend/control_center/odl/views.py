@@ -54,6 +54,7 @@ from .odl_flow_utils import OdlMeterFlowRule
 from .models import OdlMeter
 from general.models import Controller as GeneralController
 from network_data.tasks import create_flow_entries_batch
+from network_data.ingest_buffer import FLOW, buffer_records, stamp_flow_records
 
 logger = logging.getLogger(__name__)
 
@@ -603,8 +604,10 @@ def odl_classify_and_apply_policy(request):
                 results.append({"status": "error", "message": f"An internal error occurred: {str(e)}"})
         # After the loop, batch log the flow entries
         if flow_entries_to_log:
-            logger.debug(f"[ODL_CLASSIFY_AND_APPLY_POLICY] Batching {len(flow_entries_to_log)} flow entries")
-            create_flow_entries_batch.delay(flow_entries_to_log)
+            logger.debug(f"[ODL_CLASSIFY_AND_APPLY_POLICY] Buffering {len(flow_entries_to_log)} flow entries")
+            stamp_flow_records(flow_entries_to_log)
+            if not buffer_records(FLOW, flow_entries_to_log):
+                create_flow_entries_batch.delay(flow_entries_to_log)
         # Return a list if input was a list, or a single result if input was a dict
         if single_input:
             return Response(results[0], status=status.HTTP_200_OK if results[0].get('status') == 'success' else 400)
@@ -896,7 +899,9 @@ class ModelManagementView(APIView):
             return Response({
                 'status': 'success',
                 'models': models_info,
-                'active_model': model_manager.active_model
+                'active_model': model_manager.active_model,
+                'model_cache': model_manager.get_cache_stats(),
+                'last_swap': state_manager.get_last_swap()
             })
         except Exception as e:
             logger.error(f"Error listing models: {e}")
@@ -917,17 +922,21 @@ class ModelManagementView(APIView):
                     'message': 'model_name is required'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            success = model_manager.set_active_model(model_name)
-            if success:
+            # The swap completes in the background; poll GET for last_swap
+            swap_id = model_manager.start_model_swap(model_name)
+            if swap_id:
                 return Response({
-                    'status': 'success',
-                    'message': f'Active model set to: {model_name}',
+                    'status': 'accepted',
+                    'message': f'Swap to {model_name} started; poll GET for last_swap with this swap_id',
+                    'swap_id': swap_id,
                     'active_model': model_manager.active_model
-                })
+                }, status=status.HTTP_202_ACCEPTED)
             else:
                 return Response({
                     'status': 'error',
-                    'message': f'Failed to set active model: {model_name}'
+                    'message': f'Failed to set active model: {model_name}',
+                    'active_model': model_manager.active_model,
+                    'last_swap': state_manager.get_last_swap()
                 }, status=status.HTTP_400_BAD_REQUEST)
                 
         except Exception as e:
@@ -959,12 +968,13 @@ class ModelLoadView(APIView):
             if success:
                 return Response({
                     'status': 'success',
-                    'message': f'Model loaded: {model_name}'
+                    'message': f'Model loaded: {model_name}',
+                    'model_cache': model_manager.get_cache_stats()
                 })
             else:
                 return Response({
                     'status': 'error',
-                    'message': f'Failed to load model: {model_name}'
+                    'message': f'Failed to load model: {model_name} (missing file, unsupported type or model cache budget exceeded)'
                 }, status=status.HTTP_400_BAD_REQUEST)
                 
         except Exception as e:
@@ -1043,4 +1053,82 @@ class ModelInfoView(APIView):
             return Response({
                 'status': 'error',
                 'message': f'Error getting model information: {str(e)}'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class ShadowModelView(APIView):
+    """
+    API endpoints for shadow-model evaluation
+    """
+    
+    def get(self, request):
+        """
+        Get shadow evaluation stats (agreement rate, confusion, latency)
+        """
+        try:
+            model_name = request.query_params.get('model_name')
+            return Response({
+                'status': 'success',
+                'shadow_model': state_manager.get_shadow_model(),
+                'active_model': model_manager.active_model,
+                'stats': model_manager.get_shadow_stats(model_name)
+            })
+        except Exception as e:
+            logger.error(f"Error getting shadow evaluation stats: {e}")
+            return Response({
+                'status': 'error',
+                'message': f'Error getting shadow evaluation stats: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def post(self, request):
+        """
+        Start running a candidate model in shadow mode
+        """
+        try:
+            model_name = request.data.get('model_name')
+            if not model_name:
+                return Response({
+                    'status': 'error',
+                    'message': 'model_name is required'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            reset_stats = str(request.data.get('reset_stats', True)).lower() not in ('false', '0')
+            success = model_manager.set_shadow_model(model_name, reset_stats=reset_stats)
+            if success:
+                return Response({
+                    'status': 'success',
+                    'message': f'Shadow model set to: {model_name}',
+                    'shadow_model': model_name
+                })
+            else:
+                return Response({
+                    'status': 'error',
+                    'message': f'Failed to set shadow model: {model_name}'
+                }, status=status.HTTP_400_BAD_REQUEST)
+                
+        except Exception as e:
+            logger.error(f"Error setting shadow model: {e}")
+            return Response({
+                'status': 'error',
+                'message': f'Error setting shadow model: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def delete(self, request):
+        """
+        Stop shadow evaluation
+        """
+        try:
+            if model_manager.clear_shadow_model():
+                return Response({
+                    'status': 'success',
+                    'message': 'Shadow evaluation stopped'
+                })
+            return Response({
+                'status': 'error',
+                'message': 'Failed to stop shadow evaluation'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except Exception as e:
+            logger.error(f"Error clearing shadow model: {e}")
+            return Response({
+                'status': 'error',
+                'message': f'Error clearing shadow model: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,134 @@
+# File: process_cache.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Process-level lookup map with cross-process invalidation over Redis pub/sub.
+
+The map is loaded once per process by a loader function and served from
+memory. invalidate() drops it in this process; broadcast_invalidation() also
+publishes on the cache's channel, and a listener thread in every other web
+and Celery process drops its copy, so each reloads on its next lookup. The
+map is also reloaded after max_age seconds in case an invalidation was
+missed (e.g. queryset.update() does not send signals).
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+# Safety-net reload interval (seconds)
+DEFAULT_MAX_AGE = 300
+
+
+class InvalidatingProcessCache(Generic[K, V]):
+    """Map loaded by `loader`, shared by everything in the process and invalidated via `channel`"""
+
+    def __init__(self, loader: Callable[[], Dict[K, V]], channel: str, name: str,
+                 max_age: float = DEFAULT_MAX_AGE):
+        """
+        Args:
+            loader: Builds the full map (typically one query)
+            channel: Redis pub/sub channel carrying invalidations
+            name: Listener thread and Redis client name
+            max_age: Seconds after which the map is reloaded regardless
+        """
+        self._loader = loader
+        self.channel = channel
+        self.name = name
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._map: Optional[Dict[K, V]] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._listener: Optional[threading.Thread] = None
+        self._listener_pid = None
+        self._redis: Optional[redis.Redis] = None
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=getattr(settings, 'CHANNEL_REDIS_HOST', 'redis'),
+                port=getattr(settings, 'CHANNEL_REDIS_PORT', 6379),
+                decode_responses=True,
+                socket_connect_timeout=1.0,
+                client_name=self.name
+            )
+        return self._redis
+
+    def _ensure_listener(self):
+        """Start the invalidation listener once per process (after any fork)"""
+        if self._listener is not None and self._listener.is_alive() and self._listener_pid == os.getpid():
+            return
+        self._redis = None  # Connections are not shared across forks
+        self._listener_pid = os.getpid()
+        self._listener = threading.Thread(target=self._listen, name=self.name, daemon=True)
+        self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Anything published while we were not subscribed may have been missed
+                self.invalidate()
+                for _ in pubsub.listen():
+                    self.invalidate()
+            except redis.exceptions.RedisError as e:
+                logger.warning(f"{self.name} listener disconnected: {e}")
+                time.sleep(5)
+
+    def get_map(self) -> Dict[K, V]:
+        """Current map (loaded on first use or after invalidation)"""
+        self._ensure_listener()
+        current = self._map
+        if current is not None and time.monotonic() - self._loaded_at < self.max_age:
+            return current
+        with self._lock:
+            if self._map is not None and time.monotonic() - self._loaded_at < self.max_age:
+                return self._map
+            generation = self._generation
+            loaded = self._loader()
+            # Keep the map only if no invalidation arrived while it was loading
+            if generation == self._generation:
+                self._map = loaded
+                self._loaded_at = time.monotonic()
+            return loaded
+
+    def invalidate(self):
+        """Drop the map in this process; the next lookup reloads it"""
+        self._generation += 1
+        self._map = None
+
+    def broadcast_invalidation(self):
+        """Invalidate this process and tell every other process to reload"""
+        self.invalidate()
+        try:
+            self._get_redis().publish(self.channel, "1")
+        except redis.exceptions.RedisError:
+            logger.exception(f"Could not broadcast {self.name} invalidation")
@@ -0,0 +1,299 @@
+# File: stream_buffer.py
+# Copyright (C) 2025 Taurine Technology
+#
+# This file is part of the SDN Launch Control project.
+#
+# This project is licensed under the GNU General Public License v3.0 (GPL-3.0),
+# available at: https://www.gnu.org/licenses/gpl-3.0.en.html#license-text
+#
+# Contributions to this project are governed by a Contributor License Agreement (CLA).
+# By submitting a contribution, contributors grant Taurine Technology exclusive rights to
+# the contribution, including the right to relicense it under a different license
+# at the copyright owner's discretion.
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under this license is provided "AS IS", WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the GNU General Public License for more details.
+#
+# For inquiries, contact Keegan White at keeganwhite@taurinetech.com.
+
+"""
+Redis stream write buffer shared by the flow ingestion buffer
+(network_data.ingest_buffer) and the device/port stats buffer
+(device_monitoring.stats_buffer).
+
+Producers append entries to one stream per kind and keep a per-kind count of
+buffered records. A flush drains the stream through a consumer group and
+writes the entries it read in one database transaction. Only entries whose
+rows were written are acknowledged.
+
+When a write fails, the batch is bisected until the failing entries are
+isolated, and every other entry is written. A failing entry stays pending and
+is retried when it is reclaimed (after RECLAIM_IDLE_MS). Once it has been
+delivered MAX_DELIVERIES times it is moved to a dead-letter stream
+("<stream>:dead") with its last error. Connection-level database errors
+(the database is down) stop the flush and leave everything pending, so an
+outage does not dead-letter good entries.
+
+Streams are never trimmed: callers bound memory by checking pending()
+before appending and writing directly (or dropping and counting) when the
+buffer is full.
+"""
+
+import logging
+import os
+import socket
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import redis
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, transaction
+
+logger = logging.getLogger(__name__)
+
+# Stream entries read per XREADGROUP call while draining
+READ_COUNT = 500
+# Entries pending longer than this (ms) belong to a dead consumer or failed a write, and are reclaimed
+RECLAIM_IDLE_MS = 60000
+# Deliveries after which an entry that still fails to write is dead-lettered
+MAX_DELIVERIES = 5
+# Approximate cap on dead-letter stream entries
+DEAD_LETTER_MAX_ENTRIES = 10000
+
+# Reset the pending count only if the stream is still empty, atomically with
+# respect to an append's XADD + INCRBY transaction
+_RESET_IF_EMPTY_SCRIPT = """
+if redis.call('XLEN', KEYS[1]) == 0 then
+    redis.call('SET', KEYS[2], 0)
+    return 1
+end
+return 0
+"""
+
+# decode(fields) -> (payload, record count); raises KeyError/ValueError for malformed entries
+Decoder = Callable[[Dict[str, str]], Tuple[Any, int]]
+# write(payloads) -> summary dict (created, errors, ...); raises if the rows could not be written
+Writer = Callable[[List[Any]], Dict[str, Any]]
+
+
+class StreamBuffer:
+    """Per-kind Redis streams with a consumer group, record counters and dead-lettering"""
+
+    def __init__(self, streams: Dict[str, str], consumer_group: str, client_name: str):
+        """
+        Args:
+            streams: Stream key per kind
+            consumer_group: Consumer group of the flush workers
+            client_name: Redis client name of the shared connection
+        """
+        self.streams = streams
+        self.consumer_group = consumer_group
+        self.client_name = client_name
+        self._redis_client: Optional[redis.Redis] = None
+        self._reset_if_empty = None
+
+    def get_redis(self) -> redis.Redis:
+        """Shared Redis connection for this buffer"""
+        if self._redis_client is None:
+            self._redis_client = redis.Redis(
+                host=getattr(settings, 'CHANNEL_REDIS_HOST', 'redis'),
+                port=getattr(settings, 'CHANNEL_REDIS_PORT', 6379),
+                decode_responses=True,
+                socket_connect_timeout=1.0,
+                socket_timeout=2.0,
+                client_name=self.client_name
+            )
+            self._reset_if_empty = self._redis_client.register_script(_RESET_IF_EMPTY_SCRIPT)
+        return self._redis_client
+
+    def pending_key(self, kind: str) -> str:
+        return f"{self.streams[kind]}:pending_records"
+
+    def flush_flag_key(self, kind: str) -> str:
+        return f"{self.streams[kind]}:flush_scheduled"
+
+    def dead_letter_key(self, kind: str) -> str:
+        return f"{self.streams[kind]}:dead"
+
+    def _errors_key(self, kind: str) -> str:
+        return f"{self.streams[kind]}:last_errors"
+
+    def pending(self, kind: str) -> int:
+        """Records currently buffered (not yet written or dead-lettered)"""
+        return int(self.get_redis().get(self.pending_key(kind)) or 0)
+
+    def append(self, kind: str, fields: Dict[str, str], count: int, pipe=None) -> int:
+        """
+        Append one entry holding `count` records
+
+        Args:
+            pipe: Optional transactional pipeline to queue extra commands on (executed here)
+
+        Returns:
+            int: Records buffered after the append
+
+        Raises:
+            redis.exceptions.RedisError: If Redis is unavailable
+        """
+        pipe = pipe if pipe is not None else self.get_redis().pipeline()
+        pipe.xadd(self.streams[kind], {**fields, "count": count})
+        pipe.incrby(self.pending_key(kind), count)
+        results = pipe.execute()
+        return results[-1]
+
+    def schedule_flush(self, kind: str, pending: int, flush_size: int, task) -> bool:
+        """Dispatch task.delay(kind) once per full buffer (the flag expires as a safety net)"""
+        if pending >= flush_size and self.get_redis().set(self.flush_flag_key(kind), 1, nx=True, ex=30):
+            task.delay(kind)
+            return True
+        return False
+
+    def _ensure_group(self, client: redis.Redis, stream: str):
+        try:
+            client.xgroup_create(stream, self.consumer_group, id="0", mkstream=True)
+        except redis.exceptions.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _delivery_count(self, client: redis.Redis, stream: str, entry_id: str) -> int:
+        pending = client.xpending_range(stream, self.consumer_group, min=entry_id, max=entry_id, count=1)
+        return pending[0]["times_delivered"] if pending else 0
+
+    def _write_isolating(self, write: Writer, items: List[Tuple[str, Any, int]], summary: Dict[str, Any],
+                         failed: List[Tuple[str, str]]) -> List[Tuple[str, Any, int]]:
+        """
+        Write items (entry_id, payload, count) in one transaction, bisecting on
+        failure; returns the written items and adds (entry_id, error) to failed
+
+        Raises:
+            OperationalError, InterfaceError: The database is unreachable
+        """
+        try:
+            with transaction.atomic():
+                result = write([payload for _, payload, _ in items])
+        except (OperationalError, InterfaceError):
+            raise
+        except Exception as e:
+            if len(items) == 1:
+                failed.append((items[0][0], str(e)))
+                return []
+            middle = len(items) // 2
+            return (self._write_isolating(write, items[:middle], summary, failed)
+                    + self._write_isolating(write, items[middle:], summary, failed))
+
+        for key, value in result.items():
+            if isinstance(value, list):
+                summary.setdefault(key, []).extend(value)
+            else:
+                summary[key] = summary.get(key, 0) + value
+        return items
+
+    def _dead_letter(self, pipe, kind: str, entry_id: str, fields: Dict[str, str], error: str, deliveries: int):
+        pipe.xadd(
+            self.dead_letter_key(kind),
+            {**(fields or {}), "source_id": entry_id, "error": error[:1000], "deliveries": deliveries},
+            maxlen=DEAD_LETTER_MAX_ENTRIES,
+            approximate=True
+        )
+
+    def flush(self, kind: str, decode: Decoder, write: Writer, max_rounds: int = 20) -> Dict[str, Any]:
+        """
+        Drain buffered entries of one kind into the database
+
+        Each round reads up to READ_COUNT stream entries (reclaimed ones
+        first), decodes them and writes them in one transaction. Written and
+        dead-lettered entries are acknowledged and deleted; entries whose
+        write failed stay pending. Stops when the stream is empty, when a
+        round of new entries wrote nothing, or after max_rounds.
+
+        Returns:
+            Dict with created, errors, dead_lettered, trimmed (entries found
+            missing) plus any counts the writer reports, across all rounds
+        """
+        client = self.get_redis()
+        stream = self.streams[kind]
+        consumer = f"{socket.gethostname()}:{os.getpid()}"
+        self._ensure_group(client, stream)
+
+        summary: Dict[str, Any] = {"created": 0, "errors": [], "dead_lettered": 0, "trimmed": 0}
+
+        # Reclaim entries left unacknowledged by a dead consumer or a failed write
+        reclaimed = []
+        try:
+            _, reclaimed, *_ = client.xautoclaim(
+                stream, self.consumer_group, consumer, min_idle_time=RECLAIM_IDLE_MS, start_id="0-0", count=READ_COUNT
+            )
+        except redis.exceptions.ResponseError:
+            logger.exception(f"Could not reclaim pending entries of {stream}")
+
+        try:
+            for round_idx in range(max_rounds):
+                is_reclaim_round = round_idx == 0 and bool(reclaimed)
+                if is_reclaim_round:
+                    entries = reclaimed
+                else:
+                    response = client.xreadgroup(self.consumer_group, consumer, {stream: ">"}, count=READ_COUNT)
+                    entries = response[0][1] if response else []
+                if not entries:
+                    break
+
+                fields_by_id = {}
+                done_ids: List[str] = []  # acknowledged without a write (lost or dead-lettered)
+                done_count = 0
+                items: List[Tuple[str, Any, int]] = []
+                pipe = client.pipeline()
+                for entry_id, fields in entries:
+                    if not fields:
+                        # Deleted while pending (e.g. XTRIM by hand); its records are lost
+                        logger.warning(f"Pending entry {entry_id} of {stream} no longer exists; its records were lost")
+                        summary["trimmed"] += 1
+                        done_ids.append(entry_id)
+                        continue
+                    fields_by_id[entry_id] = fields
+                    try:
+                        payload, count = decode(fields)
+                    except (KeyError, TypeError, ValueError) as e:
+                        summary["errors"].append(f"Malformed entry {entry_id} in {stream}: {e}")
+                        self._dead_letter(pipe, kind, entry_id, fields, f"Malformed entry: {e}", 1)
+                        summary["dead_lettered"] += 1
+                        done_ids.append(entry_id)
+                        done_count += int(fields.get("count", 0) or 0)
+                        continue
+                    items.append((entry_id, payload, count))
+
+                failed: List[Tuple[str, str]] = []
+                written = self._write_isolating(write, items, summary, failed) if items else []
+
+                for entry_id, error in failed:
+                    deliveries = self._delivery_count(client, stream, entry_id)
+                    if deliveries >= MAX_DELIVERIES:
+                        logger.error(f"Dead-lettering {stream} entry {entry_id} after {deliveries} deliveries: {error}")
+                        self._dead_letter(pipe, kind, entry_id, fields_by_id[entry_id], error, deliveries)
+                        summary["dead_lettered"] += 1
+                        done_ids.append(entry_id)
+                        done_count += next(count for item_id, _, count in items if item_id == entry_id)
+                        pipe.hdel(self._errors_key(kind), entry_id)
+                    else:
+                        logger.warning(f"Write of {stream} entry {entry_id} failed (delivery {deliveries}); left pending: {error}")
+                        pipe.hset(self._errors_key(kind), entry_id, error[:1000])
+                        summary["errors"].append(f"Entry {entry_id} left pending: {error}")
+
+                ack_ids = done_ids + [entry_id for entry_id, _, _ in written]
+                if ack_ids:
+                    pipe.xack(stream, self.consumer_group, *ack_ids)
+                    pipe.xdel(stream, *ack_ids)
+                    pipe.hdel(self._errors_key(kind), *ack_ids)
+                    pipe.decrby(self.pending_key(kind), done_count + sum(count for _, _, count in written))
+                pipe.execute()
+
+                if failed and not written and not is_reclaim_round:
+                    break
+        except (OperationalError, InterfaceError):
+            # Leave the round pending; it is reclaimed once the database is back
+            logger.exception(f"Database unavailable while flushing {stream}; entries left pending")
+            summary["errors"].append("Database unavailable; entries left pending")
+
+        # Keep the size trigger and memory bound accurate if entries were lost or reclaimed twice
+        self._reset_if_empty(keys=[stream, self.pending_key(kind)])
+        client.delete(self.flush_flag_key(kind))
+        return summary
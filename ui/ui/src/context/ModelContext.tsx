@@ -30,7 +30,11 @@ import React, {
   ReactNode,
 } from "react";
 import { ClassificationModel } from "@/lib/types";
-import { fetchModelInfo, setActiveModel } from "@/lib/classifier";
+import {
+  fetchModelInfo,
+  setActiveModel,
+  waitForModelSwap,
+} from "@/lib/classifier";
 import { toast } from "sonner";
 
 interface ModelContextType {
@@ -98,14 +102,20 @@ export const ModelProvider: React.FC<ModelProviderProps> = ({ children }) => {
 
     try {
       const response = await setActiveModel(token, modelName);
-      if (response.status === "success") {
-        // Refresh models to get updated state
-        await loadModels();
-        toast.success(`Switched to model: ${modelName}`);
-      } else {
-        setError(response.message || "Failed to switch model");
-        toast.error(response.message || "Failed to switch model");
+      if (response.status !== "accepted" || !response.swap_id) {
+        throw new Error(response.message || "Failed to switch model");
+      }
+      // The swap runs in the background; wait for its outcome
+      const outcome = await waitForModelSwap(token, response.swap_id);
+      if (!outcome) {
+        throw new Error(`Switch to ${modelName} did not finish in time`);
+      }
+      if (outcome.status !== "committed") {
+        throw new Error(outcome.message || "Failed to switch model");
       }
+      // Refresh models to get updated state
+      await loadModels();
+      toast.success(`Switched to model: ${modelName}`);
     } catch (err) {
       const errorMessage =
         err instanceof Error ? err.message : "Failed to switch model";
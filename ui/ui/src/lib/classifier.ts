@@ -23,6 +23,8 @@ import { createAxiosInstanceWithToken } from "./axiosInstance";
 import {
   CategoryApiResponse,
   ModelInfoApiResponse,
+  ModelListApiResponse,
+  ModelSwapOutcome,
   SetActiveModelRequest,
   SetActiveModelResponse,
   ClassificationStatsResponse,
@@ -68,7 +70,8 @@ export const fetchModelInfo = async (
 };
 
 /**
- * Sets the active classification model.
+ * Starts a swap to another classification model. The backend answers 202
+ * with a swap_id; the outcome is read with waitForModelSwap.
  */
 export const setActiveModel = async (
   token: string,
@@ -83,6 +86,28 @@ export const setActiveModel = async (
   return data;
 };
 
+/**
+ * Polls the model list until the swap with the given id has finished.
+ * Resolves to null if it has not finished within timeoutMs.
+ */
+export const waitForModelSwap = async (
+  token: string,
+  swapId: string,
+  timeoutMs: number = 130000,
+  intervalMs: number = 1000
+): Promise<ModelSwapOutcome | null> => {
+  const axiosInstance = createAxiosInstanceWithToken(token);
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    const { data } = await axiosInstance.get<ModelListApiResponse>("/models/");
+    if (data.last_swap && data.last_swap.swap_id === swapId) {
+      return data.last_swap;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+  return null;
+};
+
 /**
  * Fetches classification statistics from the backend.
  */
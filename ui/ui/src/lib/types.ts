@@ -530,9 +530,27 @@ export interface SetActiveModelRequest {
 }
 
 export interface SetActiveModelResponse {
-  status: "success" | "error";
+  status: "accepted" | "error";
   message: string;
+  swap_id?: string;
   active_model?: string;
+  last_swap?: ModelSwapOutcome | null;
+}
+
+export interface ModelSwapOutcome {
+  swap_id: string;
+  model_name: string;
+  status: "committed" | "aborted";
+  message: string;
+  finished_at: number;
+}
+
+export interface ModelListApiResponse {
+  status: "success" | "error";
+  models: ClassificationModel[];
+  active_model: string;
+  last_swap: ModelSwapOutcome | null;
+  message?: string;
 }
 
 // --- Category API Response Types ---
@@ -1159,8 +1177,10 @@ export interface AggregateTimeSeriesPoint {
   ip_address: string;
   port_name: string;
   avg_utilization: number | null;
+  min_utilization: number | null;
   max_utilization: number | null;
   avg_throughput: number | null;
+  min_throughput: number | null;
   max_throughput: number | null;
 }
 